@@ -1 +1,8 @@
+from i8_terminal.services.earnings import (  # noqa: F401
+    get_earnings_calendar_list as calendar,
+)
 from i8_terminal.services.earnings import get_earnings_list as list  # noqa: F401
+from i8_terminal.services.earnings import get_recent_earnings as recent  # noqa: F401
+from i8_terminal.services.earnings import (  # noqa: F401
+    get_upcoming_earnings as upcoming,
+)
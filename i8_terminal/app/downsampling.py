@@ -0,0 +1,174 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from numpy.typing import NDArray
+
+from i8_terminal.config import APP_SETTINGS
+
+XAXIS_RANGE_PATTERN = re.compile(r"^(xaxis\d*)\.(range|range\[0\]|range\[1\]|autorange)$")
+
+
+def get_plot_points_budget() -> int:
+    return int(APP_SETTINGS.get("app", {}).get("plot_points_budget", 2000))
+
+
+def get_webgl_threshold() -> int:
+    return int(APP_SETTINGS.get("app", {}).get("webgl_threshold", 1000))
+
+
+def _to_scattergl(trace: go.Scatter) -> Any:
+    try:
+        return go.Scattergl(trace.to_plotly_json())
+    except ValueError:
+        return trace  # Uses a property that WebGL traces do not support, e.g. a spline line
+
+
+def use_webgl(fig: go.Figure, threshold: Optional[int] = None) -> go.Figure:
+    """
+    Replaces scatter traces with more than `threshold` points by their WebGL (`Scattergl`) counterpart.
+    Traces using properties that `Scattergl` does not support are kept as they are.
+    """
+    threshold = get_webgl_threshold() if threshold is None else threshold
+    traces = [
+        _to_scattergl(trace) if trace.type == "scatter" and trace.x is not None and len(trace.x) > threshold else trace
+        for trace in fig.data
+    ]
+    fig.data = []
+    fig.add_traces(traces)
+    return fig
+
+
+def lttb_indices(x: NDArray[Any], y: NDArray[Any], n_out: int) -> NDArray[Any]:
+    """
+    Returns the indices of the points kept by the Largest-Triangle-Three-Buckets downsampling algorithm.
+    The first and the last points are always kept.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(int) + 1
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+def _to_numeric_x(x: Any, category_array: Optional[List[Any]] = None) -> NDArray[Any]:
+    values: NDArray[Any] = np.asarray(x)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(float)
+    if np.issubdtype(values.dtype, np.datetime64) or (len(values) and isinstance(values[0], (datetime, np.datetime64))):
+        return np.asarray(pd.to_datetime(values, utc=True).values.astype("int64"), dtype=float)
+    if category_array:
+        positions = {c: i for i, c in enumerate(category_array)}
+        return np.array([positions.get(v, np.nan) for v in values], dtype=float)
+    return np.arange(len(values), dtype=float)
+
+
+def _to_numeric_range(x_range: List[Any], x: NDArray[Any]) -> List[float]:
+    if np.issubdtype(np.asarray(x).dtype, np.number) or isinstance(x_range[0], (int, float)):
+        return [float(v) for v in x_range]
+    return [float(pd.Timestamp(v, tz="UTC").value) for v in x_range]
+
+
+def _bucket_ohlc(trace: Dict[str, Any], mask: NDArray[Any], n_out: int) -> None:
+    kept = np.flatnonzero(mask)
+    if len(kept) <= n_out:
+        for k in ["x", "open", "high", "low", "close"]:
+            trace[k] = np.asarray(trace[k])[kept]
+        return
+    buckets = np.array_split(kept, n_out)
+    starts = np.array([b[0] for b in buckets])
+    ends = np.array([b[-1] for b in buckets])
+    boundaries = np.searchsorted(kept, starts)
+    high, low = np.asarray(trace["high"], dtype=float)[kept], np.asarray(trace["low"], dtype=float)[kept]
+    trace["open"] = np.asarray(trace["open"])[starts]
+    trace["close"] = np.asarray(trace["close"])[ends]
+    trace["high"] = np.fmax.reduceat(high, boundaries)
+    trace["low"] = np.fmin.reduceat(low, boundaries)
+    trace["x"] = np.asarray(trace["x"])[starts]
+
+
+def _get_axis_name(axis_id: str) -> str:
+    return "xaxis" + axis_id[1:]
+
+
+def _get_axis_group(layout: go.Layout, axis: str) -> str:
+    matches = layout[axis].matches if axis in layout else None
+    return _get_axis_name(matches) if matches else axis
+
+
+def get_xaxes_ranges(relayout_data: Optional[Dict[str, Any]]) -> Dict[str, Optional[List[Any]]]:
+    """
+    Extracts the x axes ranges of a Dash `relayoutData` event. Autoranged axes are mapped to None.
+    """
+    ranges: Dict[str, Optional[List[Any]]] = {}
+    for key, value in (relayout_data or {}).items():
+        match = XAXIS_RANGE_PATTERN.match(key)
+        if not match:
+            continue
+        axis, attr = match.groups()
+        if attr == "autorange":
+            ranges[axis] = None
+        elif attr == "range":
+            ranges[axis] = list(value)
+        else:
+            axis_range = ranges.get(axis) or [None, None]
+            axis_range[int(attr[-2])] = value
+            ranges[axis] = axis_range
+    return ranges
+
+
+def downsample_fig(
+    fig: go.Figure, max_points: Optional[int] = None, x_ranges: Optional[Dict[str, Optional[List[Any]]]] = None
+) -> go.Figure:
+    """
+    Returns a copy of the figure whose traces keep at most `max_points` points inside the visible x range.
+    Lines and bars are downsampled by LTTB, which preserves the visual shape, and candlesticks are merged into
+    OHLC buckets. `x_ranges` maps x axes (e.g. `xaxis2`) to their visible ranges, axes sharing a range with a
+    zoomed axis through `matches` get the same range.
+    """
+    max_points = get_plot_points_budget() if max_points is None else max_points
+    x_ranges = x_ranges or {}
+    layout = fig.layout
+    downsampled = go.Figure(fig)
+    traces = []
+    for trace in downsampled.data:
+        trace_json = trace.to_plotly_json()
+        axis = _get_axis_name(trace.xaxis or "x")
+        group = _get_axis_group(layout, axis)
+        x_range = next((r for a, r in x_ranges.items() if r and _get_axis_group(layout, a) == group), None)
+        if trace.x is None or (len(trace.x) <= max_points and not x_range):
+            traces.append(trace)
+            continue
+        category_array = layout[axis].categoryarray if axis in layout else None
+        x = _to_numeric_x(trace.x, list(category_array) if category_array else None)
+        mask = ~np.isnan(x)
+        if x_range and None not in x_range:
+            low, high = _to_numeric_range(x_range, trace.x)
+            mask &= (x >= low) & (x <= high)
+        if trace.type in ["candlestick", "ohlc"]:
+            _bucket_ohlc(trace_json, mask, max_points)
+        elif trace.y is not None:
+            y = np.asarray(trace.y, dtype=float)
+            mask &= ~np.isnan(y)
+            kept = np.flatnonzero(mask)
+            kept = kept[lttb_indices(x[kept], y[kept], max_points)]
+            for k in ["x", "y", "text", "hovertext", "customdata"]:
+                if trace_json.get(k) is not None and np.ndim(trace_json[k]) > 0:
+                    trace_json[k] = np.asarray(trace_json[k])[kept]
+        traces.append(type(trace)(trace_json))
+    downsampled.data = []
+    downsampled.add_traces(traces)
+    return downsampled
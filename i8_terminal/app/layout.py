@@ -17,10 +17,9 @@ def create_plot_layout(fig: Figure, cmd_context: Dict[str, Any]) -> html.Div:
     return html.Div(
         [
             html.Div(dcc.Store(id="cmdContextStore", data=cmd_context)),
-            html.Div(dcc.Store(id="figDict", data=fig.to_dict())),
             html.Div(
                 [
-                    html.Img(src="assets/i8t_logo.png", className="two columns", style={"margin": "auto"}),
+                    html.Img(src="/assets/i8t_logo.png", className="two columns", style={"margin": "auto"}),
                     html.A(
                         html.Button("Save / Publish Plot", id="openModalBtn", n_clicks=0, className="i8-button"),
                         className="two columns",
@@ -57,7 +56,8 @@ def create_plot_layout(fig: Figure, cmd_context: Dict[str, Any]) -> html.Div:
                 style={"margin-top": "30px", "margin-right": "15px"},
             ),
             dbc.Modal(_get_modal_layout(cmd_context), id="savePlotModal", is_open=False, size="lg"),
-            html.Div(html.Img(src="assets/loading.gif", className="loadingImage"), id="loadingGif", hidden=True),
+            dcc.Store(id="saveJobStore"),
+            dcc.Interval(id="saveJobInterval", interval=500, disabled=True),
         ],
         id="mainContainer",
         style={"display": "flex", "flex-direction": "column"},
@@ -131,7 +131,7 @@ def _get_modal_layout(cmd_context: Dict[str, Any]) -> List[Any]:
 def get_chart_layout() -> List[Dict[str, Any]]:
     return [
         dict(
-            source="assets/i8t_chart_logo.png",
+            source="/assets/i8t_chart_logo.png",
             xref="paper",
             yref="paper",
             x=1.01,
@@ -1,27 +1,113 @@
+import base64
 import contextlib
 import logging
 import os
 import socket
 import sys
+import uuid
 import webbrowser
-from threading import Timer
-from typing import Any, Dict, List, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock, Thread, Timer
+from typing import Any, Dict, List, Optional, Tuple
 
+import click
 import dash
 import dash_bootstrap_components as dbc
-import investor8_sdk
 import plotly.graph_objects as go
-from dash import html
+from dash import dcc, html
 from dash.dependencies import Input, Output, State
 from flask import request
 from rich.console import Console
 
-from i8_terminal import config
-from i8_terminal.app.layout import create_plot_layout
-from i8_terminal.common.formatting import make_svg_responsive
-from i8_terminal.config import APP_SETTINGS, ASSETS_PATH, USER_SETTINGS
+from i8_terminal.app.downsampling import downsample_fig, get_xaxes_ranges
+from i8_terminal.app.layout import create_plot_layout, get_fig_config
+from i8_terminal.app.save_jobs import (
+    SAVE_JOBS,
+    get_save_job,
+    start_save_worker,
+    submit_save_job,
+)
+from i8_terminal.common.profiling import PHASE_OUTPUT, profile_phase
+from i8_terminal.config import APP_SETTINGS, ASSETS_PATH
+
+APP = dash.Dash(
+    external_stylesheets=[dbc.themes.BOOTSTRAP], assets_folder=ASSETS_PATH, suppress_callback_exceptions=True
+)
+APP.title = "i8 Terminal"
+APP.layout = html.Div([dcc.Location(id="url", refresh=False), html.Div(id="plotPage"), html.Div(id="pageTitle")])
+
+# Plots by id, least recently viewed first
+PLOTS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_PLOTS_LOCK = Lock()
+_SERVER_THREAD: Optional[Thread] = None
+
+
+def register_plot(fig: go.Figure, cmd_context: Dict[str, Any]) -> str:
+    """
+    Keeps the full resolution figure on the server and serves a downsampled copy to the page.
+    Only the `app.max_plots` most recently viewed plots are kept.
+    """
+    plot_id = uuid.uuid4().hex[:8]
+    fig.update_layout(uirevision=plot_id)  # Keep zoom and legend state when the traces are replaced
+    plot = {"fig": downsample_fig(fig), "full_fig": fig, "cmd_context": cmd_context}
+    with _PLOTS_LOCK:
+        PLOTS[plot_id] = plot
+        while len(PLOTS) > max(int(APP_SETTINGS["app"].get("max_plots", 20)), 1):
+            PLOTS.popitem(last=False)
+    return plot_id
+
 
-APP = dash.Dash(external_stylesheets=[dbc.themes.BOOTSTRAP], assets_folder=ASSETS_PATH)
+def get_plot(plot_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    with _PLOTS_LOCK:
+        if plot_id is None or plot_id not in PLOTS:
+            return None
+        PLOTS.move_to_end(plot_id)
+        return PLOTS[plot_id]
+
+
+def get_plot_id(pathname: Optional[str]) -> Optional[str]:
+    if not pathname or not pathname.startswith("/plot/"):
+        return None
+    return pathname.rstrip("/").split("/")[-1]
+
+
+@APP.callback(Output("plotPage", "children"), Input("url", "pathname"))
+def render_plot_page(pathname: Optional[str]) -> Any:
+    plot = get_plot(get_plot_id(pathname))
+    if not plot:
+        return html.H4("This plot is not available anymore. Run the plot command again in i8 Terminal.")
+    return create_plot_layout(plot["fig"], plot["cmd_context"])
+
+
+APP.clientside_callback(
+    """
+    function(cmdContext) {
+        if (cmdContext) {
+            document.title = "i8 Terminal: " + cmdContext.plot_title;
+        }
+        return "";
+    }
+    """,
+    Output("pageTitle", "children"),
+    Input("cmdContextStore", "data"),
+)
+
+
+@APP.callback(
+    Output("mainPlot", "figure"),
+    Input("mainPlot", "relayoutData"),
+    State("url", "pathname"),
+    prevent_initial_call=True,
+)
+def update_plot_resolution(relayout_data: Optional[Dict[str, Any]], pathname: Optional[str]) -> Any:
+    plot = get_plot(get_plot_id(pathname))
+    x_ranges = get_xaxes_ranges(relayout_data)
+    if not plot or not x_ranges:
+        return dash.no_update
+    if not any(x_ranges.values()):
+        return plot["fig"]
+    return downsample_fig(plot["full_fig"], x_ranges=x_ranges)
 
 
 @APP.callback(
@@ -33,15 +119,23 @@ APP = dash.Dash(external_stylesheets=[dbc.themes.BOOTSTRAP], assets_folder=ASSET
 def toggle_modal(open_btn_clicks: int, save_btn_clicks: int, is_open: bool) -> bool:
     if not open_btn_clicks:
         return False
+    if not is_open:
+        start_save_worker()  # Warm up the thumbnail renderer while the user fills the form
     return not is_open
 
 
 @APP.callback(
     Output("fakeOutput", "children"),
     Input("closeServerBtn", "n_clicks"),
+    State("url", "pathname"),
 )
-def shutdown_server(close_btn_clicks: int) -> str:
+def shutdown_server(close_btn_clicks: int, pathname: Optional[str]) -> str:
     if close_btn_clicks:
+        if is_background_server_running():
+            # The background server is shared by all plots of the shell session, so only this plot is closed.
+            with _PLOTS_LOCK:
+                PLOTS.pop(get_plot_id(pathname) or "", None)
+            return "The plot is closed. You can close this tab."
         shutdown_func = request.environ.get("werkzeug.server.shutdown")
         if shutdown_func is None:
             raise RuntimeError("Not running werkzeug")
@@ -49,87 +143,61 @@ def shutdown_server(close_btn_clicks: int) -> str:
     return ""
 
 
+def _get_save_progress(message: str) -> html.Div:
+    return html.Div([html.Img(src="/assets/loading.gif", height=24, style={"margin-right": "10px"}), message])
+
+
 @APP.callback(
     Output("saveAlert", "is_open"),
     Output("saveAlert", "children"),
+    Output("saveAlert", "color"),
+    Output("saveJobStore", "data"),
+    Output("saveJobInterval", "disabled"),
     Input("saveBtn", "n_clicks"),
+    Input("saveJobInterval", "n_intervals"),
     State("cmdContextStore", "data"),
     State("titleInput", "value"),
     State("userNotesInput", "value"),
     State("isPublicBtn", "value"),
-    State("figDict", "data"),
+    State("url", "pathname"),
+    State("saveJobStore", "data"),
 )
 def save_button(
     save_btn_clicks: int,
+    n_intervals: int,
     cmd_context: Dict[str, Any],
     title: str,
     user_notes: str,
     is_public: List[int],
-    fig_dict: Dict[str, Any],
-) -> Tuple[bool, Any]:
-    if save_btn_clicks:
-        fig_obj = go.Figure(fig_dict)
-        fig_obj_small = go.Figure(fig_obj)
-        fig_obj_small.update_layout(
-            title=dict(text="", font=dict(size=14)),
-            font=dict(size=9),
-            legend_title=dict(font=dict(size=11)),
-            legend=dict(font=dict(size=9)),
+    pathname: Optional[str],
+    job_id: Optional[str],
+) -> Tuple[bool, Any, str, Optional[str], bool]:
+    """
+    Queues the plot on the save worker when the save button is clicked and polls its progress afterwards.
+    """
+    triggered = dash.callback_context.triggered[0]["prop_id"] if dash.callback_context.triggered else ""
+    if triggered == "saveBtn.n_clicks" and save_btn_clicks:
+        plot = PLOTS.get(get_plot_id(pathname) or "")
+        if not plot:
+            msg = "This plot is not available anymore. Run the plot command again in i8 Terminal."
+            return True, msg, "warning", None, True
+        job_id = submit_save_job(plot["full_fig"], plot["fig"], cmd_context, title, user_notes, is_public)
+        return True, _get_save_progress("Saving plot..."), "info", job_id, False
+    if triggered == "saveJobInterval.n_intervals" and job_id:
+        job = get_save_job(job_id)
+        if not job:
+            return False, None, "info", None, True
+        if job["status"] == "running":
+            return True, _get_save_progress(job["message"]), "info", job_id, False
+        SAVE_JOBS.pop(job_id, None)
+        if job["status"] == "failed":
+            return True, f"Saving the plot failed: {job['message']}", "danger", None, True
+        alert_content = html.Div(
+            ["Your plot is saved and published at: ", html.A(job["plot_url"], href=job["plot_url"])]
         )
-        thumbnail = make_svg_responsive(fig_obj_small.to_image(format="svg", width=846, height=500).decode("utf-8"))
-        tickers = cmd_context["tickers"]
-        fig_obj.layout.images[0].source = config.I8_TERMINAL_LOGO_URL  # Update plot logo to url
-        fig_obj.layout.title.text = title  # Update plot title
-        body = {
-            "Title": title,
-            "Tickers": tickers if type(tickers) is list else [tickers],
-            "UserId": USER_SETTINGS["user_id"],
-            "PlotData": fig_obj.to_json(),
-            "IsPublic": 1 in is_public,
-            "I8Command": cmd_context["command_path"],
-            "UserNotes": user_notes,
-            "PlotType": cmd_context["plot_type"],
-            "Thumbnail": thumbnail,
-            # TODO: implement tags
-            "Tags": [],
-        }
-        resp = investor8_sdk.UserApi().create_plot(body=body)
-        plot_url = f"https://www.investoreight.com/plot/{resp.id}"
-        alert_content = html.Div(["Your plot is saved and published at: ", html.A(plot_url, href=plot_url)])
-
-        return True, alert_content
-
-    return False, None
+        return True, alert_content, "success", None, True
 
-
-@APP.callback(
-    Output("loadingGif", "hidden"),
-    Input("saveBtn", "n_clicks"),
-    State("loadingGif", "hidden"),
-)
-def show_loading(save_btn_clicks: int, hidden: bool) -> bool:
-    if not save_btn_clicks:
-        return True
-    return not hidden
-
-
-@APP.callback(
-    Output("loadingGif", "style"),
-    Input("saveAlert", "is_open"),
-)
-def hide_loading(is_open: bool) -> Dict[str, Any]:
-    if is_open:
-        return {"display": "none"}
-    return {
-        "position": "fixed",
-        "width": "100%",
-        "height": "100%",
-        "left": 0,
-        "right": 0,
-        "bottom": 0,
-        "background-color": "rgba(0,0,0,0.5)",
-        "z-index": 2,
-    }
+    return False, None, "success", None, True
 
 
 def _configure_dash() -> None:
@@ -137,18 +205,44 @@ def _configure_dash() -> None:
     dash_logger = logging.getLogger("dash")
     dash_logger.setLevel(logging.WARNING)
     dash_logger.disabled = True
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
 
     cli = sys.modules["flask.cli"]
     cli.show_server_banner = lambda *x: None  # type: ignore
 
 
+def is_background_server_running() -> bool:
+    return _SERVER_THREAD is not None and _SERVER_THREAD.is_alive()
+
+
+def _is_shell_session() -> bool:
+    ctx = click.get_current_context(silent=True)
+    return bool(ctx and ctx.obj and ctx.obj.get("is_shell"))
+
+
+def _run_server() -> None:
+    if APP.logger.hasHandlers():
+        APP.logger.handlers.clear()
+    APP.run_server(debug=APP_SETTINGS["app"]["debug"], use_reloader=False)
+
+
+@profile_phase(PHASE_OUTPUT)
 def serve_plot(fig: go.Figure, cmd_context: Dict[str, Any]) -> None:
+    """
+    Registers the plot on the plot server under `/plot/<id>` and opens it in the browser.
+    In the shell, the server is started once in a background thread and is reused by the next plots,
+    otherwise it runs in the foreground until it is closed.
+    """
+    global _SERVER_THREAD
     _configure_dash()
 
-    APP.layout = create_plot_layout(fig, cmd_context)
-    APP.title = f"i8 Terminal: {cmd_context['plot_title']}"
-    app_url = f"http://localhost:{APP_SETTINGS['app']['port']}/"
+    app_url = f"http://localhost:{APP_SETTINGS['app']['port']}/plot/"
     console = Console()
+    if is_background_server_running():
+        app_url += register_plot(fig, cmd_context)
+        webbrowser.open_new(app_url)
+        console.print(f"[bold green]Your plot is serving on {app_url}[/bold green]")
+        return
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         is_port_in_use = s.connect_ex(("localhost", APP_SETTINGS["app"]["port"])) == 0
     if is_port_in_use:
@@ -157,12 +251,39 @@ def serve_plot(fig: go.Figure, cmd_context: Dict[str, Any]) -> None:
             style="yellow",
         )
         return
+    app_url += register_plot(fig, cmd_context)  # Registered once the server can be reached
+    Timer(2, lambda: webbrowser.open_new(app_url)).start()
+    console.print(f"[bold green]Your plot is serving on {app_url}[/bold green]")
+    if _is_shell_session():
+        _SERVER_THREAD = Thread(target=_run_server, daemon=True)
+        _SERVER_THREAD.start()
+        return
     with open(os.devnull, "w") as f, contextlib.redirect_stderr(f):
-        Timer(2, lambda: webbrowser.open_new(app_url)).start()
-        console.print(
-            f'[bold green]Your plot is serving on http://127.0.0.1:{APP_SETTINGS["app"]["port"]}/[/bold green]'
-        )
         console.print("Press `Ctrl + C` to stop the webserver.")
-        if APP.logger.hasHandlers():
-            APP.logger.handlers.clear()
-        APP.run_server(debug=APP_SETTINGS["app"]["debug"])
+        _run_server()
+
+
+@lru_cache(maxsize=None)
+def _get_chart_logo_data_uri() -> str:
+    with open(os.path.join(ASSETS_PATH, "i8t_chart_logo.png"), "rb") as f:
+        return f"data:image/png;base64,{base64.b64encode(f.read()).decode('utf-8')}"
+
+
+@profile_phase(PHASE_OUTPUT)
+def export_plot(fig: go.Figure, cmd_context: Dict[str, Any], export_path: str) -> None:
+    """
+    Serializes the figure to export_path without running the plot server.
+    HTML files share one offline `plotly.min.js` bundle per directory, and images are rendered by kaleido.
+    """
+    console = Console()
+    extension = export_path.split(".")[-1].lower()
+    if extension not in ["html", "png", "svg"]:
+        console.print("export_path is not valid. Supported formats are html, png and svg.", style="yellow")
+        return
+    if fig.layout.images:
+        fig.layout.images[0].source = _get_chart_logo_data_uri()  # Embed plot logo so the file works offline
+    if extension == "html":
+        fig.write_html(export_path, include_plotlyjs="directory", config=get_fig_config(cmd_context))
+    else:
+        fig.write_image(export_path, format=extension)
+    console.print(f"Plot is saved on: {export_path}")
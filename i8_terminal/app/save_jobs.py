@@ -0,0 +1,119 @@
+import uuid
+from queue import Queue
+from threading import Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+import investor8_sdk
+import plotly.graph_objects as go
+
+from i8_terminal import config
+from i8_terminal.common.formatting import make_svg_responsive
+from i8_terminal.config import USER_SETTINGS
+
+SAVE_JOBS: Dict[str, Dict[str, Any]] = {}
+_JOB_QUEUE: "Queue[Tuple[str, Dict[str, Any]]]" = Queue()
+_WORKER: Optional[Thread] = None
+_WORKER_LOCK = Lock()
+
+
+def _warm_up_kaleido() -> None:
+    # Kaleido keeps its chromium process alive after the first export, so later thumbnails skip the startup cost
+    try:
+        go.Figure().to_image(format="svg", width=10, height=10)
+    except Exception:
+        pass
+
+
+def _render_thumbnail(fig: go.Figure) -> str:
+    fig_small = go.Figure(fig)
+    fig_small.update_layout(
+        title=dict(text="", font=dict(size=14)),
+        font=dict(size=9),
+        legend_title=dict(font=dict(size=11)),
+        legend=dict(font=dict(size=9)),
+    )
+    return make_svg_responsive(fig_small.to_image(format="svg", width=846, height=500).decode("utf-8"))
+
+
+def _save_plot(job: Dict[str, Any], params: Dict[str, Any]) -> None:
+    cmd_context = params["cmd_context"]
+    job["message"] = "Rendering thumbnail..."
+    thumbnail = _render_thumbnail(params["thumbnail_fig"])
+    job["message"] = "Publishing plot..."
+    fig_obj = go.Figure(params["fig"])
+    fig_obj.layout.images[0].source = config.I8_TERMINAL_LOGO_URL  # Update plot logo to url
+    fig_obj.layout.title.text = params["title"]  # Update plot title
+    tickers = cmd_context["tickers"]
+    body = {
+        "Title": params["title"],
+        "Tickers": tickers if type(tickers) is list else [tickers],
+        "UserId": USER_SETTINGS["user_id"],
+        "PlotData": fig_obj.to_json(),
+        "IsPublic": params["is_public"],
+        "I8Command": cmd_context["command_path"],
+        "UserNotes": params["user_notes"],
+        "PlotType": cmd_context["plot_type"],
+        "Thumbnail": thumbnail,
+        # TODO: implement tags
+        "Tags": [],
+    }
+    resp = investor8_sdk.UserApi().create_plot(body=body)
+    job["plot_url"] = f"https://www.investoreight.com/plot/{resp.id}"
+
+
+def _run_worker() -> None:
+    _warm_up_kaleido()
+    while True:
+        job_id, params = _JOB_QUEUE.get()
+        job = SAVE_JOBS[job_id]
+        try:
+            _save_plot(job, params)
+            job["status"] = "done"
+        except Exception as e:
+            job["status"] = "failed"
+            job["message"] = str(e)
+        finally:
+            _JOB_QUEUE.task_done()
+
+
+def start_save_worker() -> None:
+    """
+    Starts the worker thread that renders thumbnails and publishes plots, and warms up kaleido.
+    Jobs run one at a time, so a single kaleido process is reused by all saves.
+    """
+    global _WORKER
+    with _WORKER_LOCK:
+        if _WORKER is None or not _WORKER.is_alive():
+            _WORKER = Thread(target=_run_worker, daemon=True)
+            _WORKER.start()
+
+
+def submit_save_job(
+    fig: go.Figure,
+    thumbnail_fig: go.Figure,
+    cmd_context: Dict[str, Any],
+    title: str,
+    user_notes: str,
+    is_public: List[int],
+) -> str:
+    start_save_worker()
+    job_id = uuid.uuid4().hex[:8]
+    SAVE_JOBS[job_id] = {"status": "running", "message": "Waiting for the previous save to finish...", "plot_url": None}
+    _JOB_QUEUE.put(
+        (
+            job_id,
+            {
+                "fig": fig,
+                "thumbnail_fig": thumbnail_fig,
+                "cmd_context": cmd_context,
+                "title": title,
+                "user_notes": user_notes,
+                "is_public": 1 in is_public,
+            },
+        )
+    )
+    return job_id
+
+
+def get_save_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return SAVE_JOBS.get(job_id)
@@ -6,14 +6,18 @@ from i8_terminal.common.cli import log_terminal_usage
 
 
 @click.group()
-def cli() -> None:
+@click.option("--profile", is_flag=True, default=False, help="Print the time spent in each phase of every command.")
+@click.pass_context
+def cli(ctx: click.Context, profile: bool) -> None:
     """i8 Terminal - Modern Market Research powered by the Command-Line
 
     Copyright © 2020-2022 Investoreight | https://investoreight.com/"""
-    pass
+    ctx.ensure_object(dict)
+    if profile:
+        ctx.obj["profile"] = True
 
 
 @cli.result_callback()
 @click.pass_context
-def process_commands(ctx: click.Context, processors: Any) -> None:
+def process_commands(ctx: click.Context, processors: Any, **kwargs: Any) -> None:
     log_terminal_usage(ctx)
@@ -1,19 +1,17 @@
 from typing import Any, Dict
 
 import click
-import investor8_sdk
 from pandas import DataFrame
 from rich.console import Console
 
 from i8_terminal.commands.company import company
 from i8_terminal.common.cli import pass_command
+from i8_terminal.common.company_search import search_companies
 from i8_terminal.common.layout import df2Table, format_df
 
 
 def search_stocks_df(keyword: str) -> DataFrame:
-    results = investor8_sdk.SearchApi().search_stocks(keyword, 8)
-    df = DataFrame([d.to_dict() for d in results])
-    return df[["ticker", "name"]]
+    return search_companies(keyword, 8)
 
 
 def format_stocks_df(df: DataFrame, target: str) -> DataFrame:
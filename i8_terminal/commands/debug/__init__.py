@@ -0,0 +1,7 @@
+from i8_terminal.commands import cli
+
+
+@cli.group()
+def debug() -> None:
+    """Inspect i8 Terminal usage and performance."""
+    pass
@@ -0,0 +1,57 @@
+import click
+from pandas import DataFrame
+from rich.console import Console
+
+from i8_terminal.commands.debug import debug
+from i8_terminal.common.cli import pass_command
+from i8_terminal.common.layout import df2Table, format_df
+from i8_terminal.common.telemetry import API_STATS, load_api_stats_history
+
+
+def format_endpoints_df(df: DataFrame) -> DataFrame:
+    formatters = {
+        "Calls": lambda x: f"{x:,}",
+        "Errors": lambda x: f"{x:,}",
+        "p50 (ms)": lambda x: f"{x:,.0f}",
+        "p95 (ms)": lambda x: f"{x:,.0f}",
+        "Total (s)": lambda x: f"{x:,.2f}",
+        "Size (KB)": lambda x: f"{x:,.1f}",
+    }
+    return format_df(df, {c: c for c in df.columns}, formatters)
+
+
+def format_cache_df(df: DataFrame) -> DataFrame:
+    formatters = {
+        "Hits": lambda x: f"{x:,}",
+        "Misses": lambda x: f"{x:,}",
+        "Hit Rate": lambda x: f"{x:.0%}",
+    }
+    return format_df(df, {c: c for c in df.columns}, formatters)
+
+
+@debug.command()
+@click.option("--all_sessions", "-a", is_flag=True, default=False, help="Include the stats of previous sessions.")
+@pass_command
+def stats(all_sessions: bool) -> None:
+    """
+    Shows the API calls and local cache usage of the session.
+
+    Examples:
+
+    `i8 debug stats`
+
+    `i8 debug stats --all_sessions`
+    """
+    console = Console()
+    api_stats = load_api_stats_history() if all_sessions else API_STATS
+    endpoints_df = api_stats.get_endpoints_df()
+    cache_df = api_stats.get_cache_df()
+    if endpoints_df.empty and cache_df.empty:
+        console.print("No API calls are recorded yet.", style="yellow")
+        return
+    if not endpoints_df.empty:
+        console.print(
+            df2Table(format_endpoints_df(endpoints_df), columns_justify={c: "right" for c in endpoints_df.columns[1:]})
+        )
+    if not cache_df.empty:
+        console.print(df2Table(format_cache_df(cache_df), columns_justify={c: "right" for c in cache_df.columns[1:]}))
@@ -6,9 +6,9 @@ from rich.console import Console
 import i8_terminal.api.earnings as earnings_api
 from i8_terminal.commands.earnings import earnings
 from i8_terminal.common.cli import pass_command
-from i8_terminal.common.layout import df2Table
+from i8_terminal.common.layout import df2Html
 from i8_terminal.common.stock_info import validate_ticker
-from i8_terminal.common.utils import export_data, export_to_html
+from i8_terminal.common.utils import export_data
 from i8_terminal.config import APP_SETTINGS
 from i8_terminal.service_result.earning_list_result import EarningsListResult
 from i8_terminal.types.ticker_param_type import TickerParamType
@@ -31,8 +31,7 @@ def list(ticker: str, export_path: Optional[str]) -> None:
     if export_path:
         if export_path.split(".")[-1] == "html":
             df = earnings_list.to_df()
-            table = df2Table(df)
-            export_to_html(table, export_path)
+            df2Html(df, export_path)
         else:
             export_data(
                 earnings_list.to_df("raw"),
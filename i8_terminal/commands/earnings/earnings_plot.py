@@ -1,4 +1,5 @@
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 import click
 import investor8_sdk
@@ -9,20 +10,28 @@ from pandas.core.frame import DataFrame
 from rich.console import Console
 
 from i8_terminal.app.layout import get_plot_default_layout
-from i8_terminal.app.plot_server import serve_plot
+from i8_terminal.app.plot_server import export_plot, serve_plot
 from i8_terminal.commands.earnings import earnings
 from i8_terminal.common.cli import get_click_command_path, pass_command
-from i8_terminal.common.formatting import format_number
+from i8_terminal.common.formatting import format_numbers
+from i8_terminal.common.periods import parse_period_keys
+from i8_terminal.common.profiling import PHASE_BUILD, profile_phase
 from i8_terminal.common.stock_info import validate_tickers
 from i8_terminal.common.utils import PlotType
+from i8_terminal.config import APP_SETTINGS
 from i8_terminal.types.metric_param_type import MetricParamType
 from i8_terminal.types.ticker_param_type import TickerParamType
 
 
 def get_historical_earnings_df(tickers: List[str], size: int) -> DataFrame:
-    hist_earnings = []
-    for tk in tickers:
-        hist_earnings.extend(investor8_sdk.EarningsApi().get_historical_earnings(tk, size=size))
+    with ThreadPoolExecutor(max_workers=int(APP_SETTINGS.get("earnings", {}).get("workers", 8))) as executor:
+        hist_earnings = [
+            h
+            for tk_earnings in executor.map(
+                lambda tk: investor8_sdk.EarningsApi().get_historical_earnings(tk, size=size), tickers
+            )
+            for h in tk_earnings
+        ]
     df = pd.DataFrame([h.to_dict() for h in hist_earnings])[
         [
             "ticker",
@@ -37,12 +46,14 @@ def get_historical_earnings_df(tickers: List[str], size: int) -> DataFrame:
             "revenue_ws",
         ]
     ]
-    df = df.sort_values(by=["ticker", "fyq"], ascending=True).reset_index(drop=True)
+    df["period_key"] = parse_period_keys(df.fyq)
+    df = df.sort_values(by=["ticker", "period_key"], ascending=True).drop(columns="period_key").reset_index(drop=True)
     df.fyq = df.fyq.str[2:-2] + " " + df.fyq.str[-2:]
     df = df.rename(columns={"eps_actual": "Actual", "eps_ws": "Consensus"})
     return df
 
 
+@profile_phase(PHASE_BUILD)
 def create_fig(df: DataFrame, cmd_context: Dict[str, Any]) -> go.Figure:
     fig = px.bar(
         df,
@@ -55,7 +66,7 @@ def create_fig(df: DataFrame, cmd_context: Dict[str, Any]) -> go.Figure:
     )
     fig.update_xaxes(
         tickvals=df.fyq.to_list(),
-        ticktext=df.apply(lambda x: x.fyq + f"<br>Beat by ${format_number(x.eps_surprise, decimal=2)}", axis=1),
+        ticktext=df.fyq + "<br>Beat by $" + format_numbers(df.eps_surprise, None, decimal=2),
     )
     fig.update_traces(width=0.3, hovertemplate="%{y}%{_xother}")
     fig.update_layout(
@@ -80,8 +91,9 @@ def create_fig(df: DataFrame, cmd_context: Dict[str, Any]) -> go.Figure:
     callback=validate_tickers,
     help="Comma-separated list of tickers.",
 )
+@click.option("--export", "export_path", "-e", help="Filename to export the plot to (html, png or svg).")
 @pass_command
-def plot(ctx: click.Context, metric: str, tickers: str) -> None:
+def plot(ctx: click.Context, metric: str, tickers: str, export_path: Optional[str]) -> None:
     """
     Compare and plot earning metrics of given companies. TICKERS is a comma-separated list of tickers.
 
@@ -108,4 +120,7 @@ def plot(ctx: click.Context, metric: str, tickers: str) -> None:
         status.update("Generating plot...")
         fig = create_fig(df, cmd_context)
 
+    if export_path:
+        export_plot(fig, cmd_context, export_path)
+        return
     serve_plot(fig, cmd_context)
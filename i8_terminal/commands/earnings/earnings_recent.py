@@ -8,9 +8,9 @@ from rich.console import Console
 from i8_terminal.commands.earnings import earnings
 from i8_terminal.common.cli import pass_command
 from i8_terminal.common.formatting import get_formatter
-from i8_terminal.common.layout import df2Table, format_df
+from i8_terminal.common.layout import df2Html, df2Table, format_df
 from i8_terminal.common.stock_info import get_stocks_df
-from i8_terminal.common.utils import export_data, export_to_html
+from i8_terminal.common.utils import export_data
 from i8_terminal.config import APP_SETTINGS
 
 
@@ -66,8 +66,7 @@ def recent(export_path: Optional[str]) -> None:
     if export_path:
         if export_path.split(".")[-1] == "html":
             df_formatted = format_recent_earnings_df(df, "console")
-            table = df2Table(df_formatted)
-            export_to_html(table, export_path)
+            df2Html(df_formatted, export_path)
             return
         export_data(
             format_recent_earnings_df(df, "store"),
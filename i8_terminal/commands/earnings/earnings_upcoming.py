@@ -1,16 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import click
 import investor8_sdk
+import numpy as np
+import pandas as pd
 from pandas import DataFrame
 from rich.console import Console
 
 from i8_terminal.commands.earnings import earnings
 from i8_terminal.common.cli import pass_command
+from i8_terminal.common.earnings_calendar import get_earnings_calendar
 from i8_terminal.common.formatting import get_formatter
-from i8_terminal.common.layout import df2Table, format_df
+from i8_terminal.common.layout import df2Html, df2Table, format_df
 from i8_terminal.common.stock_info import validate_tickers
-from i8_terminal.common.utils import export_data, export_to_html
+from i8_terminal.common.utils import export_data
 from i8_terminal.config import APP_SETTINGS
 from i8_terminal.types.ticker_param_type import TickerParamType
 
@@ -25,13 +29,20 @@ def get_upcoming_earnings_df(size: int) -> DataFrame:
 
 
 def get_upcoming_earnings_df_by_ticker(tickers: str) -> DataFrame:
-    upcoming_earnings = []
-    for tk in tickers.replace(" ", "").upper().split(","):
-        upcoming_earnings.extend([investor8_sdk.EarningsApi().get_upcoming_earning(tk)])
-    df = DataFrame([h.to_dict() for h in upcoming_earnings])
+    tickers_list = list(dict.fromkeys(tickers.replace(" ", "").upper().split(",")))
+    df = get_earnings_calendar().next_reports(tickers_list)
+    # The calendar has every report until `earnings.calendar_lookahead_days` ahead, so only the tickers reporting
+    # after that, or never, are looked up one by one
+    missing_tickers = [tk for tk in tickers_list if tk not in set(df["ticker"])]
+    with ThreadPoolExecutor(max_workers=int(APP_SETTINGS.get("earnings", {}).get("workers", 8))) as executor:
+        upcoming_earnings = list(
+            executor.map(lambda tk: investor8_sdk.EarningsApi().get_upcoming_earning(tk), missing_tickers)
+        )
+    df = pd.concat([df, DataFrame([h.to_dict() for h in upcoming_earnings if h])], ignore_index=True)
+    df = df.iloc[np.argsort(df["ticker"].map({tk: i for i, tk in enumerate(tickers_list)}), kind="stable")]
     df["eps_beat_rate"] = df["eps_beat_rate"] * 100
     df["revenue_beat_rate"] = df["revenue_beat_rate"] * 100
-    return df
+    return df.reset_index(drop=True)
 
 
 def format_upcoming_earnings_df(df: DataFrame, target: str) -> DataFrame:
@@ -108,8 +119,7 @@ def upcoming(tickers: Optional[str], export_path: Optional[str]) -> None:
                 if tickers
                 else format_upcoming_earnings_df(df, "console")
             )
-            table = df2Table(df_formatted)
-            export_to_html(table, export_path)
+            df2Html(df_formatted, export_path)
             return
         export_data(
             format_upcoming_earnings_df_by_ticker(df, "store") if tickers else format_upcoming_earnings_df(df, "store"),
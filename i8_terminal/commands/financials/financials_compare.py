@@ -1,11 +1,14 @@
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
-import investor8_sdk
 import numpy as np
 import plotly.graph_objects as go
+from investor8_sdk.models.standardized_financial import StandardizedFinancial
+from investor8_sdk.rest import ApiException
 from pandas.core.frame import DataFrame
 from rich.console import Console
+from urllib3.exceptions import TimeoutError as RequestTimeoutError
 
 from i8_terminal.app.layout import get_plot_default_layout
 from i8_terminal.app.plot_server import serve_plot
@@ -15,12 +18,17 @@ from i8_terminal.common.financials import (
     fin_df2export_df,
     fin_df2Tree,
     find_similar_statement,
+    get_statement_layout,
     get_statements_codes,
     get_statements_disp_name,
     parse_identifier,
     prepare_financials_df,
 )
-from i8_terminal.common.metrics import get_all_financial_metrics_df
+from i8_terminal.common.financials_store import (
+    get_financials_single,
+    get_latest_standardized_financials,
+)
+from i8_terminal.common.profiling import PHASE_BUILD, profile_phase
 from i8_terminal.common.utils import PlotType, export_data, export_to_html
 from i8_terminal.config import APP_SETTINGS
 from i8_terminal.types.fin_identifier_param_type import FinancialsIdentifierParamType
@@ -28,39 +36,61 @@ from i8_terminal.types.fin_statement_param_type import FinancialStatementParamTy
 from i8_terminal.types.period_type_param_type import PeriodTypeParamType
 
 
+def get_identifier_financials(
+    identifier: Dict[str, str], statement: str, period_type: str, timeout: float
+) -> Tuple[Optional[StandardizedFinancial], Optional[str]]:
+    """
+    Returns the financials of an identifier and the error of its request, if any.
+    Not available financials are not an error.
+    """
+    try:
+        if identifier.get("fiscal_year"):
+            resp = get_financials_single(
+                ticker=identifier["ticker"],
+                stat_code=statement,
+                fiscal_year=identifier.get("fiscal_year"),
+                fiscal_period=identifier.get("fiscal_period"),
+                _request_timeout=timeout,
+            )
+        else:
+            resp = get_latest_standardized_financials(
+                ticker=identifier["ticker"], stat_code=statement, period_type=period_type, _request_timeout=timeout
+            )
+        return resp, None
+    except ApiException as e:
+        return None, None if e.status == 404 else f"{e.status} {e.reason}"
+    except Exception as e:
+        # Connection timeouts are retried and raised as the reason of a `MaxRetryError`
+        return None, "Request timed out." if isinstance(getattr(e, "reason", e), RequestTimeoutError) else str(e)
+
+
 def get_standardized_financials(
     identifiers_list: List[Dict[str, str]],
     statement: str,
     period_type: str,
     period_size: int = 4,
     exportize: Optional[bool] = False,
-) -> Optional[Dict[str, Any]]:
-    fins = []
-    for idf in identifiers_list:
-        resp = None
-        try:
-            if idf.get("fiscal_year"):
-                resp = investor8_sdk.FinancialsApi().get_financials_single(
-                    ticker=idf["ticker"],
-                    stat_code=statement,
-                    fiscal_year=idf.get("fiscal_year"),
-                    fiscal_period=idf.get("fiscal_period"),
-                )
-            else:
-                if not period_type:
-                    period_type = "Q" if statement == "balance_sheet_statement" else "FY"
-                resp = investor8_sdk.FinancialsApi().get_latest_standardized_financials(
-                    ticker=idf["ticker"], stat_code=statement
-                )[period_type]
-            if resp:
-                fins.append(resp)
-        except Exception:
-            continue
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+    """
+    Fetches the financials of the identifiers concurrently, and returns them merged in the order of the identifiers
+    with the errors by identifier.
+    """
+    if not period_type:
+        period_type = "Q" if statement == "balance_sheet_statement" else "FY"
+    settings = APP_SETTINGS.get("financials", {})
+    timeout = float(settings.get("request_timeout", 30))
+    with ThreadPoolExecutor(max_workers=int(settings.get("workers", 8))) as executor:
+        results = list(
+            executor.map(lambda idf: get_identifier_financials(idf, statement, period_type, timeout), identifiers_list)
+        )
+    fins = [resp for resp, _ in results if resp]
+    errors = {"-".join(idf.values()): error for idf, (_, error) in zip(identifiers_list, results) if error}
     if not fins:
-        return None
-    return prepare_financials_df(fins, period_size, include_ticker=True, exportize=exportize)
+        return None, errors
+    return prepare_financials_df(fins, period_size, include_ticker=True, exportize=exportize), errors
 
 
+@profile_phase(PHASE_BUILD)
 def create_fig(df: DataFrame, header_dict: Dict[str, List[str]], cmd_context: Dict[str, Any]) -> go.Figure:
     cells_fill_color = [["rgb(200, 212, 227)", "rgb(235, 240, 248)"]] * len(df.columns)
     cells_data = list(df.to_dict("list").values())
@@ -141,13 +171,13 @@ def compare(
     identifiers_list = identifiers.replace(" ", "").upper().split(",")
     parsed_identifiers_list = [parse_identifier(i, period_type) for i in identifiers_list]
     # Remove duplicates identifiers
-    parsed_identifiers_list = [dict(t) for t in {tuple(d.items()) for d in parsed_identifiers_list}]
-    tickers_list = list(set([d["ticker"] for d in parsed_identifiers_list]))
+    parsed_identifiers_list = [dict(t) for t in dict.fromkeys(tuple(d.items()) for d in parsed_identifiers_list)]
+    tickers_list = list(dict.fromkeys(d["ticker"] for d in parsed_identifiers_list))
     plot_title = f"Comparison of {', '.join(tickers_list)} {get_statements_disp_name(matched_statement)}s"
     plot_title = " and ".join(plot_title.rsplit(", ", 1))
     console = Console()
     with console.status("Fetching data...", spinner="material") as status:
-        fins = get_standardized_financials(
+        fins, errors = get_standardized_financials(
             parsed_identifiers_list,
             matched_statement,
             period_type,
@@ -156,12 +186,12 @@ def compare(
         )
         if fins is None:
             status.stop()
+            for identifier, error in errors.items():
+                console.print(f"⚠ Could not fetch the financials of `{identifier}`: {error}", style="yellow")
             click.echo("No data found!")
             return
         periods_list = fins["data"].columns[1:].to_list()
-        df_metrics = get_all_financial_metrics_df()
-        df = fins["data"].merge(df_metrics, on="tag", how="left")
-        df["section_name"] = df["section_name"].apply(lambda x: "Others" if not x or x == "-" else x)
+        df = fins["data"].merge(get_statement_layout(), on="tag", how="left")
         df = df.astype(object).replace(np.nan, None)  # Replace nan with None
         if plot:
             cmd_context = {
@@ -175,7 +205,12 @@ def compare(
             df.rename(columns={"name": ""}, inplace=True)
             fig = create_fig(df, fins["header"], cmd_context)
 
-    missing_tickers = set(tickers_list) - set(fins["header"].get("ticker", set()))
+    for identifier, error in errors.items():
+        console.print(f"⚠ Could not fetch the financials of `{identifier}`: {error}", style="yellow")
+    failed_tickers = {identifier.split("-")[0] for identifier in errors}
+    missing_tickers = [
+        t for t in tickers_list if t not in set(fins["header"].get("ticker", [])) and t not in failed_tickers
+    ]
     if missing_tickers:
         missing_tickers_str = " and ".join(", ".join(missing_tickers).rsplit(", ", 1))
         console.print(f'The specified financials for ticker(s) "{missing_tickers_str}" are not available.')
@@ -1,18 +1,17 @@
 import click
-import investor8_sdk
 from pandas import DataFrame
 from rich.console import Console
 
 from i8_terminal.commands.financials import financials
 from i8_terminal.common.cli import pass_command
 from i8_terminal.common.financials import available_fin_df2tree
+from i8_terminal.common.financials_store import get_available_financials
 from i8_terminal.common.stock_info import validate_ticker
 from i8_terminal.types.ticker_param_type import TickerParamType
 
 
 def get_available_financials_df(ticker: str) -> DataFrame:
-    available_fins = investor8_sdk.FinancialsApi().get_list_available_standardized_financials(ticker=ticker)
-    return DataFrame([d.to_dict() for d in available_fins])
+    return DataFrame(get_available_financials(ticker))
 
 
 @financials.command()
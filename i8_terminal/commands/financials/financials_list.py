@@ -1,7 +1,6 @@
 from typing import Any, Dict, Optional
 
 import click
-import investor8_sdk
 import numpy as np
 from rich.console import Console
 
@@ -11,12 +10,16 @@ from i8_terminal.common.financials import (
     fin_df2export_df,
     fin_df2Tree,
     find_similar_statement,
+    get_statement_layout,
     get_statements_codes,
     get_statements_disp_name,
     parse_identifier,
     prepare_financials_df,
 )
-from i8_terminal.common.metrics import get_all_financial_metrics_df
+from i8_terminal.common.financials_store import (
+    get_financials_single,
+    get_list_standardized_financials,
+)
 from i8_terminal.common.utils import export_data, export_to_html
 from i8_terminal.config import APP_SETTINGS
 from i8_terminal.types.fin_identifier_param_type import FinancialsIdentifierParamType
@@ -33,21 +36,21 @@ def get_standardized_financials(
 ) -> Optional[Dict[str, Any]]:
     fins = []
     if identifiers_dict.get("fiscal_period"):
-        fins = [
-            investor8_sdk.FinancialsApi().get_financials_single(
-                ticker=identifiers_dict["ticker"],
-                stat_code=statement,
-                fiscal_year=identifiers_dict.get("fiscal_year"),
-                fiscal_period=identifiers_dict.get("fiscal_period"),
-            )
-        ]
+        fin = get_financials_single(
+            ticker=identifiers_dict["ticker"],
+            stat_code=statement,
+            fiscal_year=identifiers_dict.get("fiscal_year"),
+            fiscal_period=identifiers_dict["fiscal_period"],
+        )
+        fins = [fin] if fin else []
     else:
         period_type = "FY" if not period_type else period_type
-        fins = investor8_sdk.FinancialsApi().get_list_standardized_financials(
+        fins = get_list_standardized_financials(
             ticker=identifiers_dict["ticker"],
             stat_code=statement,
             period_type=period_type,
             end_year=identifiers_dict.get("fiscal_year", ""),
+            period_size=period_size,
         )
     if not fins:
         return None
@@ -104,9 +107,7 @@ def list(identifier: str, statement: str, period_type: Optional[str], export_pat
             click.echo("No data found!")
             return
         periods_list = fins["data"].columns[1:].to_list()
-        df_metrics = get_all_financial_metrics_df()
-        df = fins["data"].merge(df_metrics, on="tag", how="left")
-        df["section_name"] = df["section_name"].apply(lambda x: "Others" if not x or x == "-" else x)
+        df = fins["data"].merge(get_statement_layout(), on="tag", how="left")
         df = df.astype(object).replace(np.nan, None)  # Replace nan with None
 
     if export_path:
@@ -13,12 +13,14 @@ from plotly.subplots import make_subplots
 from rich.console import Console
 
 from i8_terminal.app.layout import get_plot_default_layout
-from i8_terminal.app.plot_server import serve_plot
+from i8_terminal.app.plot_server import export_plot, serve_plot
 from i8_terminal.commands.financials import financials
 from i8_terminal.common.cli import get_click_command_path, pass_command
 from i8_terminal.common.metrics import find_similar_fin_metric
+from i8_terminal.common.periods import argsort_periods
+from i8_terminal.common.profiling import PHASE_BUILD, profile_phase
 from i8_terminal.common.stock_info import get_tickers_list, validate_tickers
-from i8_terminal.common.utils import PlotType, reverse_period
+from i8_terminal.common.utils import PlotType
 from i8_terminal.types.chart_param_type import ChartParamType, get_chart_param_types
 from i8_terminal.types.metric_param_type import MetricParamType
 from i8_terminal.types.period_type_param_type import PeriodTypeParamType
@@ -51,13 +53,13 @@ def get_historical_financials_df(
     df = pd.merge(df, metadata_df, on="metric_name")
     df.rename(columns={"display_name": "Metric"}, inplace=True)
     df = pd.pivot_table(df, index="Period", columns=["Ticker", "Metric"], values=["Value"]).reset_index(level=0)
-    df["ReversedPeriod"] = df["Period"].apply(lambda x: reverse_period(x))
-    df = df.sort_values("ReversedPeriod").dropna()
+    df = df.iloc[argsort_periods(df["Period"])].dropna()
     metric_display_names = list(set(metadata_df[metadata_df.metric_name.isin(metrics)]["display_name"]))
     df.index.name = f"Historical {' and '.join(metric_display_names)}"
     return df, metric_display_names
 
 
+@profile_phase(PHASE_BUILD)
 def create_fig(
     df: pd.DataFrame, cmd_context: Dict[str, Any], matched_metrics: List[str], tickers: List[str], chart_type: str
 ) -> go.Figure:
@@ -169,6 +171,7 @@ def create_fig(
     default="bar",
     help="Chart can be bar or line chart.",
 )
+@click.option("--export", "export_path", "-e", help="Filename to export the plot to (html, png or svg).")
 @pass_command
 def plot(
     ctx: click.Context,
@@ -178,6 +181,7 @@ def plot(
     chart_type: str,
     from_date: Optional[datetime],
     to_date: Optional[datetime],
+    export_path: Optional[str],
 ) -> None:
     """
     Compare and plot financial metrics of given companies. TICKERS is a comma-separated list of tickers.
@@ -224,4 +228,7 @@ def plot(
         status.update("Generating plot...")
         fig = create_fig(df, cmd_context, metric_display_names, tickers_list, chart_type)  # type: ignore
 
+    if export_path:
+        export_plot(fig, cmd_context, export_path)
+        return
     serve_plot(fig, cmd_context)
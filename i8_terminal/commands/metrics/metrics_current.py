@@ -5,14 +5,14 @@ from rich.console import Console
 
 from i8_terminal.commands.metrics import metrics
 from i8_terminal.common.cli import pass_command
-from i8_terminal.common.layout import df2Table
+from i8_terminal.common.layout import df2Html, df2Table
 from i8_terminal.common.metrics import (
     get_current_metrics_df,
     get_view_metrics,
     prepare_current_metrics_formatted_df,
 )
 from i8_terminal.common.stock_info import get_tickers_list, validate_tickers
-from i8_terminal.common.utils import export_data, export_to_html
+from i8_terminal.common.utils import export_data
 from i8_terminal.config import APP_SETTINGS
 from i8_terminal.types.metric_identifier_param_type import MetricIdentifierParamType
 from i8_terminal.types.metric_view_param_type import MetricViewParamType
@@ -84,13 +84,13 @@ def current(tickers: str, metrics: str, view_name: Optional[str], export_path: O
                 columns_justify[metric_display_name] = (
                     "left" if metric_df["display_format"].values[0] == "str" else "right"
                 )
-            table = df2Table(
+            df2Html(
                 prepare_current_metrics_formatted_df(
                     df, "console", include_period=True, tickers_order=tickers_order, metrics_order=metrics_order
                 ),
+                export_path,
                 columns_justify=columns_justify,
             )
-            export_to_html(table, export_path)
             return
         export_data(
             prepare_current_metrics_formatted_df(
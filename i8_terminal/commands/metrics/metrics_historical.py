@@ -5,7 +5,6 @@ import arrow
 import click
 import investor8_sdk
 import numpy as np
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from click.types import DateTime
@@ -16,19 +15,23 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.tree import Tree
 
+from i8_terminal.app.downsampling import use_webgl
 from i8_terminal.app.layout import get_plot_default_layout
-from i8_terminal.app.plot_server import serve_plot
+from i8_terminal.app.plot_server import export_plot, serve_plot
 from i8_terminal.commands.metrics import metrics
 from i8_terminal.common.cli import get_click_command_path, pass_command
-from i8_terminal.common.formatting import data_format_mapper
-from i8_terminal.common.layout import df2Table, format_metrics_df
+from i8_terminal.common.layout import df2Table
+from i8_terminal.common.metric_cube import MetricCube
 from i8_terminal.common.metrics import (
-    add_ticker_rank_to_df,
+    compact_historical_metrics_df,
     get_all_metrics_type_and_data_types_df,
+    historical_metrics_to_df,
 )
+from i8_terminal.common.profiling import PHASE_BUILD, PHASE_DATAFRAME, profile_phase
+from i8_terminal.common.raw_api import call_raw_api
 from i8_terminal.common.stock_info import get_tickers_list, validate_tickers
-from i8_terminal.common.utils import PlotType, reverse_period
-from i8_terminal.config import get_table_style
+from i8_terminal.common.utils import PlotType, export_data
+from i8_terminal.config import APP_SETTINGS, get_table_style
 from i8_terminal.types.chart_param_type import ChartParamType
 from i8_terminal.types.metric_param_type import MetricParamType
 from i8_terminal.types.output_param_type import OutputParamType
@@ -36,6 +39,7 @@ from i8_terminal.types.period_type_param_type import PeriodTypeParamType
 from i8_terminal.types.ticker_param_type import TickerParamType
 
 
+@profile_phase(PHASE_DATAFRAME)
 def get_historical_metrics_df(
     tickers: List[str],
     metrics: List[str],
@@ -46,14 +50,16 @@ def get_historical_metrics_df(
     if period_type:
         metrics = [f"{metric}.{period_type}" for metric in metrics]
     if from_date:
-        historical_metrics = investor8_sdk.MetricsApi().get_historical_metrics(
+        historical_metrics = call_raw_api(
+            investor8_sdk.MetricsApi().get_historical_metrics,
             symbols=",".join(tickers),
             metrics=",".join(metrics),
             from_date=from_date.strftime("%Y-%m-%d"),
             to_date=to_date.strftime("%Y-%m-%d") if to_date else arrow.now().datetime.strftime("%Y-%m-%d"),
         )
     elif to_date and not from_date:
-        historical_metrics = investor8_sdk.MetricsApi().get_historical_metrics(
+        historical_metrics = call_raw_api(
+            investor8_sdk.MetricsApi().get_historical_metrics,
             symbols=",".join(tickers),
             metrics=",".join(metrics),
             from_period_offset=-10,
@@ -61,34 +67,32 @@ def get_historical_metrics_df(
             to_date=to_date.strftime("%Y-%m-%d"),
         )
     elif not to_date and not from_date:
-        historical_metrics = investor8_sdk.MetricsApi().get_historical_metrics(
+        historical_metrics = call_raw_api(
+            investor8_sdk.MetricsApi().get_historical_metrics,
             symbols=",".join(tickers),
             metrics=",".join(metrics),
             from_period_offset=-10,
             to_period_offset=0,
         )
-    df = pd.DataFrame.from_records(
-        [
-            (ticker, metric, period_value.period, period_value.period_date_time, period_value.value)
-            for ticker, metric_dict in historical_metrics.data.items()
-            for metric, period_value_list in metric_dict.items()
-            for period_value in period_value_list
-        ],
-        columns=["Ticker", "metric_name", "Period", "PeriodDateTime", "Value"],
+    return compact_historical_metrics_df(*historical_metrics_to_df(historical_metrics))
+
+
+def get_historical_metrics_export_df(cube: MetricCube) -> DataFrame:
+    """
+    Returns a row per ticker, metric and period with data, with the values formatted for export.
+    """
+    df = cube.format("store").to_df()
+    return (
+        df[["Ticker", "Metric", "Period", "value"]]
+        .astype({"Ticker": str, "Period": str})
+        .rename(columns={"value": "Value"})
     )
-    metadata_df = pd.DataFrame([h.to_dict() for h in historical_metrics.metadata])
-    df = pd.merge(df, metadata_df, on="metric_name")
-    df[["data_format", "display_format"]] = df[["data_format", "display_format"]].replace("string", "str")
-    df.rename(columns={"display_name": "Metric", "Value": "value"}, inplace=True)
-    df["value"] = df.apply(lambda metric: data_format_mapper(metric), axis=1)
-    return df
 
 
-def create_fig(
-    df: DataFrame, cmd_context: Dict[str, Any], tickers: List[str], chart_type: str, metrics_type_df: DataFrame
-) -> go.Figure:
+@profile_phase(PHASE_BUILD)
+def create_fig(cube: MetricCube, cmd_context: Dict[str, Any], tickers: List[str], chart_type: str) -> go.Figure:
     vertical_spacing = 0.02
-    metrics = list(set(df["Metric"]))
+    metrics = cube.display_names
     rows_num = len(metrics)
     row_width = [1] * rows_num
     layout = dict(
@@ -101,58 +105,55 @@ def create_fig(
         margin=dict(b=20, l=50, r=65),
     )
 
+    cube = cube.sel(tickers=tickers)  # Aligns the series to the tickers, so every ticker keeps its color
     fig = make_subplots(
         rows=rows_num,
         cols=1,
-        shared_xaxes=False if len(list(set(df["default_period_type"]))) > 1 else True,
+        shared_xaxes=False if len(set(cube.metrics["default_period_type"])) > 1 else True,
         vertical_spacing=vertical_spacing,
         row_width=row_width,
     )
 
-    for metric, metric_df in df.groupby("Metric", sort=False):
-        metric_idx = metrics.index(metric)
-        for ticker, ticker_df in metric_df.sort_values(["PeriodDateTime"]).groupby("Ticker"):
-            idx = tickers.index(ticker)
-            if chart_type == "bar":
-                fig.add_trace(
-                    go.Bar(
-                        x=ticker_df["Period"],
-                        y=ticker_df["value"],
-                        name=ticker,
-                        marker=dict(color=px.colors.qualitative.Plotly[idx]),
-                        legendgroup=f"group{idx}",
-                        showlegend=True if metrics.index(metric) == 0 else False,
-                    ),
-                    row=metrics.index(metric) + 1,
-                    col=1,
-                )
-            else:
-                fig.add_trace(
-                    go.Scatter(
-                        x=ticker_df["Period"],
-                        y=ticker_df["value"],
-                        name=ticker,
-                        marker=dict(color=px.colors.qualitative.Plotly[idx]),
-                        legendgroup=f"group{idx}",
-                        showlegend=True if metrics.index(metric) == 0 else False,
-                    ),
-                    row=metrics.index(metric) + 1,
-                    col=1,
-                )
-        if len(metrics) > 1:
-            fig["layout"][f"xaxis{metric_idx+1}"]["dtick"] = round(len(metric_df["Period"]) / 10)
+    for metric_idx, ticker_idx, periods, values in cube.iter_series():
+        ticker = cube.tickers[ticker_idx]
+        idx = ticker_idx
+        if chart_type == "bar":
+            fig.add_trace(
+                go.Bar(
+                    x=periods,
+                    y=values,
+                    name=ticker,
+                    marker=dict(color=px.colors.qualitative.Plotly[idx]),
+                    legendgroup=f"group{idx}",
+                    showlegend=True if metric_idx == 0 else False,
+                ),
+                row=metric_idx + 1,
+                col=1,
+            )
+        else:
+            fig.add_trace(
+                go.Scatter(
+                    x=periods,
+                    y=values,
+                    name=ticker,
+                    marker=dict(color=px.colors.qualitative.Plotly[idx]),
+                    legendgroup=f"group{idx}",
+                    showlegend=True if metric_idx == 0 else False,
+                ),
+                row=metric_idx + 1,
+                col=1,
+            )
+    if len(metrics) > 1:
+        for metric_idx, values_count in enumerate(cube.notna().sum(axis=(0, 2))):
+            fig["layout"][f"xaxis{metric_idx+1}"]["dtick"] = round(values_count / 10)
 
     fig.update_traces(hovertemplate="%{y} %{x}")
 
-    sorted_periods = df.sort_values("PeriodDateTime")["Period"].unique()
+    sorted_periods = cube.periods
     sorted_periods_filtered = (
         sorted_periods[:: int(len(sorted_periods) / 10)] if len(sorted_periods) > 10 else sorted_periods
     )  # Get only 10,
 
-    if "fin_metric" in set(metrics_type_df["type"]):
-        # Reverse the financials periods. e.g: `FY 2020` will converted to `2020 FY``
-        sorted_periods = list(map(reverse_period, sorted_periods))
-
     fig.update_xaxes(
         rangeslider_visible=False,
         spikemode="across",
@@ -185,23 +186,15 @@ def create_fig(
         title_font_size=10,
     )
 
-    return fig
+    return use_webgl(fig)
 
 
-def historical_metrics_df2tree(df: DataFrame) -> Tree:
-    # If the period type is daily or real-time, the df must be sorted using the PeriodDateTime
-    # and if not must be sorted using reversed_period.
-    if any(set(["D", "R"]) & set(df["default_period_type"].unique())):
-        period_dict = dict(df[["PeriodDateTime", "Period"]].sort_values("PeriodDateTime", ascending=False).values)
-        sorted_periods = [period_dict[p] for p in period_dict.keys()]
-        df = df.pivot(index=["Metric", "Ticker"], columns="Period", values="value").reset_index()
-    else:
-        df = df.pivot(index=["Metric", "Ticker"], columns="Period", values="value").reset_index()
-        reversed_periods = [reverse_period(p) for p in list(df.columns[2:])]
-        reversed_periods.sort(reverse=True)
-        sorted_periods = [reverse_period(rp) for rp in reversed_periods]
+@profile_phase(PHASE_BUILD)
+def historical_metrics_df2tree(cube: MetricCube) -> Tree:
+    df = cube.to_tree_df()
+    sorted_periods = cube.periods[::-1]
     col_width = 15
-    plot_title = f"Historical {' and '.join(list(set(df['Metric'])))}"
+    plot_title = f"Historical {' and '.join(cube.display_names)}"
     tree = Tree(Panel(plot_title, width=50))
     # Add header table to tree
     header_table = Table(
@@ -273,6 +266,12 @@ def historical_metrics_df2tree(df: DataFrame) -> Tree:
 )
 @click.option("--from_date", "-f", type=DateTime(), help="Histotical metrics from date.")
 @click.option("--to_date", "-t", type=DateTime(), help="Histotical metrics to date.")
+@click.option(
+    "--export",
+    "export_path",
+    "-e",
+    help="Filename to export the plot (html, png or svg) or the data (csv or xlsx) to.",
+)
 @pass_command
 def historical(
     ctx: click.Context,
@@ -284,6 +283,7 @@ def historical(
     period_type: Optional[str],
     from_date: Optional[datetime],
     to_date: Optional[datetime],
+    export_path: Optional[str],
 ) -> None:
     """
     Lists, compares and plots metrics of given companies. TICKERS is a comma-separated list of tickers.
@@ -292,6 +292,7 @@ def historical(
 
     `i8 metrics historical --metrics net_income --tickers AMD,INTC,QCOM --output plot --plot_type bar --period_type Q`
     `i8 metrics historical --metrics total_revenue,total_assets --tickers AMD,INTC,QCOM --output terminal --period_type FY --pivot`
+    `i8 metrics historical --metrics net_income --tickers AMD,INTC,QCOM --plot_type bar --period_type Q --export net_income.svg`
     """  # noqa: E501
     metrics_list = metrics.replace(" ", "").split(",")
     if output not in ["terminal", "plot"]:
@@ -326,6 +327,10 @@ def historical(
     metrics_type_df: DataFrame = get_all_metrics_type_and_data_types_df()
     metrics_type_df = metrics_type_df[metrics_type_df["metric_name"].isin(metrics_list)]
 
+    is_data_export = export_path is not None and export_path.split(".")[-1].lower() in ["csv", "xlsx"]
+    if export_path and not is_data_export:
+        output = "plot"
+
     if output == "plot" and "string" in metrics_type_df["data_format"].unique():
         click.echo(
             click.style("Metrics with type `string` cannot be plotted! Select `terminal` output instead.", fg="yellow")
@@ -335,15 +340,15 @@ def historical(
     console = Console()
     with console.status("Fetching data...", spinner="material") as status:
         df = get_historical_metrics_df(tickers_list, metrics_list, period_type, from_date, to_date)
-        df = df.sort_values(["PeriodDateTime"], ascending=False).groupby(["Ticker", "Metric", "Period"]).head(1)
+        cube = MetricCube.from_df(df, tickers_list, metrics_list)
         if not period_type:
-            if len(df["default_period_type"].unique()) > 1:
+            if len(set(cube.metrics["default_period_type"])) > 1:
                 console.print(
                     "The `period type` of the provided metrics are not compatible. Make sure the provided metrics have the same period type or specify the period_type parameter. Check `metrics describe` command to find more about metrics.",  # noqa: E501
                     style="yellow",
                 )
                 return
-        if len(df["metric_name"].unique()) < len(metrics_list):
+        if len(cube.metric_names) < len(metrics_list):
             # If all of the input metrics don't have data in the input period_type
             # (eg. --metrics eps_growth,revenue_actual --period_type FY).
             console.print(
@@ -351,45 +356,35 @@ def historical(
                 style="yellow",
             )
             return
-        if output == "plot" or plot_type:
-            cmd_context["plot_title"] = f"Historical {' and '.join(list(set(df['Metric'])))}"
+        if not is_data_export and (output == "plot" or plot_type):
+            cmd_context["plot_title"] = f"Historical {' and '.join(cube.display_names)}"
             status.update("Generating plot...")
-            fig = create_fig(df, cmd_context, tickers_list, plot_type if plot_type else "line", metrics_type_df)
+            fig = create_fig(cube, cmd_context, tickers_list, plot_type if plot_type else "line")
 
+    if is_data_export and export_path:
+        export_data(
+            get_historical_metrics_export_df(cube),
+            export_path,
+            column_width=18,
+            column_format=APP_SETTINGS["styles"]["xlsx"]["financials"]["column"],
+        )
+        return
+    if export_path:
+        export_plot(fig, cmd_context, export_path)
+        return
     if output == "plot" or plot_type:
         serve_plot(fig, cmd_context)
         return
-    formatted_df = format_metrics_df(df, "console")
+    formatted_cube = cube.format("console")
     if pivot:
-        tree = historical_metrics_df2tree(formatted_df)
+        tree = historical_metrics_df2tree(formatted_cube)
         console.print(tree)
         return
-    columns_justify: Dict[str, Any] = {}
-    for metric_display_name, metric_df in df.groupby("Metric"):
-        columns_justify[metric_display_name] = "left" if metric_df["display_format"].values[0] == "str" else "right"
-    # If the period type is daily or real-time, the df must be sorted using the PeriodDateTime
-    # and if not must be sorted using reversed_period.
-    if any(set(["D", "R"]) & set(formatted_df["default_period_type"].unique())):
-        formatted_df = formatted_df.pivot(
-            index=["Ticker", "Period", "PeriodDateTime"], columns="Metric", values="value"
-        ).reset_index()
-        formatted_df = add_ticker_rank_to_df(formatted_df, tickers_list)
-        formatted_df.sort_values(["TickerRank", "PeriodDateTime"], ascending=[True, False], inplace=True)
-        formatted_df.drop(columns=["TickerRank", "PeriodDateTime"], inplace=True)
-    else:
-        formatted_df = formatted_df.pivot(index=["Ticker", "Period"], columns="Metric", values="value").reset_index()
-        formatted_df["reversed_period"] = formatted_df.apply(
-            lambda row: reverse_period(row.Period),
-            axis=1,
-        )
-        formatted_df = add_ticker_rank_to_df(formatted_df, tickers_list)
-        formatted_df.sort_values(["TickerRank", "reversed_period"], ascending=[True, False], inplace=True)
-        formatted_df.drop(columns=["TickerRank", "reversed_period"], inplace=True)
-    metrics_order = [df.loc[df["metric_name"] == metric]["Metric"].values[0] for metric in metrics_list]
-    metrics_order[:0] = ["Ticker", "Period"]
-    formatted_df = formatted_df.reindex(columns=metrics_order)
+    columns_justify = {
+        metric.Metric: "left" if metric.display_format == "str" else "right" for metric in cube.metrics.itertuples()
+    }
     table = df2Table(
-        formatted_df,
+        formatted_cube.to_table_df(),
         columns_justify=columns_justify,
     )
     console.print(table)
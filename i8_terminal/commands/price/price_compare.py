@@ -7,22 +7,19 @@ from pandas.core.frame import DataFrame
 from plotly.graph_objects import Figure
 from rich.console import Console
 
+from i8_terminal.app.downsampling import use_webgl
 from i8_terminal.app.layout import get_date_range, get_plot_default_layout
 from i8_terminal.app.plot_server import serve_plot
 from i8_terminal.commands.price import price
 from i8_terminal.common.cli import get_click_command_path, pass_command
-from i8_terminal.common.layout import df2Table
+from i8_terminal.common.layout import df2Html
 from i8_terminal.common.price import (
     get_historical_price_df,
     get_historical_price_export_df,
 )
+from i8_terminal.common.profiling import PHASE_BUILD, profile_phase
 from i8_terminal.common.stock_info import get_tickers_list, validate_tickers
-from i8_terminal.common.utils import (
-    PlotType,
-    export_data,
-    export_to_html,
-    get_period_code,
-)
+from i8_terminal.common.utils import PlotType, export_data, get_period_code
 from i8_terminal.config import APP_SETTINGS
 from i8_terminal.types.price_period_param_type import PricePeriodParamType
 from i8_terminal.types.ticker_param_type import TickerParamType
@@ -54,6 +51,7 @@ def get_export_data(
     return export_price_df.sort_values("Date")
 
 
+@profile_phase(PHASE_BUILD)
 def create_fig(df: DataFrame, period_code: int, cmd_context: Dict[str, Any], range_selector: bool = False) -> Figure:
     layout = dict(
         autosize=True,
@@ -82,7 +80,7 @@ def create_fig(df: DataFrame, period_code: int, cmd_context: Dict[str, Any], ran
         margin=dict(b=15, l=90, r=20),
     )
 
-    return fig
+    return use_webgl(fig)
 
 
 @price.command()
@@ -154,8 +152,7 @@ def compare(
 
     if export_path:
         if export_path.split(".")[-1] == "html":
-            table = df2Table(df)
-            export_to_html(table, export_path)
+            df2Html(df, export_path)
             return
         export_data(
             df,
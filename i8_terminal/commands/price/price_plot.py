@@ -12,8 +12,9 @@ from pandas.core.frame import DataFrame
 from plotly.subplots import make_subplots
 from rich.console import Console
 
+from i8_terminal.app.downsampling import use_webgl
 from i8_terminal.app.layout import get_date_range, get_plot_default_layout
-from i8_terminal.app.plot_server import serve_plot
+from i8_terminal.app.plot_server import export_plot, serve_plot
 from i8_terminal.commands.price import price
 from i8_terminal.common.cli import get_click_command_path, pass_command
 from i8_terminal.common.metrics import (
@@ -21,7 +22,10 @@ from i8_terminal.common.metrics import (
     get_indicators_list,
     get_metrics_display_names,
     get_period_start_date,
+    historical_metrics_to_df,
 )
+from i8_terminal.common.profiling import PHASE_BUILD, profile_phase
+from i8_terminal.common.raw_api import call_raw_api
 from i8_terminal.common.stock_info import validate_ticker
 from i8_terminal.common.utils import PlotType, get_period_code, get_period_days
 from i8_terminal.types.chart_param_type import ChartParamType, get_chart_param_types
@@ -92,29 +96,22 @@ def get_data_df(
     else:
         from_date = get_period_start_date(period)
         to_date = datetime.now().strftime("%Y-%m-%d")
-    historical_prices = investor8_sdk.MetricsApi().get_historical_metrics(
+    historical_prices = call_raw_api(
+        investor8_sdk.MetricsApi().get_historical_metrics,
         symbols=",".join(tickers),
         metrics=",".join(indicators),
         from_date=from_date,
         to_date=to_date,
     )
-    df = pd.DataFrame.from_records(
-        [
-            (ticker, metric, period_value.period, period_value.period_date_time, period_value.value)
-            for ticker, metric_dict in historical_prices.data.items()
-            for metric, period_value_list in metric_dict.items()
-            for period_value in period_value_list
-        ],
-        columns=["ticker", "metric_name", "period", "period_datetime", "value"],
-    )
-    metadata_df = pd.DataFrame([h.to_dict() for h in historical_prices.metadata])
+    df, metadata_df = historical_metrics_to_df(historical_prices)
     df = pd.merge(df, metadata_df, on="metric_name")
-    df = df.pivot(index="period_datetime", columns="display_name", values="value")
+    df = df.pivot(index="PeriodDateTime", columns="display_name", values="Value")
     df = df[df.columns].astype(float)
     df.index.name = "Date"
     return df
 
 
+@profile_phase(PHASE_BUILD)
 def create_fig(
     df: DataFrame,
     period: str,
@@ -221,7 +218,7 @@ def create_fig(
         )
     )
 
-    return fig
+    return use_webgl(fig)
 
 
 @price.command()
@@ -249,6 +246,7 @@ def create_fig(
     default="line",
     help="Chart can be candlestick or line chart.",
 )
+@click.option("--export", "export_path", "-e", help="Filename to export the plot to (html, png or svg).")
 @pass_command
 def plot(
     ctx: click.Context,
@@ -258,6 +256,7 @@ def plot(
     from_date: Optional[datetime],
     to_date: Optional[datetime],
     chart_type: str,
+    export_path: Optional[str],
 ) -> None:
     """
     Plots historical prices of a given company.
@@ -265,6 +264,8 @@ def plot(
     Examples:
 
     `i8 price plot --period 1M --indicators volume --ticker MSFT --chart_type candlestick`
+
+    `i8 price plot --period 1Y --ticker MSFT --export msft.png`
     """
     if chart_type not in [t[0] for t in get_chart_param_types()]:
         click.echo(f"`{chart_type}` is not valid chart type.")
@@ -298,4 +299,7 @@ def plot(
         status.update("Generating plot...")
         fig = create_fig(df, period, indicator_categories, cmd_context, chart_type, range_selector=False)
 
+    if export_path:
+        export_plot(fig, cmd_context, export_path)
+        return
     serve_plot(fig, cmd_context)
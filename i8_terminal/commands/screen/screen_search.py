@@ -7,14 +7,20 @@ from rich.console import Console
 
 from i8_terminal.commands.screen import screen
 from i8_terminal.common.cli import pass_command
-from i8_terminal.common.layout import df2Table
+from i8_terminal.common.layout import df2Html, df2Table
 from i8_terminal.common.metrics import (
     get_current_metrics_df,
     get_metric_info,
     get_view_metrics,
     prepare_current_metrics_formatted_df,
 )
-from i8_terminal.common.utils import export_data, export_to_html
+from i8_terminal.common.screen import (
+    RELATIVE_PERIOD_TYPES,
+    get_input_metric,
+    get_metric_snapshot_df,
+    screen_metrics_snapshot,
+)
+from i8_terminal.common.utils import export_data
 from i8_terminal.config import APP_SETTINGS
 from i8_terminal.types.metric_identifier_param_type import MetricIdentifierParamType
 from i8_terminal.types.metric_view_param_type import MetricViewParamType
@@ -22,18 +28,12 @@ from i8_terminal.types.screening_condition_param_type import ScreeningConditionP
 from i8_terminal.types.screening_profile_param_type import ScreeningProfileParamType
 from i8_terminal.types.sort_order_param_type import SortOrderParamType
 
-RELATIVE_PERIOD_TYPES: Dict[str, str] = {
-    "D": ".d",
-    "R": ".r",
-    "FY": ".fy",
-    "Q": ".q",
-}
+MAX_SCREEN_TICKERS = int(APP_SETTINGS.get("screen", {}).get("max_tickers", 520))
 
 
 def prepare_screen_df(
     conditions: List[str], metrics: str, sort_by: Optional[str], sort_order: Optional[str]
 ) -> Tuple[List[str], Optional[pd.DataFrame]]:
-    max_count = 520
     for index, condition in enumerate(conditions):
         condition_parts = condition.split(":")
         metric = condition_parts[0]
@@ -48,10 +48,23 @@ def prepare_screen_df(
     tickers_list = investor8_sdk.ScreenerApi().search(
         conditions=",".join(conditions), order_by=sort_by, order_direction=sort_order
     )
-    screen_df = get_current_metrics_df(",".join(tickers_list[:max_count]), metrics)
+    screen_df = get_current_metrics_df(",".join(tickers_list[:MAX_SCREEN_TICKERS]), metrics)
     return tickers_list, screen_df
 
 
+def prepare_offline_screen_df(
+    conditions: List[str], metrics: str, sort_by: Optional[str], sort_order: Optional[str]
+) -> Tuple[List[str], Optional[pd.DataFrame]]:
+    tickers_list = screen_metrics_snapshot(conditions, sort_by if sort_by else metrics.split(",")[0], sort_order)
+    # Snapshots are stored by input metric, so the display metrics share the snapshots of the conditions
+    screen_df = pd.concat(
+        [get_metric_snapshot_df(get_input_metric(metric)).assign(input_metric=metric) for metric in metrics.split(",")],
+        ignore_index=True,
+    )
+    screen_df = screen_df[screen_df["Ticker"].isin(tickers_list[:MAX_SCREEN_TICKERS])].reset_index(drop=True)
+    return tickers_list, screen_df if not screen_df.empty else None
+
+
 def sort_by_tickers(df: pd.DataFrame, sorted_tickers: List[str]) -> pd.DataFrame:
     sorterIndex = dict(zip(sorted_tickers, range(len(sorted_tickers))))
     df["Rank"] = df["Ticker"].map(sorterIndex)
@@ -101,6 +114,13 @@ def get_screening_profile(profile: str) -> Tuple[List[str], str, str]:
 )
 @click.option("--sort_order", "sort_order", "-so", type=SortOrderParamType(), help="Order to sort the output by.")
 @click.option("--include_period", "-ip", is_flag=True, default=False, help="Output will contain the periods.")
+@click.option(
+    "--offline",
+    "-ol",
+    is_flag=True,
+    default=False,
+    help="Evaluate the conditions on a local snapshot of the current metrics, refreshed daily.",
+)
 @pass_command
 def search(
     profile: Optional[str],
@@ -111,6 +131,7 @@ def search(
     sort_by: Optional[str],
     sort_order: Optional[str],
     include_period: bool,
+    offline: bool,
 ) -> None:
     console = Console()
     if not metrics and not view_name:
@@ -152,7 +173,16 @@ def search(
     else:
         conditionList = list(condition)  # type: ignore
     with console.status("Fetching data...", spinner="material"):
-        sorted_tickers, df = prepare_screen_df(conditionList, metrics, sort_by, sort_order)  # type: ignore
+        if offline:
+            try:
+                sorted_tickers, df = prepare_offline_screen_df(
+                    conditionList, metrics, sort_by, sort_order  # type: ignore
+                )
+            except ValueError as e:
+                console.print(str(e), style="yellow")
+                return
+        else:
+            sorted_tickers, df = prepare_screen_df(conditionList, metrics, sort_by, sort_order)  # type: ignore
     if df is None:
         console.print("No data found for the provided screen conditions", style="yellow")
         return
@@ -195,11 +225,11 @@ def search(
             df_result = sort_by_tickers(prepare_current_metrics_formatted_df(df, "console"), sorted_tickers)
             if include_period:
                 df_result = reindex_df(df_result, metric_names)
-            table = df2Table(
+            df2Html(
                 df_result,
+                export_path,
                 columns_justify=columns_justify,
             )
-            export_to_html(table, export_path)
             return
         df_result = sort_by_tickers(prepare_current_metrics_formatted_df(df, "store"), sorted_tickers)
         if include_period:
@@ -9,6 +9,10 @@ from i8_terminal.common.metrics import (
     get_current_metrics_df,
     prepare_current_metrics_formatted_df,
 )
+from i8_terminal.common.utils import (
+    export_to_xlsx_constant_memory,
+    get_xlsx_constant_memory_threshold,
+)
 from i8_terminal.config import APP_SETTINGS, USER_SETTINGS
 from i8_terminal.types.user_watchlists_param_type import UserWatchlistsParamType
 
@@ -22,12 +26,7 @@ def export_watchlist_data(
     if extension != "xlsx":
         console.print("\n⚠ Error: path is not valid", style="yellow")
         return
-    writer = pd.ExcelWriter(path, engine="xlsxwriter")
-    workbook = writer.book
     column_width = 18
-    header_format = workbook.add_format(APP_SETTINGS["styles"]["xlsx"]["default"]["header"])
-    metric_format = workbook.add_format(APP_SETTINGS["styles"]["xlsx"]["default"]["metric"])
-    column_format = workbook.add_format(APP_SETTINGS["styles"]["xlsx"]["company"]["column"])
     tickers = (
         investor8_sdk.UserApi().get_watchlist_by_name_user_id(name=name, user_id=USER_SETTINGS.get("user_id")).tickers
     )
@@ -37,6 +36,27 @@ def export_watchlist_data(
         ),
         "store",
     )
+    financials_df = prepare_current_metrics_formatted_df(
+        get_current_metrics_df(
+            ",".join(tickers),
+            "total_revenue,net_income,basic_eps,net_cash_from_operating_activities,total_assets,total_liabilities",
+        ),
+        "store",
+    )
+    if len(summary_df) + len(financials_df) > get_xlsx_constant_memory_threshold():
+        export_to_xlsx_constant_memory(
+            {"Summary": summary_df, "Financials": financials_df},
+            path,
+            column_width,
+            APP_SETTINGS["styles"]["xlsx"]["company"]["column"],
+        )
+        console.print(f"\nData is saved on: {path}")
+        return
+    writer = pd.ExcelWriter(path, engine="xlsxwriter")
+    workbook = writer.book
+    header_format = workbook.add_format(APP_SETTINGS["styles"]["xlsx"]["default"]["header"])
+    metric_format = workbook.add_format(APP_SETTINGS["styles"]["xlsx"]["default"]["metric"])
+    column_format = workbook.add_format(APP_SETTINGS["styles"]["xlsx"]["company"]["column"])
     summary_df.to_excel(writer, sheet_name="Summary", startrow=1, header=False, index=False)
     worksheet = writer.sheets["Summary"]
     headers = summary_df.columns.tolist()
@@ -47,13 +67,6 @@ def export_watchlist_data(
             worksheet.write(0, col_num, value, header_format)
     worksheet.set_column(0, 0, 20, metric_format)
     worksheet.set_column(1, len(summary_df.columns) - 1, column_width, column_format)
-    financials_df = prepare_current_metrics_formatted_df(
-        get_current_metrics_df(
-            ",".join(tickers),
-            "total_revenue,net_income,basic_eps,net_cash_from_operating_activities,total_assets,total_liabilities",
-        ),
-        "store",
-    )
     financials_df.to_excel(writer, sheet_name="Financials", startrow=1, header=False, index=False)
     worksheet = writer.sheets["Financials"]
     headers = financials_df.columns.tolist()
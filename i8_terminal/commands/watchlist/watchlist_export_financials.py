@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import click
+import investor8_sdk
+import numpy as np
+from pandas import DataFrame
+from rich.console import Console
+
+from i8_terminal.commands.watchlist import watchlist
+from i8_terminal.common.cli import pass_command
+from i8_terminal.common.financials import (
+    fin_df2export_df,
+    get_statement_layout,
+    get_statements_codes,
+    prepare_financials_df,
+)
+from i8_terminal.common.financials_store import get_list_standardized_financials
+from i8_terminal.common.utils import (
+    add_xlsx_constant_memory_sheet,
+    open_xlsx_constant_memory_workbook,
+)
+from i8_terminal.config import APP_SETTINGS, USER_SETTINGS
+from i8_terminal.types.period_type_param_type import PeriodTypeParamType
+from i8_terminal.types.user_watchlists_param_type import UserWatchlistsParamType
+
+STATEMENT_SHEET_NAMES: Dict[str, str] = {
+    "cash_flow_statement": "Cash Flow",
+    "income_statement": "Income",
+    "balance_sheet_statement": "Balance Sheet",
+}
+
+
+def get_statement_export_df(
+    ticker: str, statement: str, period_type: str, period_size: int = 4
+) -> Tuple[Optional[DataFrame], Optional[str]]:
+    """
+    Returns the export frame of a statement of a company, like `financials list --export`, and the error if any.
+    """
+    try:
+        fins = get_list_standardized_financials(
+            ticker=ticker, stat_code=statement, period_type=period_type, end_year="", period_size=period_size
+        )
+        if not fins:
+            return None, None
+        fins_dict = prepare_financials_df(fins, period_size, include_ticker=False, exportize=True)
+        df = fins_dict["data"].merge(get_statement_layout(), on="tag", how="left")
+        df = df.astype(object).replace(np.nan, None)  # Replace nan with None
+        return fin_df2export_df(df, fins_dict["data"].columns[1:].to_list()), None
+    except Exception as e:
+        return None, str(e)
+
+
+def export_watchlist_financials(name: str, path: str, period_type: str) -> None:
+    console = Console()
+    if path.split(".")[-1] != "xlsx":
+        console.print("\n⚠ Error: path is not valid", style="yellow")
+        return
+    tickers = (
+        investor8_sdk.UserApi().get_watchlist_by_name_user_id(name=name, user_id=USER_SETTINGS.get("user_id")).tickers
+    )
+    statements = [(ticker, statement) for ticker in tickers for statement in get_statements_codes()]
+    get_statement_layout()  # Resolve the financial metrics metadata once for all statements
+    workbook = open_xlsx_constant_memory_workbook(path)
+    errors: List[str] = []
+    sheets_count = 0
+    with ThreadPoolExecutor(max_workers=int(APP_SETTINGS.get("financials", {}).get("workers", 8))) as executor:
+        # Sheets are written in the watchlist order as soon as their statement and the previous ones are fetched
+        results = executor.map(lambda s: get_statement_export_df(s[0], s[1], period_type), statements)
+        for (ticker, statement), (df, error) in zip(statements, results):
+            if error:
+                errors.append(
+                    f"⚠ Could not export the {STATEMENT_SHEET_NAMES[statement]} statement of {ticker}: {error}"
+                )
+            elif df is not None:
+                add_xlsx_constant_memory_sheet(
+                    workbook,
+                    f"{ticker} {STATEMENT_SHEET_NAMES[statement]}",
+                    df,
+                    18,
+                    APP_SETTINGS["styles"]["xlsx"]["financials"]["column"],
+                )
+                sheets_count += 1
+    if not sheets_count:
+        workbook.add_worksheet()
+    workbook.close()
+    for error in errors:
+        console.print(error, style="yellow")
+    console.print(f"\nData is saved on: {path}")
+
+
+@watchlist.command()
+@click.option(
+    "--name",
+    "-n",
+    type=UserWatchlistsParamType(),
+    required=True,
+    help="Name of the watchlist.",
+)
+@click.option(
+    "--period_type",
+    "-m",
+    type=PeriodTypeParamType(),
+    default="FY",
+    help="Period by which you want to export the statements. Possible values are `FY` for yearly, `Q` for quarterly, and `TTM` for TTM reports.",  # noqa: E501
+)
+@click.option("--path", "path", "-p", required=True, help="Filename to export the output to.")
+@pass_command
+def export_financials(name: str, period_type: str, path: str) -> None:
+    """
+    Exports the financial statements of the companies of a given watchlist to an excel file, a sheet per statement.
+
+    Examples:
+
+    `i8 watchlist export-financials --name MyWatchlist --period_type Q --path MyWatchlistFinancials.xlsx`
+
+    """
+    console = Console()
+    with console.status("Fetching data...", spinner="material"):
+        export_watchlist_financials(name, path, period_type)
@@ -7,12 +7,12 @@ from rich.console import Console
 
 from i8_terminal.commands.watchlist import watchlist
 from i8_terminal.common.cli import pass_command
-from i8_terminal.common.layout import df2Table
+from i8_terminal.common.layout import df2Html, df2Table
 from i8_terminal.common.metrics import (
     get_current_metrics_df,
     prepare_current_metrics_formatted_df,
 )
-from i8_terminal.common.utils import export_data, export_to_html
+from i8_terminal.common.utils import export_data
 from i8_terminal.config import APP_SETTINGS, USER_SETTINGS
 from i8_terminal.types.user_watchlists_param_type import UserWatchlistsParamType
 
@@ -71,8 +71,7 @@ def financials(name: str, export_path: Optional[str]) -> None:
                 columns_justify[metric_display_name] = (
                     "left" if metric_df["display_format"].values[0] == "str" else "right"
                 )
-            table = df2Table(prepare_current_metrics_formatted_df(df, "console"), columns_justify=columns_justify)
-            export_to_html(table, export_path)
+            df2Html(prepare_current_metrics_formatted_df(df, "console"), export_path, columns_justify=columns_justify)
             return
         export_data(
             prepare_current_metrics_formatted_df(df, "store"),
@@ -1,10 +1,12 @@
+import inspect
 import sys
 from functools import update_wrapper
 from typing import Any, Dict, Optional
 
 import click
-import investor8_sdk
 
+from i8_terminal.common.profiling import run_profiled
+from i8_terminal.common.usage_logging import USAGE_LOGGER
 from i8_terminal.config import USER_SETTINGS
 from i8_terminal.utils_setup import get_version
 
@@ -16,6 +18,8 @@ def get_click_command_path(ctx: Any, parsed_options_dict: Optional[Dict[str, str
     args = []
     options = {}
     for p in ctx.command.params:
+        if p.name == "profile_export" or (p.name == "profile" and getattr(p, "is_flag", False)):
+            continue
         if p.param_type_name == "argument":
             args.append(params[p.name])
         elif p.param_type_name == "option" and params[p.name] is not None:
@@ -30,9 +34,9 @@ def get_click_command_path(ctx: Any, parsed_options_dict: Optional[Dict[str, str
 
 def log_terminal_usage(ctx: click.Context, exception: Optional[str] = "") -> None:
     if USER_SETTINGS.get("allow_terminal_logging"):
-        investor8_sdk.UserApi().log_terminal_usage(
-            body={
-                "Command": ctx.obj["command"],
+        USAGE_LOGGER.log(
+            {
+                "Command": (ctx.obj or {}).get("command"),
                 "Version": get_version(),
                 "OS": sys.platform,
                 "AppInstanceId": USER_SETTINGS.get("app_instance_id"),
@@ -42,9 +46,23 @@ def log_terminal_usage(ctx: click.Context, exception: Optional[str] = "") -> Non
 
 
 def pass_command(f: Any) -> Any:
+    # Commands with their own `profile` parameter (e.g. the screening profile) are profiled by `i8 --profile` only
+    has_profile_param = "profile" in inspect.signature(f).parameters
+
     @click.pass_context
-    def new_func(ctx: click.Context, *args: Any, **kwargs: Any) -> Any:
+    def new_func(ctx: click.Context, *args: Any, profile_export: Optional[str] = None, **kwargs: Any) -> Any:
         ctx.obj["command"] = get_click_command_path(ctx)
+        profile = False if has_profile_param else kwargs.pop("profile", False)
+        if profile or profile_export or ctx.obj.get("profile"):
+            return run_profiled(ctx.obj["command"], lambda: ctx.invoke(f, *args, **kwargs), profile_export)
         return ctx.invoke(f, *args, **kwargs)
 
-    return update_wrapper(new_func, f)
+    new_func = update_wrapper(new_func, f)
+    click.option(
+        "--profile_export", help="Filename to export the profile to (json for Chrome trace or prof for cProfile)."
+    )(new_func)
+    if not has_profile_param:
+        click.option(
+            "--profile", is_flag=True, default=False, help="Print the time spent in each phase of the command."
+        )(new_func)
+    return new_func
@@ -0,0 +1,140 @@
+import heapq
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+import investor8_sdk
+import pandas as pd
+from pandas import DataFrame
+
+from i8_terminal.common.stock_info import COMPANIES_PATH, get_companies_index
+from i8_terminal.common.telemetry import record_cache_access
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9&]+")
+# Tokens shorter than this are only prefix matched, as a typo in them matches too many companies
+TYPO_MIN_LENGTH = 4
+TYPO_WEIGHT = 0.5
+
+
+def _tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _deletes(token: str) -> Set[str]:
+    return {token[:i] + token[i + 1 :] for i in range(len(token))}  # noqa: E203
+
+
+class CompanySearch:
+    """
+    Searches the cached companies by the prefixes of the tokens of their tickers and names, like the ticker
+    completer, tolerating a typo in the longer tokens.
+    Tokens are kept sorted so prefixes are looked up by bisection, and typos are looked up by the tokens with a
+    character deleted, so a search does not scan the companies.
+    """
+
+    def __init__(self, tickers: List[str], names: List[str], companies_mtime: float) -> None:
+        self.tickers = tickers
+        self.names = names
+        self.companies_mtime = companies_mtime
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        name_tokens: Set[str] = set()
+        for i, (ticker, name) in enumerate(zip(tickers, names)):
+            # Weights of the completer, a matched ticker token ranks above any matched name token
+            for token in _tokenize(ticker):
+                self._postings.setdefault(token, []).append((i, 3 + 1 / len(ticker)))
+            for token in _tokenize(name):
+                self._postings.setdefault(token, []).append((i, 1 + 1 / len(token)))
+                name_tokens.add(token)
+        self._tokens = sorted(self._postings)
+        # Tickers are codes rather than words, so only typos of names are tolerated
+        self._typo_tokens: Dict[str, Set[str]] = {}
+        for token in name_tokens:
+            if len(token) >= TYPO_MIN_LENGTH:
+                for key in _deletes(token) | {token}:
+                    self._typo_tokens.setdefault(key, set()).add(token)
+        self._tickers_l = sorted((ticker.lower(), i) for i, ticker in enumerate(tickers))
+
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        tokens = []
+        i = bisect_left(self._tokens, prefix)
+        while i < len(self._tokens) and self._tokens[i].startswith(prefix):
+            tokens.append(self._tokens[i])
+            i += 1
+        return tokens
+
+    def _typo_matches(self, token: str) -> Set[str]:
+        """
+        Returns the tokens within a deleted, inserted, replaced or swapped character of the given token.
+        """
+        matches: Set[str] = set()
+        for key in _deletes(token) | {token}:
+            matches |= self._typo_tokens.get(key, set())
+        return matches
+
+    def _token_scores(self, token: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for matched_token in self._prefix_tokens(token):
+            for i, weight in self._postings[matched_token]:
+                scores[i] = scores.get(i, 0.0) + weight
+        if len(token) >= TYPO_MIN_LENGTH:
+            typo_scores: Dict[int, float] = {}
+            for matched_token in self._typo_matches(token):
+                for i, weight in self._postings[matched_token]:
+                    if i not in scores:
+                        typo_scores[i] = typo_scores.get(i, 0.0) + weight * TYPO_WEIGHT
+            scores.update(typo_scores)
+        return scores
+
+    def search(self, keyword: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        Returns the tickers and names of the best matching companies. Every token of the keyword has to match a
+        token of the company.
+        """
+        scores: Optional[Dict[int, float]] = None
+        for token in _tokenize(keyword):
+            token_scores = self._token_scores(token)
+            scores = (
+                token_scores
+                if scores is None
+                else {i: score + token_scores[i] for i, score in scores.items() if i in token_scores}
+            )
+        if scores is None:
+            return []
+        keyword = keyword.replace(" ", "").lower()
+        i = bisect_left(self._tickers_l, (keyword, -1))
+        while i < len(self._tickers_l) and self._tickers_l[i][0].startswith(keyword):
+            ticker, company = self._tickers_l[i]
+            scores[company] = scores.get(company, 0.0) + 5 + 1 / len(ticker) + (10 if ticker == keyword else 0)
+            i += 1
+        best = heapq.nsmallest(limit, scores.items(), key=lambda s: (-s[1], s[0]))
+        return [(self.tickers[i], self.names[i]) for i, _ in best]
+
+
+_COMPANY_SEARCH: Optional[CompanySearch] = None
+
+
+def get_company_search() -> CompanySearch:
+    """
+    Returns the search of the cached companies, which is rebuilt only when the companies cache is refreshed.
+    """
+    global _COMPANY_SEARCH
+    companies_mtime = get_companies_index().companies_mtime
+    if _COMPANY_SEARCH is None or _COMPANY_SEARCH.companies_mtime != companies_mtime:
+        df = pd.read_csv(COMPANIES_PATH, keep_default_na=False)
+        _COMPANY_SEARCH = CompanySearch(
+            df["ticker"].astype(str).to_list(), df["name"].astype(str).to_list(), companies_mtime
+        )
+    return _COMPANY_SEARCH
+
+
+def search_companies(keyword: str, limit: int = 8) -> DataFrame:
+    """
+    Returns the tickers and names of the companies matching a keyword, searching the cached companies first and
+    the remote search only if none of them matches.
+    """
+    results = get_company_search().search(keyword, limit)
+    record_cache_access("company_search", bool(results))
+    if results:
+        return DataFrame(results, columns=["ticker", "name"])
+    remote_results = investor8_sdk.SearchApi().search_stocks(keyword, limit)
+    return DataFrame([d.to_dict() for d in remote_results], columns=["ticker", "name"])
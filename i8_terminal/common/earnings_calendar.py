@@ -0,0 +1,161 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import arrow
+import investor8_sdk
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pandas import DataFrame
+
+from i8_terminal.common.raw_api import call_raw_api, raw_records_to_df
+from i8_terminal.common.telemetry import record_cache_access
+from i8_terminal.config import APP_SETTINGS, SETTINGS_FOLDER
+
+EARNINGS_CALENDAR_PATH = os.path.join(SETTINGS_FOLDER, "earnings_calendar.pkl")
+
+
+class EarningsCalendar:
+    """
+    Earnings of all companies sorted by report date, with the positions of every ticker's earnings, so date ranges
+    and tickers are looked up without scanning the calendar.
+    """
+
+    def __init__(self, df: DataFrame, refreshed_at: str, start_date: str) -> None:
+        self.df = df.sort_values(["report_date", "ticker"], kind="stable").reset_index(drop=True)
+        self.refreshed_at = refreshed_at
+        self.start_date = start_date
+        self._dates: npt.NDArray[np.datetime64] = self.df["report_date"].to_numpy(dtype="datetime64[ns]")
+        self._ticker_positions: Dict[str, npt.NDArray[np.int64]] = self.df.groupby("ticker").indices
+
+    def between(self, from_date: Any = None, to_date: Any = None) -> DataFrame:
+        """
+        Returns the earnings reported from `from_date` to `to_date`, inclusive. A missing date leaves the range open.
+        """
+        start = int(np.searchsorted(self._dates, np.datetime64(_to_date(from_date), "ns"))) if from_date else 0
+        end = (
+            int(np.searchsorted(self._dates, np.datetime64(_to_date(to_date), "ns"), side="right"))
+            if to_date
+            else len(self._dates)
+        )
+        return self.df.iloc[start:end].reset_index(drop=True)
+
+    def for_tickers(self, tickers: List[str]) -> DataFrame:
+        """
+        Returns the earnings of the given tickers, in the order of the tickers and by report date.
+        """
+        positions = [self._ticker_positions.get(t, np.empty(0, dtype=np.int64)) for t in tickers]
+        return self.df.take(np.concatenate(positions) if positions else []).reset_index(drop=True)
+
+    def next_reports(self, tickers: List[str], date: Any = None) -> DataFrame:
+        """
+        Returns the next earnings of the given tickers from `date`, today by default. Tickers without known upcoming
+        earnings are left out.
+        """
+        day = np.datetime64(_to_date(date or arrow.now().date()), "ns")
+        next_positions = []
+        for ticker in tickers:
+            positions = self._ticker_positions.get(ticker)
+            if positions is None:
+                continue
+            i = np.searchsorted(self._dates[positions], day)
+            if i < len(positions):
+                next_positions.append(positions[i])
+        return self.df.take(next_positions).reset_index(drop=True)
+
+    def recent(self, days: int = 7, date: Any = None) -> DataFrame:
+        """
+        Returns the reported earnings of the last `days` days until `date`, latest first.
+        """
+        end = arrow.get(_to_date(date or arrow.now().date()))
+        df = self.between(end.shift(days=-days).date(), end.date())
+        return df[df["eps_actual"].notna() | df["revenue_actual"].notna()].iloc[::-1].reset_index(drop=True)
+
+
+def _to_date(date: Any) -> str:
+    return str(arrow.get(date).date())
+
+
+def _fetch_earnings_df(from_date: str, to_date: str) -> DataFrame:
+    """
+    Fetches the earnings reported between two dates, a chunk of days per request, concurrently.
+    """
+    settings = APP_SETTINGS.get("earnings", {})
+    chunk_days = int(settings.get("calendar_chunk_days", 30))
+    chunks: List[Tuple[Any, Any]] = []
+    start = arrow.get(from_date)
+    while start <= arrow.get(to_date):
+        end = min(start.shift(days=chunk_days - 1), arrow.get(to_date))
+        chunks.append((start.datetime, end.shift(days=1).shift(microseconds=-1).datetime))
+        start = end.shift(days=1)
+    with ThreadPoolExecutor(max_workers=int(settings.get("workers", 8))) as executor:
+        records = [
+            r
+            for chunk_records in executor.map(
+                lambda c: call_raw_api(investor8_sdk.EarningsApi().get_earnings_by_date, from_date=c[0], to_date=c[1]),
+                chunks,
+            )
+            for r in chunk_records or []
+        ]
+    df = raw_records_to_df(records, "StockEarningDto")
+    df["report_date"] = (
+        pd.to_datetime(df["actual_report_date"], errors="coerce", utc=True).dt.tz_localize(None).dt.normalize()
+    )
+    return df[df["report_date"].notna()]
+
+
+def _load_calendar() -> Optional[EarningsCalendar]:
+    if os.path.exists(EARNINGS_CALENDAR_PATH):
+        try:
+            calendar: EarningsCalendar = pd.read_pickle(EARNINGS_CALENDAR_PATH)
+            return calendar
+        except Exception:
+            pass
+    return None
+
+
+_CALENDAR: Optional[EarningsCalendar] = None
+_CALENDAR_LOCK = Lock()
+
+
+def _save_calendar(calendar: EarningsCalendar) -> None:
+    pd.to_pickle(calendar, f"{EARNINGS_CALENDAR_PATH}.tmp")
+    os.replace(f"{EARNINGS_CALENDAR_PATH}.tmp", EARNINGS_CALENDAR_PATH)
+
+
+def get_earnings_calendar() -> EarningsCalendar:
+    """
+    Returns the local earnings calendar, refreshed once a day.
+    Only earnings from the previous refresh minus `earnings.calendar_refresh_days` on are fetched again, as older
+    earnings are already reported, and earnings older than `earnings.calendar_lookback_days` are dropped.
+    """
+    global _CALENDAR
+    with _CALENDAR_LOCK:
+        today = arrow.now().date()
+        calendar = _CALENDAR if _CALENDAR is not None else _load_calendar()
+        is_cached = calendar is not None and calendar.refreshed_at == str(today)
+        record_cache_access("earnings_calendar", is_cached)
+        if calendar is None or not is_cached:
+            settings = APP_SETTINGS.get("earnings", {})
+            start_date = str(arrow.get(today).shift(days=-int(settings.get("calendar_lookback_days", 120))).date())
+            end_date = str(arrow.get(today).shift(days=int(settings.get("calendar_lookahead_days", 90))).date())
+            if calendar is not None and calendar.start_date <= start_date:
+                refresh_date = arrow.get(calendar.refreshed_at).shift(
+                    days=-int(settings.get("calendar_refresh_days", 14))
+                )
+                from_date = max(str(refresh_date.date()), start_date)
+                kept_df = calendar.df[
+                    (calendar.df["report_date"] >= pd.Timestamp(start_date))
+                    & (calendar.df["report_date"] < pd.Timestamp(from_date))  # noqa: W503
+                ]
+            else:
+                from_date, kept_df = start_date, None
+            df = pd.concat([kept_df, _fetch_earnings_df(from_date, end_date)], ignore_index=True)
+            # Rescheduled earnings replace the ones of the same period
+            df = df.drop_duplicates(["ticker", "fyq"], keep="last")
+            calendar = EarningsCalendar(df, str(today), start_date)
+            _save_calendar(calendar)
+        _CALENDAR = calendar
+        return calendar
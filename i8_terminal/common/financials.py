@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import arrow
@@ -9,8 +10,11 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.tree import Tree
 
-from i8_terminal.common.formatting import format_number
+from i8_terminal.common.formatting import format_numbers
 from i8_terminal.common.layout import format_df
+from i8_terminal.common.metrics import get_all_financial_metrics_df
+from i8_terminal.common.periods import NO_PERIOD_KEY, PERIOD_NAMES, get_period_keys
+from i8_terminal.common.profiling import PHASE_BUILD, PHASE_DATAFRAME, profile_phase
 from i8_terminal.common.utils import similarity
 from i8_terminal.config import APP_SETTINGS
 
@@ -74,10 +78,12 @@ def parse_identifier(identifier: str, period_type: Optional[str]) -> Dict[str, s
     identifiers_dict["ticker"] = parsed_identifier[0]
     if len(parsed_identifier) == 3:
         # {ticker}_{fiscal_year}_{fiscal_period}
-        identifiers_dict["fiscal_year"] = parsed_identifier[1]
-        identifiers_dict["fiscal_period"] = (
-            parsed_identifier[2] if parsed_identifier[2] not in ["Q4YTD", "Q4TTM"] else "FY"
-        )
+        fiscal_year, fiscal_period = parsed_identifier[1], parsed_identifier[2]
+        period_key = int(get_period_keys([fiscal_year], [fiscal_period])[0])
+        if period_key != NO_PERIOD_KEY:
+            fiscal_year, fiscal_period = str(period_key // 100), PERIOD_NAMES[period_key % 100]
+        identifiers_dict["fiscal_year"] = fiscal_year
+        identifiers_dict["fiscal_period"] = fiscal_period if fiscal_period not in ["Q4YTD", "Q4TTM"] else "FY"
     elif len(parsed_identifier) == 2:
         # {ticker}_{fiscal_year}
         if parsed_identifier[1].isnumeric():
@@ -91,19 +97,42 @@ def parse_identifier(identifier: str, period_type: Optional[str]) -> Dict[str, s
     return identifiers_dict
 
 
+@lru_cache(maxsize=None)
+def get_statement_layout() -> DataFrame:
+    """
+    Returns the financial metrics in the order they are rendered in statements, computed once per session.
+    `layout_order` is the row order and `sub_section_branch` the branch of a tag in its section, which is empty
+    if the section has no sub sections and missing if the tag is not shown.
+    """
+    df = get_all_financial_metrics_df().sort_values(["section_order", "sub_section_order", "tag_order"])
+    df["section_name"] = df["section_name"].where(df["section_name"].notna() & (df["section_name"] != "-"), "Others")
+    # A section has sub sections if its first tag has one
+    has_sub_sections = df.drop_duplicates("section_name").set_index("section_name")["sub_section_order"].fillna(0)
+    df["sub_section_branch"] = df["sub_section_name"].where(
+        df["section_name"].map(has_sub_sections.astype(bool)).to_numpy(), ""
+    )
+    # Tags of the same order keep their order in the statement
+    df["layout_order"] = df.groupby(["section_order", "sub_section_order", "tag_order"], dropna=False).ngroup()
+    return df.reset_index(drop=True)
+
+
 def render_metrics_table(table: Table, df: DataFrame, periods_list: List[str], col_width: int) -> Table:
     for p in periods_list:
         table.add_column(width=col_width, justify="right")
-    for i, r in df.iterrows():
-        if r["is_significant"]:
-            table.add_row(f'[cyan]{r["name"]}[cyan]', *[f"[cyan]{d}[cyan]" for d in r[periods_list].values])
+    for name, is_significant, values in zip(df["name"], df["is_significant"], df[periods_list].to_numpy()):
+        if is_significant:
+            table.add_row(f"[cyan]{name}[cyan]", *[f"[cyan]{d}[cyan]" for d in values])
         else:
-            table.add_row(r["name"], *r[periods_list].values)
+            table.add_row(name, *values)
 
     return table
 
 
+@profile_phase(PHASE_BUILD)
 def fin_df2Tree(df: DataFrame, header: Dict[str, List[str]], periods_list: List[str], title: str) -> Tree:
+    """
+    Renders a statement frame merged with `get_statement_layout`, grouping it by section and sub section in one pass.
+    """
     col_width = 12
     tree = Tree(Panel(title, width=55))
     # Add header table to tree
@@ -117,32 +146,27 @@ def fin_df2Tree(df: DataFrame, header: Dict[str, List[str]], periods_list: List[
     header_table.add_row("Period End Date", *header["end_date"])
     tree.add(header_table)
 
-    for sec_name, sec_metrics in df.sort_values(["section_order", "sub_section_order", "tag_order"]).groupby(
-        "section_name", sort=False
+    section_branches: Dict[str, Tree] = {}
+    for (sec_name, sub_sec_name), metrics in df.sort_values("layout_order", kind="stable").groupby(
+        ["section_name", "sub_section_branch"], sort=False
     ):
-        sec_branch = tree.add(f" {sec_name}")
-
-        if sec_metrics["sub_section_order"].values[0]:  # If sub sections exists add new branch to tree
-            for sub_sec_name, sub_sec_metrics in sec_metrics.sort_values(
-                ["section_order", "sub_section_order", "tag_order"]
-            ).groupby("sub_section_name", sort=False):
-                sub_sec_branch = sec_branch.add(sub_sec_name)
-                t = Table(
-                    width=75 + (col_width * (len(periods_list) - 1)), show_lines=False, show_header=False, box=None
-                )
-                t.add_column(width=55)
-                render_metrics_table(t, sub_sec_metrics, periods_list, col_width)
-                sub_sec_branch.add(t)
-
+        if sec_name not in section_branches:
+            section_branches[sec_name] = tree.add(f" {sec_name}")
+        if sub_sec_name:  # If sub sections exists add new branch to tree
+            t = Table(width=75 + (col_width * (len(periods_list) - 1)), show_lines=False, show_header=False, box=None)
+            t.add_column(width=55)
+            render_metrics_table(t, metrics, periods_list, col_width)
+            section_branches[sec_name].add(sub_sec_name).add(t)
         else:
             t = Table(width=79 + (col_width * (len(periods_list) - 1)), show_lines=False, show_header=False, box=None)
             t.add_column(width=59)
-            render_metrics_table(t, sec_metrics, periods_list, col_width)
-            sec_branch.add(t)
+            render_metrics_table(t, metrics, periods_list, col_width)
+            section_branches[sec_name].add(t)
 
     return tree
 
 
+@profile_phase(PHASE_DATAFRAME)
 def prepare_financials_df(
     financials_list: List[StandardizedFinancial],
     period_size: int,
@@ -153,30 +177,34 @@ def prepare_financials_df(
     df = DataFrame([d.to_dict() for d in financials_list])[
         ["ticker", "fiscal_year", "fiscal_period", "type", "filing_date", "end_date", "financial_tags"]
     ]
-    df = df.sort_values(by=["fiscal_year", "fiscal_period", "filing_date"], ascending=False)
+    df["period_key"] = get_period_keys(df["fiscal_year"], df["fiscal_period"])
+    df = df.sort_values(by=["period_key", "filing_date"], ascending=False)
     df = df.groupby(["ticker", "fiscal_year", "fiscal_period"]).head(1)
 
-    fins_dict: Dict[str, Dict[str, Any]] = {}
-    header_dict: Dict[str, List[str]] = {"end_date": [], "period": [], "ticker": []}
-    for idx, fin in df[:period_size].iterrows():
-        period = fin.fiscal_year
-        period = f"{fin.ticker} {period}" if include_ticker else period
-        header_dict["end_date"].append(arrow.get(fin.end_date).datetime.strftime("%d %b %Y"))
-        fiscal_period = "Annual" if fin.fiscal_period == "FY" else fin.fiscal_period
-        idf = f"{period}\n({fiscal_period})"  # Identifier: {ticker} {fiscal_year} \n{fiscal_period}
-        header_dict["period"].append(idf)
-        header_dict["ticker"].append(fin.ticker)
-        fins_dict[idf] = {}
-        for tag in fin.financial_tags:
-            fins_dict[idf][tag["tag_name"]] = format_number(
-                tag["value"], tag["unit"], humanize=True, exportize=exportize
-            )
+    df = df[:period_size]
+    periods = (f"{r.ticker} {r.fiscal_year}" if include_ticker else str(r.fiscal_year) for r in df.itertuples())
+    fiscal_periods = df["fiscal_period"].replace("FY", "Annual")
+    # Identifier: {ticker} {fiscal_year} \n{fiscal_period}
+    header_dict: Dict[str, List[str]] = {
+        "end_date": [arrow.get(d).datetime.strftime("%d %b %Y") for d in df["end_date"]],
+        "period": [f"{p}\n({fp})" for p, fp in zip(periods, fiscal_periods)],
+        "ticker": df["ticker"].to_list(),
+    }
 
-    df_rows = DataFrame(fins_dict.values(), index=fins_dict.keys()).T
-    df_rows = df_rows.where(pd.notnull(df_rows), "-")  # Fill nan with `-`
+    # A row per period and tag, pivoted once to a row per tag and a column per period
+    tags = df["financial_tags"].set_axis(header_dict["period"]).explode().dropna()
+    tags_df = DataFrame(tags.to_list(), columns=["tag_name", "value", "unit"]).assign(period=tags.index)
+    tags_df = tags_df.drop_duplicates(["tag_name", "period"], keep="last")
+    tags_df["value"] = format_numbers(tags_df["value"], tags_df["unit"], humanize=True, exportize=exportize)
+    df_rows = (
+        tags_df.pivot(index="tag_name", columns="period", values="value")
+        .reindex(index=tags_df["tag_name"].unique(), columns=list(dict.fromkeys(header_dict["period"])))
+        .fillna("-")
+    )
     df_rows.index = df_rows.index.set_names(["tag"])
+    df_rows.columns.name = None
     df_rows = df_rows.reset_index()
-    df_rows["tag"] = df_rows["tag"].apply(lambda x: x.split("_")[0])
+    df_rows["tag"] = df_rows["tag"].str.split("_").str[0]
 
     return {"header": header_dict, "data": df_rows}
 
@@ -190,6 +218,7 @@ def fin_df2export_df(df: pd.DataFrame, periods_list: List[str]) -> pd.DataFrame:
     return format_df(df, col_names, {})
 
 
+@profile_phase(PHASE_BUILD)
 def available_fin_df2tree(df: pd.DataFrame, ticker: str) -> Tree:
     col_width = 25
     tree = Tree(Panel(f"{ticker} Financial Statements Coverage", width=40))
@@ -207,18 +236,22 @@ def available_fin_df2tree(df: pd.DataFrame, ticker: str) -> Tree:
     )
     tree.add(header_table)
 
-    for fiscal_year, available_fins_year_df in df.sort_values(["fiscal_year"], ascending=False).groupby(
-        "fiscal_year", sort=False
-    ):
+    if df.empty:
+        return tree
+    # The available quarters of every fiscal year, period type and statement, grouped in one pass
+    available = (
+        df.assign(quarter=df["fiscal_period"].str[0:2])
+        .drop_duplicates(["fiscal_year", "period_type", "statement_code", "quarter"])
+        .sort_values("quarter")
+        .groupby(["fiscal_year", "period_type", "statement_code"])["quarter"]
+        .agg(list)
+        .to_dict()
+    )
+    for fiscal_year in sorted(df["fiscal_year"].unique(), reverse=True):
         year_branch = tree.add(f" {fiscal_year}")
 
         has_fy = False
-        for period_type, period_type_df in available_fins_year_df.merge(
-            DataFrame(get_period_types(), columns=["period_type"]), on="period_type", how="right"
-        ).groupby("period_type", sort=False):
-            period_type_df = period_type_df.merge(
-                DataFrame(get_statements_codes(), columns=["statement_code"]), on="statement_code", how="right"
-            )
+        for period_type in get_period_types():
             period_type_disp_name = f" {get_period_type_disp_name(period_type)}"
             t = Table(
                 width=46 + (col_width * (len(statement_codes) - 1)),
@@ -230,50 +263,31 @@ def available_fin_df2tree(df: pd.DataFrame, ticker: str) -> Tree:
             t.add_column(width=16)
             for st in statement_codes:
                 t.add_column(width=col_width, justify="center")
-            if period_type_df.empty:
-                t.add_row(period_type_disp_name, *["❌", "❌", "❌"])
-            else:
-                row_text = []
-                fiscal_period_df = period_type_df[["statement_code", "fiscal_period"]].groupby(
-                    "statement_code", sort=False
-                )
-                if period_type == "FY":
-                    for statement_code in get_statements_codes():
-                        if pd.isnull(
-                            fiscal_period_df.get_group(statement_code)["fiscal_period"].reset_index(drop=True)[0]
-                        ):
-                            row_text.append("❌")
-                        else:
-                            row_text.append("✔️")
-                            has_fy = True
+            row_text = []
+            for statement_code in statement_codes:
+                available_fiscal_periods = available.get((fiscal_year, period_type, statement_code))
+                if not available_fiscal_periods:
+                    row_text.append(
+                        "NA"
+                        if (
+                            statement_code == "balance_sheet_statement"
+                            and (period_type == "TTM" or period_type == "YTD")  # noqa: W503
+                        )
+                        else "❌"
+                    )
+                elif period_type == "FY":
+                    row_text.append("✔️")
+                    has_fy = True
                 else:
-                    for statement_code in get_statements_codes():
-                        if pd.isnull(
-                            fiscal_period_df.get_group(statement_code)["fiscal_period"].reset_index(drop=True)[0]
-                        ):
-                            row_text.append(
-                                "NA"
-                                if (
-                                    statement_code == "balance_sheet_statement"
-                                    and (period_type == "TTM" or period_type == "YTD")  # noqa: W503
-                                )
-                                else "❌"
-                            )
-                        else:
-                            available_fiscal_periods = []
-                            for fiscal_period in fiscal_period_df.get_group(statement_code)["fiscal_period"]:
-                                available_fiscal_periods.append(f"{fiscal_period[0:2]}")
-                            available_fiscal_periods = list(dict.fromkeys(available_fiscal_periods))
-                            available_fiscal_periods.sort()
-                            row_text.append(
-                                "Q1-Q4"
-                                if available_fiscal_periods == ["Q1", "Q2", "Q3", "Q4"]
-                                or (  # noqa: W503
-                                    period_type == "TTM" and available_fiscal_periods == ["Q1", "Q2", "Q3"] and has_fy
-                                )
-                                else ",".join(available_fiscal_periods)
-                            )
-                t.add_row(period_type_disp_name, *row_text)
+                    row_text.append(
+                        "Q1-Q4"
+                        if available_fiscal_periods == ["Q1", "Q2", "Q3", "Q4"]
+                        or (  # noqa: W503
+                            period_type == "TTM" and available_fiscal_periods == ["Q1", "Q2", "Q3"] and has_fy
+                        )
+                        else ",".join(available_fiscal_periods)
+                    )
+            t.add_row(period_type_disp_name, *row_text)
 
             year_branch.add(t)
 
@@ -0,0 +1,192 @@
+import os
+import pickle
+from threading import Lock
+from time import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import investor8_sdk
+import numpy as np
+from investor8_sdk.models.standardized_financial import StandardizedFinancial
+
+from i8_terminal.common.periods import get_period_keys
+from i8_terminal.common.telemetry import record_cache_access
+from i8_terminal.config import APP_SETTINGS, SETTINGS_FOLDER
+
+FINANCIALS_STORE_FOLDER = os.path.join(SETTINGS_FOLDER, "financials")
+
+_STORE_LOCK = Lock()
+
+
+def _get_store_path(ticker: str) -> str:
+    return os.path.join(FINANCIALS_STORE_FOLDER, f"{ticker.upper()}.pkl")
+
+
+def _load_store(ticker: str) -> Dict[str, Any]:
+    store_path = _get_store_path(ticker)
+    if os.path.exists(store_path):
+        try:
+            with open(store_path, "rb") as f:
+                store: Dict[str, Any] = pickle.load(f)
+            return store
+        except Exception:
+            pass
+    return {"available": [], "available_at": 0.0, "statements": {}}
+
+
+def _save_store(ticker: str, store: Dict[str, Any]) -> None:
+    os.makedirs(FINANCIALS_STORE_FOLDER, exist_ok=True)
+    store_path = _get_store_path(ticker)
+    with open(f"{store_path}.tmp", "wb") as f:
+        pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{store_path}.tmp", store_path)
+
+
+def _is_expired(fetched_at: float) -> bool:
+    return bool(fetched_at < time() - APP_SETTINGS.get("cache", {}).get("age", 48) * 3600)
+
+
+def _add_statements(ticker: str, statement_code: str, statements: List[StandardizedFinancial]) -> None:
+    fetched_at = time()
+    with _STORE_LOCK:
+        store = _load_store(ticker)
+        entries = {}
+        for statement in statements:
+            statement_dict = statement.to_dict()
+            # Statements are stored by ticker and (statement_code, fiscal_year, fiscal_period, filing_date)
+            key = (
+                statement_dict["statement_code"] or statement_code,
+                int(statement_dict["fiscal_year"]),
+                statement_dict["fiscal_period"],
+                str(statement_dict["filing_date"]),
+            )
+            entries[key] = {"fetched_at": fetched_at, "statement": statement_dict}
+        # Filings of the fetched periods that are not fetched again are superseded, e.g. by an amendment
+        fetched_periods = {key[:3] for key in entries}
+        store["statements"] = {
+            **{key: entry for key, entry in store["statements"].items() if key[:3] not in fetched_periods},
+            **entries,
+        }
+        _save_store(ticker, store)
+
+
+def get_available_financials(ticker: str) -> List[Dict[str, Any]]:
+    """
+    Returns the available statements of a company, which are revalidated once the cache age has passed.
+    """
+    with _STORE_LOCK:
+        store = _load_store(ticker)
+    is_cached = bool(store["available"]) and not _is_expired(store["available_at"])
+    record_cache_access("financials_available", is_cached)
+    if is_cached:
+        available: List[Dict[str, Any]] = store["available"]
+        return available
+    available = [
+        d.to_dict() for d in investor8_sdk.FinancialsApi().get_list_available_standardized_financials(ticker=ticker)
+    ]
+    with _STORE_LOCK:
+        store = _load_store(ticker)
+        store["available"], store["available_at"] = available, time()
+        _save_store(ticker, store)
+    return available
+
+
+def _get_latest_fiscal_year(available: List[Dict[str, Any]], statement_code: str) -> Optional[int]:
+    years = [int(d["fiscal_year"]) for d in available if d["statement_code"] == statement_code]
+    return max(years) if years else None
+
+
+def _find_statements(
+    ticker: str, statement_code: str, periods: List[Tuple[int, Optional[str]]]
+) -> Optional[List[StandardizedFinancial]]:
+    """
+    Returns the stored statements of the given fiscal years and periods, or None if any of them is missing or is
+    a statement of the recent fiscal years fetched before the cache age.
+    Statements of older fiscal years never change and are not revalidated.
+    """
+    latest_year = _get_latest_fiscal_year(get_available_financials(ticker), statement_code)
+    recent_years = APP_SETTINGS.get("financials", {}).get("recent_fiscal_years", 2)
+    recent_year = latest_year - recent_years + 1 if latest_year else 0
+    with _STORE_LOCK:
+        store = _load_store(ticker)
+    entries: Dict[Tuple[int, Optional[str]], List[Dict[str, Any]]] = {}
+    for key, entry in store["statements"].items():
+        if key[0] == statement_code and (key[1], key[2]) in periods:
+            entries.setdefault((key[1], key[2]), []).append(entry)
+    is_cached = all(
+        entries.get(p) and (p[0] < recent_year or not any(_is_expired(e["fetched_at"]) for e in entries[p]))
+        for p in periods
+    )
+    record_cache_access("financials_store", is_cached)
+    if not is_cached:
+        return None
+    return [StandardizedFinancial(**e["statement"]) for p in periods for e in entries[p]]
+
+
+def _get_available_periods(
+    ticker: str, statement_code: str, period_type: str, end_year: Optional[int] = None
+) -> List[Tuple[int, Optional[str]]]:
+    """
+    Returns the available fiscal years and periods of a statement and period type, latest first.
+    """
+    available = [
+        d
+        for d in get_available_financials(ticker)
+        if d["statement_code"] == statement_code
+        and d["period_type"] == period_type  # noqa: W503
+        and (not end_year or int(d["fiscal_year"]) <= end_year)  # noqa: W503
+    ]
+    period_keys = get_period_keys([d["fiscal_year"] for d in available], [d["fiscal_period"] for d in available])
+    periods = [(int(d["fiscal_year"]), d["fiscal_period"]) for d in available]
+    return list(dict.fromkeys(periods[i] for i in np.argsort(-period_keys, kind="stable")))
+
+
+def get_financials_single(
+    ticker: str, stat_code: str, fiscal_year: Any, fiscal_period: Optional[str], **kwargs: Any
+) -> Optional[StandardizedFinancial]:
+    """
+    Returns the latest filed statement of a fiscal period, of the latest fiscal year if `fiscal_year` is not given.
+    """
+    stored = _find_statements(ticker, stat_code, [(int(fiscal_year), fiscal_period)]) if fiscal_year else None
+    if stored:
+        return max(stored, key=lambda d: str(d.filing_date))
+    statement = investor8_sdk.FinancialsApi().get_financials_single(
+        ticker=ticker, stat_code=stat_code, fiscal_year=fiscal_year, fiscal_period=fiscal_period, **kwargs
+    )
+    if statement:
+        _add_statements(ticker, stat_code, [statement])
+    return statement
+
+
+def get_latest_standardized_financials(
+    ticker: str, stat_code: str, period_type: str, **kwargs: Any
+) -> Optional[StandardizedFinancial]:
+    """
+    Returns the statement of the latest available fiscal period of a period type.
+    """
+    periods = _get_available_periods(ticker, stat_code, period_type)
+    stored = _find_statements(ticker, stat_code, periods[:1]) if periods else None
+    if stored:
+        return max(stored, key=lambda d: str(d.filing_date))
+    statements = investor8_sdk.FinancialsApi().get_latest_standardized_financials(
+        ticker=ticker, stat_code=stat_code, **kwargs
+    )
+    _add_statements(ticker, stat_code, [d for d in statements.values() if d])
+    return statements.get(period_type)
+
+
+def get_list_standardized_financials(
+    ticker: str, stat_code: str, period_type: str, end_year: Any, period_size: int
+) -> List[StandardizedFinancial]:
+    """
+    Returns the statements of the latest `period_size` available fiscal periods of a period type until `end_year`.
+    """
+    periods = _get_available_periods(ticker, stat_code, period_type, int(end_year) if end_year else None)
+    stored = _find_statements(ticker, stat_code, periods[:period_size]) if periods else None
+    if stored:
+        return stored
+    statements: List[StandardizedFinancial] = investor8_sdk.FinancialsApi().get_list_standardized_financials(
+        ticker=ticker, stat_code=stat_code, period_type=period_type, end_year=end_year
+    )
+    if statements:
+        _add_statements(ticker, stat_code, statements)
+    return statements
@@ -5,8 +5,11 @@ from typing import Any, Optional, Union
 
 import arrow
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
+from i8_terminal.common.periods import format_period_keys, parse_period_key
+
 
 class color(Enum):
     i8_dark = "#015560"
@@ -75,6 +78,42 @@ def format_number(
     return res
 
 
+def format_numbers(
+    values: Any,
+    units: Any,
+    decimal: int = 2,
+    humanize: bool = False,
+    exportize: Optional[bool] = False,
+) -> npt.NDArray[Any]:
+    """
+    Formats arrays of numbers and their units like `format_number`, scaling and suffixing them at once.
+    """
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype="float64")
+    units = pd.Series(units, index=range(len(numbers)), dtype=object).to_numpy()
+    res = np.full(len(numbers), "-", dtype=object)
+    notna = ~np.isnan(numbers)
+    numbers, units = numbers[notna], units[notna]
+    if exportize:
+        res[notna] = np.round(numbers, 2)
+        return res
+
+    number = np.abs(numbers)
+    is_humanized = np.full(len(numbers), humanize) | np.isin(units, ["shares", "usdpershare"])
+    scales = [is_humanized & (number >= 1e3) & (number < 1e6), is_humanized & (number >= 1e6) & (number < 1e9)]
+    scales += [is_humanized & (number >= 1e9) & (number < 1e12), is_humanized & (number >= 1e12)]
+    divisors = np.select(scales, [1e3, 1e6, 1e9, 1e12], 1.0)
+    suffixes = np.select(scales, [" K", " M", " B", " T"], "").astype(object)
+    precisions = np.where(divisors == 1.0, decimal, 2)
+    formatted = np.array([f"{n:,.{p}f}" for n, p in zip(numbers / divisors, precisions)], dtype=object) + suffixes
+
+    is_perc = units == "percentage"
+    formatted[is_perc] = np.where(numbers[is_perc] <= 0, "", "+") + formatted[is_perc] + "%"
+    is_usd = units == "usd"
+    formatted[is_usd] = "$" + formatted[is_usd]
+    res[notna] = formatted
+    return res
+
+
 def format_number_v2(
     m: int,
     percision: int = 2,
@@ -152,7 +191,7 @@ def format_date(date: date, use_elapsed_format: bool = False, use_precise_format
 
 
 def format_fyq(fyq: str) -> str:
-    return f"{fyq[-2:]} {fyq[2:-2]}"
+    return format_period_keys([parse_period_key(fyq)])[0] or fyq
 
 
 _formatters_map = {
@@ -188,11 +227,15 @@ def styling_markdown_text(text: str) -> str:
     return re.sub("`([^`]*)`", "[magenta]\\1[/magenta]", text)
 
 
-def data_format_mapper(metric: pd.Series) -> Any:
-    if metric["data_format"] in ["int", "unsigned_int"]:
-        return int(float(metric["value"]))
-    elif metric["data_format"] == "float":
-        return float(metric["value"])
+def map_data_format(value: Any, data_format: str) -> Any:
+    if data_format in ["int", "unsigned_int"]:
+        return int(float(value))
+    elif data_format == "float":
+        return float(value)
     else:
         # Includes "datetime", "categorical", "boolean", "string" and "str"
-        return str(metric["value"])
+        return str(value)
+
+
+def data_format_mapper(metric: pd.Series) -> Any:
+    return map_data_format(metric["value"], metric["data_format"])
@@ -0,0 +1,83 @@
+from functools import wraps
+from threading import get_ident
+from time import perf_counter
+from typing import Any, Callable, List, NamedTuple, Optional
+
+import investor8_sdk
+
+
+class ApiCall(NamedTuple):
+    endpoint: str
+    start: float
+    latency: float
+    size: int
+    status: Optional[int]
+    error: Optional[str]
+    thread_id: int
+
+
+API_CALL_LISTENERS: List[Callable[[ApiCall], None]] = []
+
+
+def add_api_call_listener(listener: Callable[[ApiCall], None]) -> None:
+    instrument_api_client()
+    if listener not in API_CALL_LISTENERS:
+        API_CALL_LISTENERS.append(listener)
+
+
+def remove_api_call_listener(listener: Callable[[ApiCall], None]) -> None:
+    if listener in API_CALL_LISTENERS:
+        API_CALL_LISTENERS.remove(listener)
+
+
+def _get_response_size(response: Any) -> int:
+    if response is None:
+        return 0
+    data = getattr(response, "data", None)
+    if isinstance(data, (bytes, str)):
+        return len(data)
+    try:
+        return int(response.getheader("Content-Length") or 0)
+    except Exception:
+        return 0
+
+
+def instrument_api_client() -> None:
+    """
+    Wraps `investor8_sdk.ApiClient.call_api` once, so every SDK call is reported to the API call listeners.
+    The endpoint is the method and the resource path template, e.g. `GET /api/Price/Latest`.
+    """
+    call_api = investor8_sdk.ApiClient.call_api
+    if getattr(call_api, "__instrumented__", False):
+        return
+
+    @wraps(call_api)
+    def instrumented_call_api(self: Any, resource_path: str, method: str, *args: Any, **kwargs: Any) -> Any:
+        if not API_CALL_LISTENERS:
+            return call_api(self, resource_path, method, *args, **kwargs)
+        status, error = None, None
+        start = perf_counter()
+        try:
+            result = call_api(self, resource_path, method, *args, **kwargs)
+            status = getattr(self.last_response, "status", None)
+            return result
+        except Exception as e:
+            status, error = getattr(e, "status", None), type(e).__name__
+            raise
+        finally:
+            # Reading the size also downloads the body of streamed (`_preload_content=False`) responses
+            size = _get_response_size(getattr(self, "last_response", None)) if error is None else 0
+            call = ApiCall(
+                endpoint=f"{method} {resource_path}",
+                start=start,
+                latency=perf_counter() - start,
+                size=size,
+                status=status,
+                error=error,
+                thread_id=get_ident(),
+            )
+            for listener in list(API_CALL_LISTENERS):
+                listener(call)
+
+    instrumented_call_api.__instrumented__ = True  # type: ignore
+    investor8_sdk.ApiClient.call_api = instrumented_call_api
@@ -1,19 +1,58 @@
-from typing import Any, Dict
+from html import escape
+from io import StringIO
+from typing import Any, Dict, List
 
 import numpy as np
 from pandas import DataFrame
+from rich.console import Console
 from rich.table import Table
+from rich.terminal_theme import DEFAULT_TERMINAL_THEME
+from rich.text import Text
 
 from i8_terminal.common.formatting import data_format_mapper, get_formatter
+from i8_terminal.common.profiling import (
+    PHASE_BUILD,
+    PHASE_FORMATTING,
+    PHASE_OUTPUT,
+    profile_phase,
+)
 from i8_terminal.config import get_table_style
 
+DEFAULT_COLUMNS_JUSTIFY: Dict[str, str] = {
+    "Price": "right",
+    "Open": "right",
+    "Close": "right",
+    "Low": "right",
+    "High": "right",
+    "Volume": "right",
+    "Change": "right",
+    "Change (%)": "right",
+    "Market Cap": "right",
+    "EPS Cons.": "right",
+    "EPS Actual": "right",
+    "Revenue Cons.": "right",
+    "Revenue Actual": "right",
+    "Level": "right",
+    "EPS Estimate": "right",
+    "Revenue Estimate": "right",
+    "EPS Beat Rate": "right",
+    "Revenue Beat Rate": "right",
+    "EPS Surprise": "right",
+    "Revenue Surprise": "right",
+    "EPS Consensus": "right",
+    "Revenue Consensus": "right",
+    "Eps Surprise": "right",
+}
 
+
+@profile_phase(PHASE_FORMATTING)
 def format_df(df: DataFrame, cols_map: Dict[str, str], cols_formatters: Dict[str, Any]) -> DataFrame:
     for c, f in cols_formatters.items():
         df[c] = df[c].map(f)
     return df[cols_map.keys()].rename(columns=cols_map)
 
 
+@profile_phase(PHASE_FORMATTING)
 def format_metrics_df(df: DataFrame, target: str) -> DataFrame:
     df["value"] = df.apply(
         lambda metric: get_formatter(
@@ -27,42 +66,87 @@ def format_metrics_df(df: DataFrame, target: str) -> DataFrame:
     return df
 
 
+@profile_phase(PHASE_BUILD)
 def df2Table(df: DataFrame, style_profile: str = "default", columns_justify: Dict[str, Any] = {}) -> Table:
     MIN_COL_LENGTH = 13
     style = get_table_style(style_profile)
     table = Table(**style)
-    default_justify = {
-        "Price": "right",
-        "Open": "right",
-        "Close": "right",
-        "Low": "right",
-        "High": "right",
-        "Volume": "right",
-        "Change": "right",
-        "Change (%)": "right",
-        "Market Cap": "right",
-        "EPS Cons.": "right",
-        "EPS Actual": "right",
-        "Revenue Cons.": "right",
-        "Revenue Actual": "right",
-        "Level": "right",
-        "EPS Estimate": "right",
-        "Revenue Estimate": "right",
-        "EPS Beat Rate": "right",
-        "Revenue Beat Rate": "right",
-        "EPS Surprise": "right",
-        "Revenue Surprise": "right",
-        "EPS Consensus": "right",
-        "Revenue Consensus": "right",
-        "Eps Surprise": "right",
-    }
     for c in df.columns:
         table.add_column(
             c,
-            justify=columns_justify.get(c, default_justify.get(c, "left")),
+            justify=columns_justify.get(c, DEFAULT_COLUMNS_JUSTIFY.get(c, "left")),
             min_width=min(max(df[c].str.len().max(), len(df[c].name)), MIN_COL_LENGTH),
         )
     for _, r in df.iterrows():
         row = [r[c] if r[c] is not np.nan and r[c] is not None else "-" for c in df.columns]
         table.add_row(*row)
     return table
+
+
+def _markup_to_html(value: str, console: Console, style_classes: Dict[str, str]) -> str:
+    if "[" not in value:
+        return escape(value)
+    html_parts: List[str] = []
+    for segment in Text.from_markup(value).render(console):
+        css = segment.style.get_html_style(DEFAULT_TERMINAL_THEME) if segment.style else ""
+        if not css:
+            html_parts.append(escape(segment.text))
+            continue
+        if css not in style_classes:
+            style_classes[css] = f"s{len(style_classes)}"
+        html_parts.append(f'<span class="{style_classes[css]}">{escape(segment.text)}</span>')
+    return "".join(html_parts)
+
+
+@profile_phase(PHASE_OUTPUT)
+def df2Html(
+    df: DataFrame, export_path: str, style_profile: str = "default", columns_justify: Dict[str, Any] = {}
+) -> None:
+    """
+    Writes the formatted df to export_path as a styled html table without rendering it through rich.
+    Rich markup in cells (e.g. `[green]+1.20%[/green]`) is converted once per distinct value into css classes.
+    """
+    style = get_table_style(style_profile)
+    console = Console(file=StringIO())
+    style_classes: Dict[str, str] = {}
+    cells_html: Dict[str, str] = {}
+    for c in df.columns:
+        for value in df[c].unique():
+            if isinstance(value, str) and value not in cells_html:
+                cells_html[value] = _markup_to_html(value, console, style_classes)
+    justify_classes = [columns_justify.get(c, DEFAULT_COLUMNS_JUSTIFY.get(c, "left")) for c in df.columns]
+    rows_css = [s.get_html_style(DEFAULT_TERMINAL_THEME) for s in style["row_styles"]]
+    css_rules = [
+        "table { font-family: Menlo, 'DejaVu Sans Mono', consolas, monospace; border-collapse: collapse; }",
+        "th, td { padding: 0 1ch; white-space: pre; }",
+        f"th {{ {style['header_style'].get_html_style(DEFAULT_TERMINAL_THEME)}; border-bottom: 2px solid; }}",
+        ".left { text-align: left; }",
+        ".right { text-align: right; }",
+        ".center { text-align: center; }",
+        *[f"tr.r{idx} {{ {css} }}" for idx, css in enumerate(rows_css)],
+        *[f".{cls} {{ {css} }}" for css, cls in style_classes.items()],
+    ]
+    css = "\n".join(css_rules)
+    with open(export_path, "w", encoding="utf-8") as file:
+        file.write(
+            "<html>\n<head>\n<title>i8 Terminal by Investor8</title>\n"
+            f"<style>\n{css}\n</style>\n</head>\n<body>\n"
+            "<div><img src='https://i8terminal.io/img/TerminalLogo.png' width='16%'></div>\n<div><table>\n<tr>"
+        )
+        file.write(
+            "".join(f'<th class="{justify}">{escape(str(c))}</th>' for c, justify in zip(df.columns, justify_classes))
+        )
+        file.write("</tr>\n")
+        for idx, row in enumerate(df.itertuples(index=False, name=None)):
+            cells = []
+            for value, justify in zip(row, justify_classes):
+                if value is None or (isinstance(value, float) and np.isnan(value)):
+                    cell = "-"
+                elif isinstance(value, str):
+                    cell = cells_html[value]
+                else:
+                    cell = escape(str(value))
+                cells.append(f'<td class="{justify}">{cell}</td>')
+            file.write(f'<tr class="r{idx % len(rows_css)}">{"".join(cells)}</tr>\n')
+        file.write("</table></div>\n</body>\n</html>\n")
+    Console().print(f"Data is saved on: {export_path}")
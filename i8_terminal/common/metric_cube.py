@@ -0,0 +1,198 @@
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pandas import DataFrame
+
+from i8_terminal.common.formatting import get_formatter, map_data_format
+from i8_terminal.common.periods import argsort_periods
+
+DATE_PERIOD_TYPES = ["D", "R"]
+METRIC_COLUMNS = ["Metric", "data_format", "display_format", "default_period_type"]
+
+
+def _ordered_labels(labels: Any, order: Optional[List[str]]) -> List[str]:
+    present = list(dict.fromkeys(str(label) for label in labels))
+    ordered = [label for label in (order or []) if label in set(present)]
+    return ordered + sorted(set(present) - set(ordered))
+
+
+class MetricCube:
+    """
+    Historical metric values indexed by ticker, metric and period, built once from the long historical metrics
+    frame so tables, trees and plots are views of the same array instead of separate pivots.
+    Periods are sorted ascending, by date for daily and real-time metrics and by fiscal period otherwise.
+    Missing values are `np.nan`.
+    """
+
+    def __init__(
+        self,
+        values: npt.NDArray[Any],
+        tickers: List[str],
+        metrics: DataFrame,
+        periods: List[str],
+        period_dates: npt.NDArray[Any],
+    ) -> None:
+        self.values = values
+        self.tickers = tickers
+        self.metrics = metrics
+        self.periods = periods
+        self.period_dates = period_dates
+
+    @classmethod
+    def from_df(
+        cls, df: DataFrame, tickers: Optional[List[str]] = None, metrics: Optional[List[str]] = None
+    ) -> "MetricCube":
+        """
+        Builds the cube of a historical metrics frame. The latest value is kept when a period is repeated, and
+        the tickers and metrics are ordered as given, followed by the other ones in the frame.
+        """
+        df = df.sort_values("PeriodDateTime", ascending=False, kind="stable").drop_duplicates(
+            ["Ticker", "metric_name", "Period"]
+        )
+        metrics_df = (
+            df.drop_duplicates("metric_name")
+            .astype({"metric_name": str})
+            .set_index("metric_name")[METRIC_COLUMNS]
+            .astype(object)
+            .reindex(_ordered_labels(df["metric_name"], metrics))
+        )
+        period_dates = df.astype({"Period": str}).groupby("Period")["PeriodDateTime"].max()
+        is_date_period = bool(set(DATE_PERIOD_TYPES) & set(metrics_df["default_period_type"]))
+        period_dates = period_dates.iloc[
+            np.argsort(period_dates.to_numpy(), kind="stable")
+            if is_date_period
+            else argsort_periods(period_dates.index)
+        ]
+
+        cube = cls(
+            np.empty(0),
+            _ordered_labels(df["Ticker"], tickers),
+            metrics_df,
+            list(period_dates.index),
+            period_dates.to_numpy(),
+        )
+        is_numeric = df["value"].dtype.kind == "f"
+        cube.values = np.empty(cube.shape, dtype="float64" if is_numeric else object)
+        cube.values.fill(np.nan)
+        cube.values[
+            pd.Index(cube.tickers).get_indexer(df["Ticker"].astype(str)),
+            pd.Index(cube.metrics.index).get_indexer(df["metric_name"].astype(str)),
+            pd.Index(cube.periods).get_indexer(df["Period"].astype(str)),
+        ] = df["value"].to_numpy()
+        return cube
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return len(self.tickers), len(self.metrics), len(self.periods)
+
+    @property
+    def metric_names(self) -> List[str]:
+        return list(self.metrics.index)
+
+    @property
+    def display_names(self) -> List[str]:
+        return list(self.metrics["Metric"])
+
+    @property
+    def is_date_period(self) -> bool:
+        return bool(set(DATE_PERIOD_TYPES) & set(self.metrics["default_period_type"]))
+
+    def notna(self) -> npt.NDArray[np.bool_]:
+        notna: npt.NDArray[np.bool_] = pd.notna(self.values)
+        return notna
+
+    def sel(
+        self,
+        tickers: Optional[List[str]] = None,
+        metrics: Optional[List[str]] = None,
+        periods: Optional[List[str]] = None,
+    ) -> "MetricCube":
+        """
+        Returns the cube of the given tickers, metric names and periods. Labels missing from the cube are filled
+        with `np.nan`, so the result can be used to align cubes.
+        """
+        tickers = self.tickers if tickers is None else tickers
+        metrics = self.metric_names if metrics is None else metrics
+        periods = self.periods if periods is None else periods
+        indexers = [
+            pd.Index(labels).get_indexer(selected)
+            for labels, selected in [(self.tickers, tickers), (self.metric_names, metrics), (self.periods, periods)]
+        ]
+        values = np.empty((len(tickers), len(metrics), len(periods)), dtype=self.values.dtype)
+        values.fill(np.nan)
+        found = np.ix_(*[i >= 0 for i in indexers])
+        values[found] = self.values[np.ix_(*[i[i >= 0] for i in indexers])]
+        period_dates = pd.Series(self.period_dates, index=self.periods).reindex(periods).to_numpy()
+        return MetricCube(values, tickers, self.metrics.reindex(metrics), periods, period_dates)
+
+    def format(self, target: str) -> "MetricCube":
+        """
+        Returns the cube of the formatted values, using the data and display formats of every metric.
+        """
+        values = np.empty(self.shape, dtype=object)
+        values.fill(np.nan)
+        notna = self.notna()
+        for i, metric in enumerate(self.metrics.itertuples()):
+            formatter = get_formatter(
+                "number_int"
+                if metric.data_format == "int" and metric.display_format == "number"
+                else metric.display_format,
+                target,
+            )
+            metric_notna = notna[:, i, :]
+            values[:, i, :][metric_notna] = [
+                formatter(map_data_format(v, metric.data_format)) for v in self.values[:, i, :][metric_notna]
+            ]
+        return MetricCube(values, self.tickers, self.metrics, self.periods, self.period_dates)
+
+    def iter_series(self) -> Iterator[Tuple[int, int, List[str], npt.NDArray[Any]]]:
+        """
+        Yields the metric index, the ticker index, the periods and the values of every ticker and metric with data.
+        """
+        notna = self.notna()
+        periods = np.array(self.periods, dtype=object)
+        for m in range(len(self.metrics)):
+            for t in range(len(self.tickers)):
+                if notna[t, m].any():
+                    yield m, t, list(periods[notna[t, m]]), self.values[t, m][notna[t, m]]
+
+    def to_table_df(self) -> DataFrame:
+        """
+        Returns a row per ticker and period, latest periods first, and a column per metric.
+        """
+        periods = self.periods[::-1]
+        values = self.values[:, :, ::-1].transpose(0, 2, 1).reshape(-1, len(self.metrics))
+        has_data = self.notna()[:, :, ::-1].any(axis=1).reshape(-1)
+        df = DataFrame(values, columns=self.display_names)
+        df.insert(0, "Ticker", np.repeat(self.tickers, len(periods)))
+        df.insert(1, "Period", np.tile(periods, len(self.tickers)))
+        return df[has_data].reset_index(drop=True)
+
+    def to_tree_df(self) -> DataFrame:
+        """
+        Returns a row per metric and ticker, and a column per period, latest periods first.
+        """
+        values = self.values[:, :, ::-1].transpose(1, 0, 2).reshape(-1, len(self.periods))
+        has_data = self.notna().any(axis=2).transpose().reshape(-1)
+        df = DataFrame(values, columns=self.periods[::-1])
+        df.insert(0, "Metric", np.repeat(self.display_names, len(self.tickers)))
+        df.insert(1, "Ticker", np.tile(self.tickers, len(self.metrics)))
+        return df[has_data].reset_index(drop=True)
+
+    def to_df(self) -> DataFrame:
+        """
+        Returns the long frame of the values with data, e.g. to export them.
+        """
+        t, m, p = np.nonzero(self.notna())
+        return DataFrame(
+            {
+                "Ticker": pd.Categorical.from_codes(t, self.tickers),
+                "metric_name": pd.Categorical.from_codes(m, self.metric_names),
+                "Metric": np.array(self.display_names, dtype=object)[m],
+                "Period": pd.Categorical.from_codes(p, self.periods),
+                "PeriodDateTime": self.period_dates[p],
+                "value": self.values[t, m, p],
+            }
+        )
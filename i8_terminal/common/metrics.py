@@ -1,5 +1,5 @@
 import os
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import arrow
 import investor8_sdk
@@ -9,8 +9,16 @@ from investor8_sdk import MetricsApi
 from pandas import DataFrame, read_csv
 
 from i8_terminal.common.layout import format_metrics_df
+from i8_terminal.common.periods import argsort_periods
+from i8_terminal.common.profiling import (
+    PHASE_DATAFRAME,
+    PHASE_FORMATTING,
+    profile_phase,
+)
+from i8_terminal.common.raw_api import call_raw_api, raw_records_to_df
 from i8_terminal.common.stock_info import get_tickers_list
-from i8_terminal.common.utils import is_cached_file_expired, reverse_period, similarity
+from i8_terminal.common.telemetry import record_cache_access
+from i8_terminal.common.utils import is_cached_file_expired, similarity
 from i8_terminal.config import APP_SETTINGS, SETTINGS_FOLDER
 
 
@@ -63,11 +71,13 @@ def find_similar_indicator(indicator: str) -> Optional[str]:
 
 def get_all_metrics_df() -> DataFrame:
     metric_path = f"{SETTINGS_FOLDER}/metrics_metadata.csv"
-    if os.path.exists(metric_path) and not is_cached_file_expired(metric_path):
+    is_cached = os.path.exists(metric_path) and not is_cached_file_expired(metric_path)
+    record_cache_access("metrics_metadata", is_cached)
+    if is_cached:
         df = read_csv(metric_path)
     else:
-        all_metrics = MetricsApi().get_list_metrics_metadata(page_size=1000)
-        df = DataFrame([m.to_dict() for m in all_metrics])
+        all_metrics = call_raw_api(MetricsApi().get_list_metrics_metadata, page_size=1000)
+        df = raw_records_to_df(all_metrics, "GetListMetricsMetadataDto")
         df["categories"] = [str(cat) for cat in df["categories"]]
         df = df.drop(columns=["id", "last_modified"])
         df.to_csv(metric_path, index=False)
@@ -77,16 +87,69 @@ def get_all_metrics_df() -> DataFrame:
 
 def get_all_financial_metrics_df() -> DataFrame:
     metric_path = f"{SETTINGS_FOLDER}/financial_metrics_metadata.csv"
-    if os.path.exists(metric_path) and not is_cached_file_expired(metric_path):
+    is_cached = os.path.exists(metric_path) and not is_cached_file_expired(metric_path)
+    record_cache_access("financial_metrics_metadata", is_cached)
+    if is_cached:
         df = read_csv(metric_path)
     else:
-        all_metrics = MetricsApi().get_list_financial_metrics_metadata()
-        df = DataFrame([m.to_dict() for m in all_metrics])
+        all_metrics = call_raw_api(MetricsApi().get_list_financial_metrics_metadata)
+        df = raw_records_to_df(all_metrics, "FinancialMetricMetadataDto")
         df.to_csv(metric_path, index=False)
 
     return df
 
 
+def historical_metrics_to_df(historical_metrics: Dict[str, Any]) -> Tuple[DataFrame, DataFrame]:
+    """
+    Builds the long values frame and the metadata frame of a raw historical metrics response.
+    """
+    df = DataFrame.from_records(
+        [
+            (ticker, metric, period_value.get("Period"), period_value.get("PeriodDateTime"), period_value.get("Value"))
+            for ticker, metric_dict in (historical_metrics.get("Data") or {}).items()
+            for metric, period_value_list in metric_dict.items()
+            for period_value in period_value_list
+        ],
+        columns=["Ticker", "metric_name", "Period", "PeriodDateTime", "Value"],
+    )
+    df["PeriodDateTime"] = pd.to_datetime(df["PeriodDateTime"], errors="coerce")
+    metadata_df = raw_records_to_df(historical_metrics.get("Metadata") or [], "MetricsMetadataResponseDto")
+    return df, metadata_df
+
+
+def compact_historical_metrics_df(df: DataFrame, metadata_df: DataFrame) -> DataFrame:
+    """
+    Joins the metadata to the long historical metrics frame by metric code instead of merging it per row.
+    Repeated strings are kept as categoricals, and the values are a float array when all metrics are numeric.
+    """
+    df = df.astype({"Ticker": "category", "metric_name": "category", "Period": "category"})
+    metadata_df = (
+        metadata_df.drop_duplicates("metric_name")
+        .set_index("metric_name")
+        .reindex(df["metric_name"].cat.categories)
+        .replace({"data_format": {"string": "str"}, "display_format": {"string": "str"}})
+    )
+    codes = df["metric_name"].cat.codes.to_numpy()
+    has_metadata = (codes >= 0) & metadata_df["display_name"].notna().to_numpy()[codes]
+    df = df[has_metadata].reset_index(drop=True)
+    codes = codes[has_metadata]
+    for column in metadata_df.columns:
+        df[column] = pd.Categorical(metadata_df[column]).take(codes)
+
+    is_int = df["data_format"].isin(["int", "unsigned_int"]).to_numpy()
+    is_numeric = is_int | (df["data_format"] == "float").to_numpy()
+    numeric_values = pd.to_numeric(df["Value"], errors="coerce").to_numpy(dtype="float64")
+    numeric_values[is_int] = np.trunc(numeric_values[is_int])
+    if is_numeric.all():
+        df["Value"] = numeric_values
+    else:
+        # Includes "datetime", "categorical", "boolean", "string" and "str"
+        values = df["Value"].astype(str).to_numpy(dtype=object)
+        values[is_numeric] = numeric_values[is_numeric]
+        df["Value"] = values
+    return df.rename(columns={"display_name": "Metric", "Value": "value"})
+
+
 def get_metrics_display_names(metrics: List[str]) -> List[str]:
     all_metrics = get_all_metrics_df()[["metric_name", "display_name"]]
     return list(set(all_metrics[all_metrics.metric_name.isin(metrics)]["display_name"]))
@@ -118,17 +181,19 @@ def get_period_start_date(period: str) -> str:
     return period_start_date[period]
 
 
+@profile_phase(PHASE_DATAFRAME)
 def get_current_metrics_df(tickers: str, metricsList: str) -> Optional[pd.DataFrame]:
     tickers_list = get_tickers_list(tickers)
-    metrics = investor8_sdk.MetricsApi().get_current_metrics(
+    metrics = call_raw_api(
+        investor8_sdk.MetricsApi().get_current_metrics,
         symbols=",".join(tickers_list),
         metrics=metricsList,
     )
-    if metrics.data is None:
+    if metrics.get("Data") is None:
         return None
-    metrics_data_df = pd.DataFrame([m.to_dict() for m in metrics.data])
+    metrics_data_df = raw_records_to_df(metrics["Data"], "CurrentMetricsDto")
     metrics_data_df.rename(columns={"metric": "metric_name", "symbol": "Ticker"}, inplace=True)
-    metrics_metadata_df = pd.DataFrame([m.to_dict() for m in metrics.metadata])
+    metrics_metadata_df = raw_records_to_df(metrics.get("Metadata") or [], "MetricsMetadataResponseDto")
     df = pd.merge(metrics_data_df, metrics_metadata_df, on="metric_name")
     df[["data_format", "display_format"]] = df[["data_format", "display_format"]].replace("string", "str")
     df["value"].replace("None", np.nan, inplace=True)
@@ -136,6 +201,7 @@ def get_current_metrics_df(tickers: str, metricsList: str) -> Optional[pd.DataFr
     return df
 
 
+@profile_phase(PHASE_FORMATTING)
 def prepare_current_metrics_formatted_df(
     df: DataFrame,
     target: str,
@@ -149,14 +215,10 @@ def prepare_current_metrics_formatted_df(
         formatted_df = formatted_df.pivot(
             index=["Ticker", "Period"], columns="display_name", values="value"
         ).reset_index()
-        formatted_df["reversed_period"] = formatted_df.apply(lambda row: reverse_period(row.Period), axis=1)
+        formatted_df = formatted_df.iloc[argsort_periods(formatted_df["Period"], ascending=False)]
         if tickers_order:
             formatted_df = add_ticker_rank_to_df(formatted_df, tickers_order)
-            formatted_df.sort_values(["TickerRank", "reversed_period"], ascending=[True, False], inplace=True)
-            formatted_df.drop(columns=["reversed_period", "TickerRank"], inplace=True)
-        else:
-            formatted_df.sort_values("reversed_period", ascending=False, inplace=True)
-            formatted_df.drop(columns="reversed_period", inplace=True)
+            formatted_df = formatted_df.sort_values("TickerRank", kind="stable").drop(columns="TickerRank")
         formatted_df["Period"].replace("", "NA", inplace=True)
         if metrics_order:
             metrics_order[:0] = ["Ticker", "Period"]
@@ -194,5 +256,5 @@ def get_view_metrics(viewName: str) -> List[str]:
 
 def add_ticker_rank_to_df(df: DataFrame, tickers_list: List[str]) -> DataFrame:
     sorter_ticker_index = dict(zip(tickers_list, range(len(tickers_list))))
-    df["TickerRank"] = df["Ticker"].map(sorter_ticker_index)
+    df["TickerRank"] = df["Ticker"].astype(str).map(sorter_ticker_index)
     return df
@@ -0,0 +1,68 @@
+from typing import Any, Dict, List
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+# A fiscal period key is `fiscal_year * 100 + period_code`, so keys sort in fiscal order as integers.
+# The tens of the period code are the quarter and the units the period type, and `FY` ends the fourth quarter.
+PERIOD_CODES: Dict[str, int] = {
+    **{f"Q{q}{suffix}": q * 10 + i for q in range(1, 5) for i, suffix in enumerate(["", "YTD", "TTM"])},
+    "FY": 43,
+    # A quarter without its number, e.g. `2021 Q`, comes before the quarters of its year
+    "Q": 0,
+}
+PERIOD_NAMES = {code: name for name, code in PERIOD_CODES.items()}
+NO_PERIOD_KEY = -1
+
+_PERIOD_NAME_PATTERN = "FY|Q(?:[1-4](?:YTD|TTM)?)?"
+# Matches `Q1 2021`, `2021 Q1`, `2021 Q` and fyq codes like `FY2021Q1`
+_PERIOD_PATTERN = (
+    rf"^(?:(?P<period_1>{_PERIOD_NAME_PATTERN}) (?P<year_1>\d{{4}})"
+    rf"|(?P<year_2>\d{{4}}) (?P<period_2>{_PERIOD_NAME_PATTERN})"
+    rf"|FY(?P<year_3>\d{{4}})(?P<period_3>{_PERIOD_NAME_PATTERN}))$"
+)
+
+
+def get_period_keys(fiscal_years: Any, fiscal_periods: Any) -> npt.NDArray[np.int64]:
+    """
+    Returns the period keys of fiscal years and fiscal periods (e.g. `2021` and `Q1`), `-1` if not a fiscal period.
+    """
+    years = pd.to_numeric(pd.Series(fiscal_years, dtype=object), errors="coerce").to_numpy(dtype="float64")
+    codes = pd.Series(fiscal_periods, dtype=object).map(PERIOD_CODES).to_numpy(dtype="float64")
+    keys = years * 100 + codes
+    return np.where(np.isnan(keys), NO_PERIOD_KEY, keys).astype(np.int64)
+
+
+def parse_period_keys(periods: Any) -> npt.NDArray[np.int64]:
+    """
+    Returns the period keys of period labels, `-1` for labels that are not fiscal periods (e.g. dates).
+    """
+    parts = pd.Series(periods, dtype=object).astype(str).str.extract(_PERIOD_PATTERN)
+    years = parts["year_1"].fillna(parts["year_2"]).fillna(parts["year_3"])
+    fiscal_periods = parts["period_1"].fillna(parts["period_2"]).fillna(parts["period_3"])
+    return get_period_keys(years, fiscal_periods)
+
+
+def argsort_periods(periods: Any, ascending: bool = True) -> npt.NDArray[np.int64]:
+    """
+    Returns the indices sorting period labels by their period keys. Labels that are not fiscal periods come before
+    the fiscal periods and are sorted by label, e.g. dates.
+    """
+    labels = pd.Series(periods, dtype=object).astype(str).to_numpy()
+    indices: npt.NDArray[np.int64] = np.lexsort((labels, parse_period_keys(labels)))
+    return indices if ascending else indices[::-1]
+
+
+def parse_period_key(period: str) -> int:
+    return int(parse_period_keys([period])[0])
+
+
+def format_period_keys(keys: Any) -> List[str]:
+    """
+    Returns the labels of period keys, e.g. `Q1 2021` or `FY 2021`, and an empty label for `-1`.
+    """
+    return [
+        f"{PERIOD_NAMES[key % 100]} {key // 100}" if key % 100 in PERIOD_NAMES and key > 0 else ""
+        for key in np.asarray(keys, dtype=np.int64).tolist()
+    ]
@@ -7,8 +7,11 @@ import pandas as pd
 from pandas.core.frame import DataFrame
 
 from i8_terminal.common.formatting import format_number
+from i8_terminal.common.profiling import PHASE_DATAFRAME, profile_phase
+from i8_terminal.common.raw_api import call_raw_api, raw_records_to_df
 
 
+@profile_phase(PHASE_DATAFRAME)
 def get_historical_price_df(
     tickers: List[str],
     period_code: int,
@@ -22,14 +25,18 @@ def get_historical_price_df(
             to_date = datetime.now().strftime("%Y-%m-%d")
         for tk in tickers:
             historical_prices.extend(
-                investor8_sdk.PriceApi().get_historical_prices(ticker=tk, from_date=from_date, to_date=to_date)
+                call_raw_api(
+                    investor8_sdk.PriceApi().get_historical_prices, ticker=tk, from_date=from_date, to_date=to_date
+                )
             )
     else:
         for tk in tickers:
-            historical_prices.extend(investor8_sdk.PriceApi().get_historical_prices(ticker=tk, period=period_code))
+            historical_prices.extend(
+                call_raw_api(investor8_sdk.PriceApi().get_historical_prices, ticker=tk, period=period_code)
+            )
     if not historical_prices:
         return None
-    df = DataFrame([h.to_dict() for h in historical_prices])
+    df = raw_records_to_df(historical_prices, "StockPrice")
     df = df.sort_values(by=["ticker", "timestamp"], ascending=False).reset_index(drop=True)
     df["Date"] = pd.to_datetime(df["timestamp"], unit="s").dt.tz_localize("UTC")
     if len(tickers) > 1:
@@ -48,6 +55,7 @@ def get_historical_price_df(
     return df
 
 
+@profile_phase(PHASE_DATAFRAME)
 def get_historical_price_export_df(
     tickers: List[str],
     period_code: int,
@@ -77,6 +85,7 @@ def get_historical_price_export_df(
     return df
 
 
+@profile_phase(PHASE_DATAFRAME)
 def get_historical_price_list_df(
     tickers: List[str],
     period_code: int,
@@ -0,0 +1,226 @@
+import cProfile
+import json
+import os
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock, get_ident
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, cast
+
+from rich.console import Console
+from rich.table import Table
+
+from i8_terminal.common.instrumentation import (
+    ApiCall,
+    add_api_call_listener,
+    remove_api_call_listener,
+)
+from i8_terminal.config import get_table_style
+
+PHASE_API = "API calls"
+PHASE_DATAFRAME = "DataFrame build"
+PHASE_FORMATTING = "Formatting"
+PHASE_BUILD = "Table / figure build"
+PHASE_OUTPUT = "Output"
+PHASE_OTHER = "Other"
+PROFILE_PHASES = [PHASE_API, PHASE_DATAFRAME, PHASE_FORMATTING, PHASE_BUILD, PHASE_OUTPUT, PHASE_OTHER]
+PROFILE_EXPORT_FORMATS = ["json", "prof"]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_ACTIVE_PROFILER: Optional["CommandProfiler"] = None
+
+
+class CommandProfiler:
+    """
+    Records the wall time of a command per phase. Time spent in a nested phase is only counted for the nested
+    phase, and API calls made from other threads are listed but not added to the phase breakdown.
+    """
+
+    def __init__(self, command: str) -> None:
+        self.command = command
+        self.phase_times: Dict[str, float] = defaultdict(float)
+        self.api_calls: List[ApiCall] = []
+        self.trace_events: List[Dict[str, Any]] = []
+        self.start = perf_counter()
+        self.duration = 0.0
+        self._stack: List[List[Any]] = []
+        self._thread_id = get_ident()
+        self._lock = Lock()
+
+    def _add_trace_event(self, name: str, category: str, start: float, duration: float, **args: Any) -> None:
+        with self._lock:
+            self.trace_events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self.start) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": os.getpid(),
+                    "tid": get_ident(),
+                    "args": args,
+                }
+            )
+
+    def _add_phase_time(self, name: str, duration: float, child_duration: float = 0) -> None:
+        self.phase_times[name] += duration - child_duration
+        if self._stack:
+            self._stack[-1][1] += duration
+
+    @contextmanager
+    def phase(self, name: str, label: Optional[str] = None) -> Iterator[None]:
+        is_main_thread = get_ident() == self._thread_id
+        start = perf_counter()
+        if is_main_thread:
+            self._stack.append([name, 0.0])
+        try:
+            yield
+        finally:
+            duration = perf_counter() - start
+            if is_main_thread:
+                _, child_duration = self._stack.pop()
+                self._add_phase_time(name, duration, child_duration)
+            self._add_trace_event(label or name, name, start, duration)
+
+    def on_api_call(self, call: ApiCall) -> None:
+        with self._lock:
+            self.api_calls.append(call)
+        if call.thread_id == self._thread_id:
+            self._add_phase_time(PHASE_API, call.latency)
+        self._add_trace_event(
+            call.endpoint, PHASE_API, call.start, call.latency, size=call.size, status=call.status, error=call.error
+        )
+
+    def stop(self) -> None:
+        self.duration = perf_counter() - self.start
+        self.phase_times[PHASE_OTHER] = max(self.duration - sum(self.phase_times.values()), 0)
+
+    def get_phases_table(self) -> Table:
+        table = Table(title=f"Profile: {self.command}", **get_table_style())
+        table.add_column("Phase")
+        table.add_column("Time (s)", justify="right")
+        table.add_column("Share", justify="right")
+        for phase in PROFILE_PHASES:
+            phase_time = self.phase_times.get(phase, 0)
+            share = phase_time / self.duration if self.duration else 0
+            table.add_row(phase, f"{phase_time:.3f}", f"{share:.1%}")
+        table.add_row("Total", f"{self.duration:.3f}", "100.0%")
+        return table
+
+    def get_api_calls_table(self) -> Table:
+        endpoints: Dict[str, List[ApiCall]] = defaultdict(list)
+        for call in self.api_calls:
+            endpoints[call.endpoint].append(call)
+        table = Table(**get_table_style())
+        table.add_column("Endpoint")
+        table.add_column("Calls", justify="right")
+        table.add_column("Latency (s)", justify="right")
+        table.add_column("Max Latency (s)", justify="right")
+        table.add_column("Size (KB)", justify="right")
+        table.add_column("Errors", justify="right")
+        for endpoint, calls in sorted(endpoints.items(), key=lambda e: -sum(c.latency for c in e[1])):
+            table.add_row(
+                endpoint,
+                str(len(calls)),
+                f"{sum(c.latency for c in calls):.3f}",
+                f"{max(c.latency for c in calls):.3f}",
+                f"{sum(c.size for c in calls) / 1024:,.1f}",
+                str(len([c for c in calls if c.error])),
+            )
+        return table
+
+    def export_trace(self, export_path: str) -> None:
+        with open(export_path, "w") as f:
+            json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}, f)
+
+
+def get_active_profiler() -> Optional[CommandProfiler]:
+    return _ACTIVE_PROFILER
+
+
+@contextmanager
+def profiled_phase(name: str, label: Optional[str] = None) -> Iterator[None]:
+    profiler = _ACTIVE_PROFILER
+    if profiler is None:
+        yield
+        return
+    with profiler.phase(name, label):
+        yield
+
+
+def profile_phase(name: str) -> Callable[[F], F]:
+    """
+    Decorates a function so its wall time is recorded under the given phase when a command is profiled.
+    """
+
+    def decorate(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _ACTIVE_PROFILER
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.phase(name, func.__qualname__):
+                return func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorate
+
+
+@contextmanager
+def _profile_console_output() -> Iterator[None]:
+    console_print = Console.print
+
+    @wraps(console_print)
+    def profiled_print(self: Console, *args: Any, **kwargs: Any) -> None:
+        with profiled_phase(PHASE_OUTPUT, "Console.print"):
+            console_print(self, *args, **kwargs)
+
+    Console.print = profiled_print  # type: ignore
+    try:
+        yield
+    finally:
+        Console.print = console_print  # type: ignore
+
+
+def run_profiled(command: str, func: Callable[[], Any], export_path: Optional[str] = None) -> Any:
+    """
+    Runs the command function with the phase profiler, and cProfile when `export_path` is a `.prof` file,
+    then prints the phase summary and exports the profile. `.json` files are exported in Chrome trace format.
+    """
+    global _ACTIVE_PROFILER
+    console = Console()
+    extension = export_path.split(".")[-1].lower() if export_path else None
+    if extension and extension not in PROFILE_EXPORT_FORMATS:
+        console.print(
+            "profile_export is not valid. Supported formats are json (Chrome trace) and prof.", style="yellow"
+        )
+        extension = export_path = None
+    profiler = CommandProfiler(command)
+    c_profiler = cProfile.Profile() if extension == "prof" else None
+    _ACTIVE_PROFILER = profiler
+    add_api_call_listener(profiler.on_api_call)
+    try:
+        with _profile_console_output():
+            if c_profiler:
+                c_profiler.enable()
+            try:
+                return func()
+            finally:
+                if c_profiler:
+                    c_profiler.disable()
+    finally:
+        remove_api_call_listener(profiler.on_api_call)
+        _ACTIVE_PROFILER = None
+        profiler.stop()
+        console.print(profiler.get_phases_table())
+        if profiler.api_calls:
+            console.print(profiler.get_api_calls_table())
+        if export_path:
+            if c_profiler:
+                c_profiler.dump_stats(export_path)
+            else:
+                profiler.export_trace(export_path)
+            console.print(f"Profile is saved on: {export_path}")
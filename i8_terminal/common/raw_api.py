@@ -0,0 +1,85 @@
+import json
+import re
+from typing import Any, Callable, Dict, List
+
+import investor8_sdk
+import pandas as pd
+from dateutil.parser import parse as parse_date  # type: ignore
+from pandas import DataFrame
+
+PRIMITIVE_TYPES = ["str", "int", "float", "bool", "object", "date", "datetime"]
+DICT_TYPE_PATTERN = re.compile(r"^dict\(([^,]*), (.*)\)$")
+
+
+def call_raw_api(api_method: Callable[..., Any], **kwargs: Any) -> Any:
+    """
+    Calls an SDK method without deserializing the response into model objects, and returns the parsed JSON.
+    """
+    response = api_method(_preload_content=False, **kwargs)
+    try:
+        return json.loads(response.data)
+    finally:
+        response.release_conn()
+
+
+def _get_model(swagger_type: str) -> Any:
+    return getattr(investor8_sdk.models, swagger_type)
+
+
+def _is_plain_type(swagger_type: str) -> bool:
+    if swagger_type.startswith("list["):
+        return _is_plain_type(swagger_type[5:-1])
+    dict_match = DICT_TYPE_PATTERN.match(swagger_type)
+    if dict_match:
+        return _is_plain_type(dict_match.group(2))
+    return swagger_type in PRIMITIVE_TYPES
+
+
+def to_model_dict(data: Any, swagger_type: str) -> Any:
+    """
+    Converts raw JSON to what `to_dict()` of the deserialized SDK models returns, without building the models.
+    Dates are parsed like the SDK deserializer parses them.
+    """
+    if data is None:
+        return None
+    if swagger_type.startswith("list["):
+        return [to_model_dict(d, swagger_type[5:-1]) for d in data]
+    dict_match = DICT_TYPE_PATTERN.match(swagger_type)
+    if dict_match:
+        return {k: to_model_dict(v, dict_match.group(2)) for k, v in data.items()}
+    if swagger_type == "str":
+        return data if isinstance(data, str) else str(data)
+    if swagger_type == "datetime":
+        return parse_date(data)
+    if swagger_type == "date":
+        return parse_date(data).date()
+    if swagger_type in PRIMITIVE_TYPES:
+        return data
+    model = _get_model(swagger_type)
+    return {attr: to_model_dict(data.get(key), model.swagger_types[attr]) for attr, key in model.attribute_map.items()}
+
+
+def raw_records_to_df(records: List[Dict[str, Any]], swagger_type: str) -> DataFrame:
+    """
+    Builds the same DataFrame as `DataFrame([m.to_dict() for m in models])` column by column from raw JSON records.
+    """
+    model = _get_model(swagger_type)
+    df = DataFrame.from_records(records) if records else DataFrame()
+    df = df.rename(columns={key: attr for attr, key in model.attribute_map.items()}).reindex(
+        columns=list(model.swagger_types)
+    )
+    for attr, attr_type in model.swagger_types.items():
+        if df.empty:
+            break
+        if df[attr].isna().all():
+            # The SDK models give None for missing values, which pandas keeps as objects when a column has no value
+            df[attr] = None
+        elif attr_type == "datetime":
+            df[attr] = pd.to_datetime(df[attr], errors="coerce")
+        elif attr_type == "str":
+            # Converted from the raw values, as the frame turns ints with nulls into floats
+            key = model.attribute_map[attr]
+            df[attr] = [to_model_dict(r.get(key), "str") for r in records]
+        elif attr_type == "date" or not _is_plain_type(attr_type):
+            df[attr] = [to_model_dict(v, attr_type) for v in df[attr]]
+    return df
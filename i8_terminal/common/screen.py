@@ -1,19 +1,56 @@
-from typing import Any, Dict, Optional
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
 
+import arrow
 import investor8_sdk
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from rich.table import Table
 
-from i8_terminal.common.layout import df2Table
+from i8_terminal.common.layout import df2Html, df2Table
 from i8_terminal.common.metrics import (
     get_current_metrics_df,
+    get_metric_info,
     get_view_metrics,
     prepare_current_metrics_formatted_df,
 )
-from i8_terminal.common.utils import export_data, export_to_html
-from i8_terminal.config import APP_SETTINGS
+from i8_terminal.common.profiling import PHASE_DATAFRAME, profile_phase
+from i8_terminal.common.stock_info import get_stocks_df
+from i8_terminal.common.telemetry import record_cache_access
+from i8_terminal.common.utils import export_data
+from i8_terminal.config import APP_SETTINGS, SETTINGS_FOLDER
 
+SCREEN_SNAPSHOT_FOLDER = os.path.join(SETTINGS_FOLDER, "screen_snapshot")
+RELATIVE_PERIOD_TYPES: Dict[str, str] = {
+    "D": ".d",
+    "R": ".r",
+    "FY": ".fy",
+    "Q": ".q",
+}
+# Index of the rank and count columns of current metrics used by each value field
+SCREENING_VALUE_FIELD_INDEXES: Dict[str, str] = {
+    "rank": "spx",
+    "dow_rank": "dow",
+    "sector_rank": "sector",
+    "industry_rank": "industry",
+    "percentile": "spx",
+    "dow_percentile": "dow",
+    "sector_percentile": "sector",
+    "industry_percentile": "industry",
+}
 
+
+class ScreeningCondition(NamedTuple):
+    input_metric: str
+    value_field: str
+    operator: str
+    value: str
+
+
+@profile_phase(PHASE_DATAFRAME)
 def get_top_stocks_df(category: str, index: str, view_name: Optional[str]) -> Optional[pd.DataFrame]:
     metrics = APP_SETTINGS["commands"]["screen_gainers"]["metrics"]
     companies_data = investor8_sdk.ScreenerApi().get_top_stocks(category, index=index)
@@ -44,11 +81,11 @@ def render_top_stocks(df: pd.DataFrame, export_path: Optional[str], ascending: b
                 "Change Numeric", ascending=ascending
             )
             formatted_df.drop("Change Numeric", axis=1, inplace=True)
-            table = df2Table(
+            df2Html(
                 formatted_df,
+                export_path,
                 columns_justify=columns_justify,
             )
-            export_to_html(table, export_path)
             return None
         formatted_df = prepare_current_metrics_formatted_df(df, "store").sort_values(
             "Change Numeric", ascending=ascending
@@ -71,3 +108,117 @@ def render_top_stocks(df: pd.DataFrame, export_path: Optional[str], ascending: b
             columns_justify=columns_justify,
         )
         return table
+
+
+def get_input_metric(metric: str) -> str:
+    """
+    Adds the default period type of the metric to a metric without a period, e.g. `market_cap` to `market_cap.d`.
+    """
+    metric_parts = metric.split(".")
+    if len(metric_parts) == 1 or metric_parts[1] == "p":
+        metric_default_period_type = get_metric_info(metric_parts[0])["default_period_type"]
+        return f"{metric_parts[0]}{RELATIVE_PERIOD_TYPES.get(metric_default_period_type, '')}"
+    return ".".join(metric_parts[:2])
+
+
+def parse_screening_condition(condition: str) -> ScreeningCondition:
+    """
+    Parses a `{metric}.{period}.{value_field}:{operator}:{value}` condition. The period and value field are optional.
+    """
+    condition_parts = condition.split(":")
+    if len(condition_parts) != 3:
+        raise ValueError(f"`{condition}` is not a valid screening condition.")
+    metric, operator, value = condition_parts
+    metric_parts = metric.split(".")
+    value_field = metric_parts[2] if len(metric_parts) > 2 else "value"
+    if value_field != "value" and value_field not in SCREENING_VALUE_FIELD_INDEXES:
+        raise ValueError(f"`{value_field}` is not a valid value field.")
+    if operator not in ["gt", "lt", "bw", "eq"]:
+        raise ValueError(f"`{operator}` is not a valid screening operator.")
+    return ScreeningCondition(get_input_metric(".".join(metric_parts[:2])), value_field, operator, value)
+
+
+def is_snapshot_expired(snapshot_path: str) -> bool:
+    return bool(arrow.get(os.path.getmtime(snapshot_path)).to("local").date() != arrow.now().date())
+
+
+@profile_phase(PHASE_DATAFRAME)
+def get_metric_snapshot_df(input_metric: str) -> pd.DataFrame:
+    """
+    Returns the current metrics of all active companies for a metric, from a snapshot that is refreshed daily.
+    """
+    snapshot_path = os.path.join(SCREEN_SNAPSHOT_FOLDER, f"{input_metric}.pkl")
+    is_cached = os.path.exists(snapshot_path) and not is_snapshot_expired(snapshot_path)
+    record_cache_access("screen_snapshot", is_cached)
+    if is_cached:
+        return pd.read_pickle(snapshot_path)
+    settings = APP_SETTINGS.get("screen", {})
+    batch_size = int(settings.get("snapshot_batch_size", 500))
+    tickers = get_stocks_df()["ticker"].to_numpy(dtype=str)
+    tickers_batches = [",".join(batch) for batch in np.array_split(tickers, max(-(-len(tickers) // batch_size), 1))]
+    with ThreadPoolExecutor(max_workers=int(settings.get("snapshot_workers", 4))) as executor:
+        batches_df = [
+            df
+            for df in executor.map(lambda batch: get_current_metrics_df(batch, input_metric), tickers_batches)
+            if df is not None
+        ]
+    snapshot_df = (
+        pd.concat(batches_df, ignore_index=True).drop_duplicates("Ticker").reset_index(drop=True)
+        if batches_df
+        else pd.DataFrame(columns=["Ticker", "metric_name", "input_metric", "value"])
+    )
+    os.makedirs(SCREEN_SNAPSHOT_FOLDER, exist_ok=True)
+    snapshot_df.to_pickle(snapshot_path)
+    return snapshot_df
+
+
+def get_screening_values(df: pd.DataFrame, value_field: str) -> npt.NDArray[Any]:
+    values: npt.NDArray[Any]
+    if value_field == "value":
+        values = df["value"].to_numpy()
+        return values
+    index = SCREENING_VALUE_FIELD_INDEXES[value_field]
+    values = pd.to_numeric(df[f"{index}_rank"], errors="coerce").to_numpy(dtype="float64")
+    if value_field.endswith("percentile"):
+        values = values / pd.to_numeric(df[f"{index}_count"], errors="coerce").to_numpy(dtype="float64") * 100
+    return values
+
+
+def evaluate_screening_condition(df: pd.DataFrame, condition: ScreeningCondition) -> npt.NDArray[np.bool_]:
+    """
+    Returns the mask of the rows of a metric snapshot that meet the condition. Rows without data never match.
+    """
+    values = get_screening_values(df, condition.value_field)
+    numbers = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype="float64")
+    mask: npt.NDArray[np.bool_]
+    if condition.operator == "eq":
+        if condition.value_field == "value" and np.isnan(numbers[pd.notna(values)]).any():
+            mask = (pd.Series(values).astype(str).str.lower() == condition.value.lower()).to_numpy()
+        else:
+            mask = numbers == float(condition.value)
+    elif condition.operator == "bw":
+        low, high = sorted(float(v) for v in re.split("[~;]", condition.value))
+        mask = (numbers >= low) & (numbers <= high)
+    elif condition.operator == "gt":
+        mask = numbers > float(condition.value)
+    else:
+        mask = numbers < float(condition.value)
+    return mask
+
+
+def screen_metrics_snapshot(conditions: List[str], sort_by: str, sort_order: Optional[str]) -> List[str]:
+    """
+    Evaluates the screening conditions on the daily metrics snapshots and returns the sorted matching tickers.
+    """
+    parsed_conditions = [parse_screening_condition(c) for c in conditions]
+    snapshots = {c.input_metric: get_metric_snapshot_df(c.input_metric).set_index("Ticker") for c in parsed_conditions}
+    tickers = pd.Index(sorted(set().union(*[s.index for s in snapshots.values()])))
+    mask = np.ones(len(tickers), dtype=bool)
+    for condition in parsed_conditions:
+        mask &= evaluate_screening_condition(snapshots[condition.input_metric].reindex(tickers), condition)
+    matched_tickers = tickers[mask]
+    sort_df = get_metric_snapshot_df(get_input_metric(sort_by)).set_index("Ticker").reindex(matched_tickers)
+    sort_values = pd.to_numeric(sort_df["value"], errors="coerce").to_numpy(dtype="float64")
+    # Tickers without a value to sort by are listed last in both orders
+    order = np.argsort(-sort_values if sort_order == "desc" else sort_values, kind="stable")
+    return list(matched_tickers[order])
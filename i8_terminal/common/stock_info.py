@@ -1,15 +1,39 @@
 import os
 from ast import literal_eval
-from typing import List, Optional, Tuple
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
 
 import click
 import investor8_sdk
 import numpy as np
 import pandas as pd
 
+from i8_terminal.common.raw_api import call_raw_api, raw_records_to_df
+from i8_terminal.common.telemetry import record_cache_access
 from i8_terminal.common.utils import is_cached_file_expired
 from i8_terminal.config import SETTINGS_FOLDER
 
+COMPANIES_PATH = os.path.join(SETTINGS_FOLDER, "companies.csv")
+COMPANIES_INDEX_PATH = os.path.join(SETTINGS_FOLDER, "companies_index.pkl")
+
+
+class CompaniesIndex:
+    """
+    The valid tickers, the `.peers` aliases and the parsed peers of every company, built once per refresh of the
+    companies cache so tickers are validated and expanded without reading and parsing the companies again.
+    """
+
+    def __init__(self, df: pd.DataFrame, companies_mtime: float) -> None:
+        self.companies_mtime = companies_mtime
+        self.tickers: Set[str] = set(df["ticker"])
+        self.peers: Dict[str, List[str]] = {
+            ticker: literal_eval(peers) for ticker, peers in zip(df["ticker"], df["peers"]) if peers
+        }
+        self.peers_aliases: Set[str] = {f"{ticker}.peers" for ticker in self.peers}
+
+    def is_valid(self, ticker: str) -> bool:
+        return ticker in self.tickers or ticker in self.peers_aliases
+
 
 def sort_stocks(df: pd.DataFrame, include_peers: bool = False) -> pd.DataFrame:
     df["default_rank"] = 11
@@ -45,14 +69,15 @@ def sort_stocks(df: pd.DataFrame, include_peers: bool = False) -> pd.DataFrame:
 
 
 def get_stocks_df() -> pd.DataFrame:
-    companies_path = f"{SETTINGS_FOLDER}/companies.csv"
-    if os.path.exists(companies_path) and not is_cached_file_expired(companies_path):
-        stocks_df = pd.read_csv(companies_path, keep_default_na=False)
+    is_cached = os.path.exists(COMPANIES_PATH) and not is_cached_file_expired(COMPANIES_PATH)
+    record_cache_access("companies", is_cached)
+    if is_cached:
+        stocks_df = pd.read_csv(COMPANIES_PATH, keep_default_na=False)
     else:
-        results = investor8_sdk.StockInfoApi().get_all_active_companies()
-        stocks_df = pd.DataFrame([d.to_dict() for d in results])[["ticker", "name", "peers"]]
+        results = call_raw_api(investor8_sdk.StockInfoApi().get_all_active_companies)
+        stocks_df = raw_records_to_df(results, "ActiveCompanyDto")[["ticker", "name", "peers"]]
         stocks_df = sort_stocks(stocks_df)
-        stocks_df.to_csv(companies_path, index=False)
+        stocks_df.to_csv(COMPANIES_PATH, index=False)
     return stocks_df
 
 
@@ -67,26 +92,64 @@ def get_stocks(include_peers: bool) -> List[Tuple[str, str]]:
     return list(df[columns_list].to_records(index=False))
 
 
+def _load_companies_index() -> Optional[CompaniesIndex]:
+    if os.path.exists(COMPANIES_INDEX_PATH):
+        try:
+            index: CompaniesIndex = pd.read_pickle(COMPANIES_INDEX_PATH)
+            return index
+        except Exception:
+            pass
+    return None
+
+
+_COMPANIES_INDEX: Optional[CompaniesIndex] = None
+_COMPANIES_INDEX_LOCK = Lock()
+
+
+def _save_companies_index(index: CompaniesIndex) -> None:
+    pd.to_pickle(index, f"{COMPANIES_INDEX_PATH}.tmp")
+    os.replace(f"{COMPANIES_INDEX_PATH}.tmp", COMPANIES_INDEX_PATH)
+
+
+def get_companies_index() -> CompaniesIndex:
+    """
+    Returns the companies index, which is rebuilt only when the companies cache is refreshed.
+    """
+    global _COMPANIES_INDEX
+    with _COMPANIES_INDEX_LOCK:
+        if not os.path.exists(COMPANIES_PATH) or is_cached_file_expired(COMPANIES_PATH):
+            get_stocks_df()  # Refreshes the companies cache
+        companies_mtime = os.path.getmtime(COMPANIES_PATH)
+        index = _COMPANIES_INDEX if _COMPANIES_INDEX is not None else _load_companies_index()
+        is_cached = index is not None and index.companies_mtime == companies_mtime
+        record_cache_access("companies_index", is_cached)
+        if index is None or not is_cached:
+            index = CompaniesIndex(pd.read_csv(COMPANIES_PATH, keep_default_na=False), companies_mtime)
+            _save_companies_index(index)
+        _COMPANIES_INDEX = index
+        return index
+
+
 def validate_ticker(ctx: click.Context, param: str, value: str) -> Optional[str]:
     if not ctx.resilient_parsing:
         if value and len(value.replace(" ", "").split(",")) > 1:
             click.echo(click.style(f"`{value}` is not a valid ticker name.", fg="yellow"))
             ctx.exit()
-        if value and value.replace(" ", "").upper() not in set(get_stocks_df()["ticker"]):
+        if value and value.replace(" ", "").upper() not in get_companies_index().tickers:
             click.echo(click.style(f"`{value}` is not a valid ticker name.", fg="yellow"))
             ctx.exit()
     return value
 
 
 def validate_tickers(ctx: click.Context, param: str, value: str) -> Optional[str]:
-    tickers = {d[0] for d in get_stocks(True)}
     if not ctx.resilient_parsing:
+        companies_index = get_companies_index()
         inputted_tickers = []
         for ticker in value.replace(" ", "").split(","):
             splitted_ticker = ticker.split(".")
             splitted_ticker[0] = splitted_ticker[0].upper()
             inputted_tickers.append(".".join(splitted_ticker))
-        invalid_tickers = [*set(inputted_tickers) - tickers] if value else []
+        invalid_tickers = [*{t for t in inputted_tickers if not companies_index.is_valid(t)}] if value else []
         if value and invalid_tickers:
             msg = "are not valid ticker names." if len(invalid_tickers) > 1 else "is not a valid ticker name."
             click.echo(
@@ -100,13 +163,13 @@ def validate_tickers(ctx: click.Context, param: str, value: str) -> Optional[str
 
 
 def get_tickers_list(tickers: str) -> List[str]:
-    stocks_peers = get_stocks_df()[["ticker", "peers"]].set_index("ticker").to_dict()["peers"]
+    stocks_peers = get_companies_index().peers
     tickers_list = []
     for tk in tickers.split(","):
-        if "peers" in tk.lower() and stocks_peers.get(tk.split(".")[0]):
+        if "peers" in tk.lower() and tk.split(".")[0] in stocks_peers:
             ticker_name = tk.split(".")[0]
             tickers_list.append(ticker_name)
-            tickers_list.extend(literal_eval(stocks_peers.get(ticker_name)))
+            tickers_list.extend(stocks_peers[ticker_name])
         else:
             tickers_list.append(tk)
     return tickers_list
@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from i8_terminal.common.instrumentation import ApiCall, add_api_call_listener
+from i8_terminal.config import APP_SETTINGS, SETTINGS_FOLDER
+
+API_STATS_PATH = os.path.join(SETTINGS_FOLDER, "api_stats.log")
+
+_STATS_LOGGER = logging.getLogger("i8_terminal.api_stats")
+
+
+class ApiStats:
+    """
+    Aggregates the SDK calls and the local cache accesses of the session.
+    """
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.sizes: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.cache_hits: Dict[str, int] = defaultdict(int)
+        self.cache_misses: Dict[str, int] = defaultdict(int)
+        self._lock = Lock()
+
+    def add_api_call(self, endpoint: str, latency: float, size: int, error: Optional[str]) -> None:
+        with self._lock:
+            self.latencies[endpoint].append(latency)
+            self.sizes[endpoint] += size
+            if error:
+                self.errors[endpoint] += 1
+
+    def add_cache_access(self, name: str, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.cache_hits[name] += 1
+            else:
+                self.cache_misses[name] += 1
+
+    def get_endpoints_df(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [
+                {
+                    "Endpoint": endpoint,
+                    "Calls": len(latencies),
+                    "Errors": self.errors[endpoint],
+                    "p50 (ms)": np.percentile(latencies, 50) * 1000,
+                    "p95 (ms)": np.percentile(latencies, 95) * 1000,
+                    "Total (s)": sum(latencies),
+                    "Size (KB)": self.sizes[endpoint] / 1024,
+                }
+                for endpoint, latencies in self.latencies.items()
+            ]
+        columns = ["Endpoint", "Calls", "Errors", "p50 (ms)", "p95 (ms)", "Total (s)", "Size (KB)"]
+        return pd.DataFrame(rows, columns=columns).sort_values("Total (s)", ascending=False)
+
+    def get_cache_df(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [
+                {
+                    "Cache": name,
+                    "Hits": self.cache_hits[name],
+                    "Misses": self.cache_misses[name],
+                    "Hit Rate": self.cache_hits[name] / (self.cache_hits[name] + self.cache_misses[name]),
+                }
+                for name in sorted(set(self.cache_hits) | set(self.cache_misses))
+            ]
+        return pd.DataFrame(rows, columns=["Cache", "Hits", "Misses", "Hit Rate"])
+
+
+API_STATS = ApiStats()
+
+
+def _log_stats_event(event: Dict[str, Any]) -> None:
+    if _STATS_LOGGER.handlers:
+        _STATS_LOGGER.info(json.dumps({"time": datetime.now().isoformat(timespec="seconds"), **event}))
+
+
+def _on_api_call(call: ApiCall) -> None:
+    API_STATS.add_api_call(call.endpoint, call.latency, call.size, call.error)
+    _log_stats_event(
+        {
+            "endpoint": call.endpoint,
+            "latency": round(call.latency, 4),
+            "size": call.size,
+            "status": call.status,
+            "error": call.error,
+        }
+    )
+
+
+def record_cache_access(name: str, hit: bool) -> None:
+    API_STATS.add_cache_access(name, hit)
+    _log_stats_event({"cache": name, "hit": hit})
+
+
+def start_api_telemetry() -> None:
+    """
+    Starts collecting the stats of SDK calls and appends every call to a rolling file in the settings folder.
+    """
+    if not _STATS_LOGGER.handlers and os.path.exists(SETTINGS_FOLDER):
+        settings = APP_SETTINGS.get("telemetry", {})
+        handler = RotatingFileHandler(
+            API_STATS_PATH,
+            maxBytes=int(settings.get("api_stats_file_size", 1)) * 1024 * 1024,
+            backupCount=int(settings.get("api_stats_backup_count", 2)),
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _STATS_LOGGER.addHandler(handler)
+        _STATS_LOGGER.setLevel(logging.INFO)
+        _STATS_LOGGER.propagate = False
+    add_api_call_listener(_on_api_call)
+
+
+def load_api_stats_history() -> ApiStats:
+    """
+    Aggregates the stats of all sessions kept in the rolling stats files.
+    """
+    stats = ApiStats()
+    paths = [API_STATS_PATH] + [f"{API_STATS_PATH}.{i}" for i in range(1, 10)]
+    for path in [p for p in paths if os.path.exists(p)]:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if "cache" in event:
+                    stats.add_cache_access(event["cache"], event["hit"])
+                elif "endpoint" in event:
+                    stats.add_api_call(event["endpoint"], event["latency"], event["size"], event["error"])
+    return stats
@@ -0,0 +1,199 @@
+import atexit
+import json
+import os
+from collections import Counter
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+import investor8_sdk
+from investor8_sdk.rest import ApiException
+
+from i8_terminal.config import APP_SETTINGS, SETTINGS_FOLDER
+
+USAGE_SPOOL_PATH = os.path.join(SETTINGS_FOLDER, "usage_spool.jsonl")
+
+
+class UsageLogger:
+    """
+    Sends terminal usage events from a background thread, so logging never blocks a command.
+    Events are queued in a bounded queue and flushed in batches. Events that cannot be sent because the
+    server is not reachable, or that do not fit in the queue, are spooled to a local file and sent later.
+    Spooled events are removed from the spool only once they are sent.
+    """
+
+    def __init__(self) -> None:
+        settings = APP_SETTINGS.get("usage_logging", {})
+        self.batch_size = int(settings.get("batch_size", 20))
+        self.flush_interval = float(settings.get("flush_interval", 5))
+        self.flush_timeout = float(settings.get("flush_timeout", 3))
+        self.spool_size = int(settings.get("spool_size", 1000))
+        # None is queued to wake the sender up when the logger is closed
+        self._queue: "Queue[Optional[Dict[str, Any]]]" = Queue(maxsize=int(settings.get("queue_size", 500)))
+        self._in_flight: List[Dict[str, Any]] = []
+        self._closing = Event()
+        # Set once the pending events are spooled, the sender then stops so no spooled event is sent twice
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+
+    def log(self, event: Dict[str, Any]) -> None:
+        if self._stopped.is_set():
+            self._spool([event])
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait(event)
+        except Full:
+            self._spool([event])
+
+    def _get_batch(self) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        with self._lock:
+            # Events taken from the queue are in flight until they are sent or spooled
+            self._in_flight = batch
+        deadline = monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                event = self._queue.get(timeout=max(deadline - monotonic(), 0.01))
+            except Empty:
+                break
+            if event is None:
+                break
+            with self._lock:
+                is_stopped = self._stopped.is_set()
+                if not is_stopped:
+                    batch.append(event)
+            if is_stopped:
+                self._spool([event])
+                break
+        return batch
+
+    def _send_event(self, event: Dict[str, Any]) -> bool:
+        try:
+            investor8_sdk.UserApi().log_terminal_usage(body=event)
+        except ApiException:
+            pass  # Rejected by the server, retrying would not help
+        except Exception:
+            return False
+        return True
+
+    def _send(self, events: List[Dict[str, Any]]) -> bool:
+        # The API accepts one event per request, so a batch is sent as consecutive requests on this thread
+        for i, event in enumerate(events):
+            with self._lock:
+                if self._stopped.is_set():
+                    return False  # The rest of the batch is spooled by `spool_pending`
+                # Taken out before it is sent, so it is not spooled too if the logger stops while it is sent
+                self._in_flight = events[i + 1 :]  # noqa: E203
+            if not self._send_event(event):
+                with self._lock:
+                    unsent = [event] + self._in_flight
+                    self._in_flight = []
+                self._spool(unsent)
+                return False
+        return True
+
+    def _read_spool_lines(self) -> List[str]:
+        if not os.path.exists(USAGE_SPOOL_PATH):
+            return []
+        with open(USAGE_SPOOL_PATH, encoding="utf-8") as f:
+            return [line for line in f if line.strip()]
+
+    def _write_spool_lines(self, lines: List[str]) -> None:
+        if not lines:
+            if os.path.exists(USAGE_SPOOL_PATH):
+                os.remove(USAGE_SPOOL_PATH)
+            return
+        with open(f"{USAGE_SPOOL_PATH}.tmp", "w", encoding="utf-8") as f:
+            f.writelines(lines[-self.spool_size :])  # noqa: E203
+        os.replace(f"{USAGE_SPOOL_PATH}.tmp", USAGE_SPOOL_PATH)
+
+    def _send_spool(self) -> bool:
+        with self._lock:
+            try:
+                lines = self._read_spool_lines()
+            except Exception:
+                return True
+        sent_lines: List[str] = []
+        is_online = True
+        for line in lines:
+            if self._stopped.is_set():
+                break
+            if not self._send_event(json.loads(line)):
+                is_online = False
+                break
+            sent_lines.append(line)
+        if sent_lines:
+            with self._lock:
+                try:
+                    # Events spooled while sending are kept
+                    sent = Counter(sent_lines)
+                    kept = []
+                    for line in self._read_spool_lines():
+                        if sent[line]:
+                            sent[line] -= 1
+                        else:
+                            kept.append(line)
+                    self._write_spool_lines(kept)
+                except Exception:
+                    pass
+        return is_online
+
+    def _spool(self, events: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            try:
+                self._write_spool_lines(self._read_spool_lines() + [f"{json.dumps(e)}\n" for e in events])
+            except Exception:
+                pass
+
+    def _run(self) -> None:
+        is_online = self._send_spool()
+        while not self._stopped.is_set() and not (self._closing.is_set() and self._queue.empty()):
+            batch = self._get_batch()
+            if batch:
+                is_online = self._send(batch)
+            if is_online and batch:
+                is_online = self._send_spool()
+
+    def spool_pending(self) -> None:
+        """
+        Moves the queued and in flight events to the spool file, to be sent by the next session, and stops the
+        sender. An event the sender is sending at that moment is not spooled.
+        """
+        with self._lock:
+            self._stopped.set()
+            events = list(self._in_flight)
+            self._in_flight = []
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except Empty:
+                break
+            if event is not None:
+                events.append(event)
+        if events:
+            self._spool(events)
+
+    def close(self) -> None:
+        """
+        Sends the queued events before the process exits, waiting at most `flush_timeout` seconds, and spools the
+        events that are not sent by then.
+        """
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._closing.set()
+            try:
+                self._queue.put_nowait(None)
+            except Full:
+                pass  # The sender does not wait for more events when the queue is full
+            thread.join(self.flush_timeout)
+        self.spool_pending()
+
+
+USAGE_LOGGER = UsageLogger()
+atexit.register(USAGE_LOGGER.close)
@@ -7,9 +7,11 @@ from typing import Any, Callable, Dict, List, Optional, TypeVar
 import arrow
 import click
 import pandas as pd
+import xlsxwriter
 from prompt_toolkit.document import Document
 from rich.console import Console
 
+from i8_terminal.common.profiling import PHASE_OUTPUT, profile_phase
 from i8_terminal.config import APP_SETTINGS
 from i8_terminal.types.command_parser import CompleterContext
 
@@ -37,18 +39,87 @@ def similarity(a: str, b: str) -> float:
     return SequenceMatcher(None, a, b).ratio()
 
 
+def get_xlsx_constant_memory_threshold() -> int:
+    return int(APP_SETTINGS.get("export", {}).get("xlsx", {}).get("constant_memory_threshold", 10000))
+
+
+def _get_xlsx_cell_value(value: Any) -> Any:
+    return None if pd.api.types.is_scalar(value) and pd.isna(value) else value
+
+
+def add_xlsx_constant_memory_sheet(
+    workbook: xlsxwriter.Workbook,
+    sheet_name: str,
+    df: pd.DataFrame,
+    column_width: Optional[int],
+    column_format: Dict[str, Any],
+    index: bool = False,
+) -> None:
+    """
+    Writes a sheet row by row to a workbook opened in constant memory mode, so it can be added as soon as its data is
+    ready.
+    """
+    header_format = workbook.add_format(APP_SETTINGS["styles"]["xlsx"]["default"]["header"])
+    metric_format = workbook.add_format(APP_SETTINGS["styles"]["xlsx"]["default"]["metric"])
+    col_format = workbook.add_format(column_format)
+    worksheet = workbook.add_worksheet(sheet_name)
+    headers = df.columns.tolist()
+    if index:
+        headers.insert(0, df.index.name or "")
+    worksheet.set_column(0, 0, 20, metric_format)
+    worksheet.set_column(1, len(headers) - 1, column_width, col_format)
+    worksheet.write_row(
+        0,
+        0,
+        [" ".join(reversed(value)).strip() if type(value) is tuple else value for value in headers],
+        header_format,
+    )
+    for row_num, row in enumerate(df.itertuples(index=index, name=None), start=1):
+        worksheet.write_row(row_num, 0, [_get_xlsx_cell_value(value) for value in row])
+
+
+def open_xlsx_constant_memory_workbook(export_path: str) -> xlsxwriter.Workbook:
+    return xlsxwriter.Workbook(
+        export_path, {"constant_memory": True, "default_date_format": "yyyy-mm-dd", "remove_timezone": True}
+    )
+
+
+def export_to_xlsx_constant_memory(
+    sheets: Dict[str, pd.DataFrame],
+    export_path: str,
+    column_width: Optional[int],
+    column_format: Dict[str, Any],
+    index: bool = False,
+) -> None:
+    """
+    Streams the rows of the given sheets into the workbook using xlsxwriter's constant memory mode.
+    Rows are flushed to disk as soon as they are written, so headers are written as a single row.
+    """
+    workbook = open_xlsx_constant_memory_workbook(export_path)
+    for sheet_name, df in sheets.items():
+        add_xlsx_constant_memory_sheet(workbook, sheet_name, df, column_width, column_format, index=index)
+    workbook.close()
+
+
+@profile_phase(PHASE_OUTPUT)
 def export_data(
     export_df: pd.DataFrame,
     export_path: str,
     column_width: Optional[int],
     column_format: Dict[str, Any],
     index: bool = False,
+    constant_memory: Optional[bool] = None,
 ) -> None:
     console = Console()
     extension = export_path.split(".")[-1]
+    if constant_memory is None:
+        constant_memory = len(export_df) > get_xlsx_constant_memory_threshold()
     if extension == "csv":
         export_df.to_csv(export_path, index=index)
         console.print(f"Data is saved on: {export_path}")
+    elif extension == "xlsx" and constant_memory:
+        export_to_xlsx_constant_memory({"Sheet1": export_df}, export_path, column_width, column_format, index=index)
+        console.print(f"Data is saved on: {export_path}")
     elif extension == "xlsx":
         writer = pd.ExcelWriter(export_path, engine="xlsxwriter")
         export_df.to_excel(writer, sheet_name="Sheet1", startrow=1, header=False, index=index)
@@ -80,14 +151,7 @@ def is_cached_file_expired(file_path: str) -> bool:
     return bool(mtime < arrow.utcnow().shift(hours=-APP_SETTINGS.get("cache", {}).get("age", 48)))
 
 
-def reverse_period(period: str) -> str:
-    """
-    If period is fyq type (eg. 'Q 2021'), the function will change it to '2021 Q'.
-    """
-    splitted_period = period.split(" ")
-    return f"{splitted_period[1]} {splitted_period[0]}" if len(splitted_period) > 1 else period
-
-
+@profile_phase(PHASE_OUTPUT)
 def export_to_html(data: Any, export_path: str) -> None:
     console = Console(record=True, file=StringIO())
     console.print(data)
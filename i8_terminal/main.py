@@ -29,6 +29,8 @@ from investor8_sdk.rest import ApiException
 
 from i8_terminal.commands import cli
 from i8_terminal.common.stock_info import validate_ticker
+from i8_terminal.common.telemetry import start_api_telemetry
+from i8_terminal.common.usage_logging import USAGE_LOGGER
 from i8_terminal.types.i8_auto_suggest import I8AutoSuggest
 from i8_terminal.types.i8_completer import I8Completer
 from i8_terminal.types.ticker_param_type import TickerParamType
@@ -36,6 +38,7 @@ from i8_terminal.types.ticker_param_type import TickerParamType
 
 def init_commands() -> None:
     status.start()
+    start_api_telemetry()
     app_dir = os.path.join(os.path.join(os.path.dirname(sys.executable), "lib"), "i8_terminal")
     sys.path.append(app_dir)
     commands_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "commands")
@@ -53,6 +56,7 @@ def init_commands() -> None:
     def shell() -> None:
         """Open i8-shell."""
         print_welcome_msg()
+        click.get_current_context().obj["is_shell"] = True
         prompt_kwargs = {"completer": I8Completer(cli), "auto_suggest": I8AutoSuggest(cli)}
 
         while True:
@@ -74,6 +78,7 @@ def init_commands() -> None:
     @cli.command()
     def exit() -> None:
         """Exit the terminal."""
+        USAGE_LOGGER.close()
         os._exit(0)
 
     @cli.command()
@@ -1,10 +1,16 @@
+from typing import Any, List, Optional
+
+import arrow
 import investor8_sdk
+import pandas as pd
 from pandas import DataFrame
 
+from i8_terminal.common.earnings_calendar import get_earnings_calendar
 from i8_terminal.common.utils import status
 from i8_terminal.service_result.column_info import ColumnInfo
 from i8_terminal.service_result.columns_context import ColumnsContext
 from i8_terminal.service_result.earning_list_result import EarningsListResult
+from i8_terminal.service_result.service_result import ServiceResult
 
 
 @status()
@@ -36,3 +42,68 @@ def get_earnings_list(ticker: str, size: int) -> EarningsListResult:
         ]
     )
     return EarningsListResult(df, cc)
+
+
+def _to_earnings_calendar_result(df: DataFrame) -> ServiceResult:
+    df = df.assign(period=df.fyq.str[2:-2] + " " + df.fyq.str[-2:]).rename(
+        columns={
+            "actual_report_time": "earning_date",
+            "eps_ws": "eps_consensus",
+            "revenue_ws": "revenue_consensus",
+            "call_time": "earning_call_time",
+        }
+    )
+    cc = ColumnsContext(
+        [
+            ColumnInfo(name="ticker", col_type="context", display_name="Ticker", data_type="str", unit="string"),
+            ColumnInfo(name="period", col_type="context", display_name="Period", data_type="str", unit="string"),
+            ColumnInfo(name="earning_date", col_type="metric"),
+            ColumnInfo(name="earning_call_time", col_type="metric"),
+            ColumnInfo(name="eps_consensus", col_type="metric"),
+            ColumnInfo(name="eps_actual", col_type="metric"),
+            ColumnInfo(name="eps_surprise", col_type="metric"),
+            ColumnInfo(name="revenue_consensus", col_type="metric"),
+            ColumnInfo(name="revenue_actual", col_type="metric"),
+            ColumnInfo(name="revenue_surprise", col_type="metric"),
+        ]
+    )
+    return ServiceResult(df.reset_index(drop=True), cc)
+
+
+@status()
+def get_earnings_calendar_list(
+    from_date: Any = None, to_date: Any = None, tickers: Optional[List[str]] = None
+) -> ServiceResult:
+    """
+    Returns the earnings of the local earnings calendar reported from `from_date` to `to_date` (e.g. "2024-01-22"),
+    the whole calendar by default, optionally only of the given tickers.
+    """
+    calendar = get_earnings_calendar()
+    if not tickers:
+        return _to_earnings_calendar_result(calendar.between(from_date, to_date))
+    df = calendar.for_tickers([t.upper() for t in tickers])
+    if from_date:
+        df = df[df["report_date"] >= pd.Timestamp(from_date)]
+    if to_date:
+        df = df[df["report_date"] <= pd.Timestamp(to_date)]
+    return _to_earnings_calendar_result(df)
+
+
+@status()
+def get_upcoming_earnings(tickers: Optional[List[str]] = None, days: int = 7) -> ServiceResult:
+    """
+    Returns the next earnings of the given tickers, or the earnings of all companies in the next `days` days.
+    """
+    calendar = get_earnings_calendar()
+    if tickers:
+        return _to_earnings_calendar_result(calendar.next_reports([t.upper() for t in tickers]))
+    today = arrow.now()
+    return _to_earnings_calendar_result(calendar.between(today.date(), today.shift(days=days).date()))
+
+
+@status()
+def get_recent_earnings(days: int = 7) -> ServiceResult:
+    """
+    Returns the reported earnings of the last `days` days, latest first.
+    """
+    return _to_earnings_calendar_result(get_earnings_calendar().recent(days))
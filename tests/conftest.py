@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# i8_terminal creates its settings folder in the home folder when it is imported, so tests get a temporary home
+os.environ["HOME"] = os.environ["USERPROFILE"] = tempfile.mkdtemp(prefix="i8_terminal_tests_")
@@ -0,0 +1,67 @@
+import os
+from typing import Any, List, Tuple
+
+import pandas as pd
+import pytest
+
+from i8_terminal.common import stock_info
+from i8_terminal.common.stock_info import (
+    CompaniesIndex,
+    get_companies_index,
+    get_tickers_list,
+)
+
+COMPANIES_DF = pd.DataFrame(
+    {
+        "ticker": ["AAPL", "MSFT", "BRK.B", "XOM"],
+        "name": ["Apple Inc.", "Microsoft Corp.", "Berkshire Hathaway", "Exxon Mobil"],
+        "peers": ["['MSFT', 'GOOGL']", "['AAPL']", "", ""],
+    }
+)
+
+
+@pytest.fixture
+def companies_path(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> str:
+    path = str(tmp_path / "companies.csv")
+    COMPANIES_DF.to_csv(path, index=False)
+    monkeypatch.setattr(stock_info, "COMPANIES_PATH", path)
+    monkeypatch.setattr(stock_info, "COMPANIES_INDEX_PATH", str(tmp_path / "companies_index.pkl"))
+    monkeypatch.setattr(stock_info, "_COMPANIES_INDEX", None)
+    monkeypatch.setattr(stock_info, "is_cached_file_expired", lambda path: False)
+    return path
+
+
+def test_is_valid() -> None:
+    index = CompaniesIndex(COMPANIES_DF, 0.0)
+    assert index.is_valid("AAPL") and index.is_valid("BRK.B")
+    assert index.is_valid("AAPL.peers")
+    assert not index.is_valid("XOM.peers")
+    assert not index.is_valid("aapl")
+    assert not index.is_valid("GOOGL")
+    assert index.peers == {"AAPL": ["MSFT", "GOOGL"], "MSFT": ["AAPL"]}
+
+
+def test_get_companies_index_is_rebuilt_when_companies_change(
+    companies_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    index = get_companies_index()
+    assert index.companies_mtime == os.path.getmtime(companies_path)
+    assert get_companies_index() is index
+    assert os.path.exists(stock_info.COMPANIES_INDEX_PATH)
+
+    # A new session loads the stored index instead of building it
+    monkeypatch.setattr(stock_info, "_COMPANIES_INDEX", None)
+    cache_accesses: List[Tuple[str, bool]] = []
+    monkeypatch.setattr(stock_info, "record_cache_access", lambda name, hit: cache_accesses.append((name, hit)))
+    assert get_companies_index().tickers == index.tickers
+    assert cache_accesses == [("companies_index", True)]
+
+    pd.concat([COMPANIES_DF, pd.DataFrame({"ticker": ["NVDA"], "name": ["Nvidia"], "peers": [""]})]).to_csv(
+        companies_path, index=False
+    )
+    os.utime(companies_path, (index.companies_mtime + 10, index.companies_mtime + 10))
+    assert get_companies_index().is_valid("NVDA")
+
+
+def test_get_tickers_list_expands_peers(companies_path: str) -> None:
+    assert get_tickers_list("AAPL.peers,XOM,XOM.peers") == ["AAPL", "MSFT", "GOOGL", "XOM", "XOM.peers"]
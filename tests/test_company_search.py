@@ -0,0 +1,76 @@
+from typing import Any, List
+
+import investor8_sdk
+import pytest
+
+from i8_terminal.common import company_search
+from i8_terminal.common.company_search import CompanySearch, search_companies
+
+COMPANY_SEARCH = CompanySearch(
+    ["AAPL", "AA", "MSFT", "AMZN", "GOOGL", "GOOG", "APLE", "MS", "BAC"],
+    [
+        "Apple Inc.",
+        "Alcoa Corp",
+        "Microsoft Corp",
+        "Amazon.com Inc",
+        "Alphabet Inc Class A",
+        "Alphabet Inc Class C",
+        "Apple Hospitality REIT",
+        "Morgan Stanley",
+        "Bank of America",
+    ],
+    0.0,
+)
+
+
+def get_tickers(keyword: str, limit: int = 10) -> List[str]:
+    return [ticker for ticker, _ in COMPANY_SEARCH.search(keyword, limit)]
+
+
+def test_search_by_prefix() -> None:
+    assert get_tickers("amaz") == ["AMZN"]
+    assert get_tickers("Micro") == ["MSFT"]
+    assert get_tickers("morgan stan") == ["MS"]
+    # Every token of the keyword has to match
+    assert get_tickers("bank america") == ["BAC"]
+    assert get_tickers("bank apple") == []
+    assert get_tickers("") == []
+
+
+def test_exact_ticker_ranks_first() -> None:
+    assert get_tickers("ms") == ["MS", "MSFT"]
+    assert get_tickers("aa") == ["AA", "AAPL"]
+    assert get_tickers("goog") == ["GOOG", "GOOGL"]
+
+
+def test_ticker_matches_rank_above_name_matches() -> None:
+    assert get_tickers("ap")[:2] == ["APLE", "AAPL"]
+    assert get_tickers("apple") == ["AAPL", "APLE"]
+
+
+def test_search_tolerates_a_typo() -> None:
+    assert get_tickers("microsft") == ["MSFT"]
+    assert get_tickers("appel") == ["AAPL", "APLE"]
+    assert get_tickers("amazin") == ["AMZN"]
+    # Short tokens and tickers are not typo matched
+    assert get_tickers("bac") == ["BAC"]
+    assert get_tickers("msfy") == []
+
+
+def test_search_limit() -> None:
+    assert get_tickers("inc") == ["AAPL", "AMZN", "GOOGL", "GOOG"]
+    assert get_tickers("inc", limit=2) == ["AAPL", "AMZN"]
+
+
+def test_search_companies_falls_back_to_remote_search(monkeypatch: pytest.MonkeyPatch) -> None:
+    remote_keywords: List[str] = []
+
+    def search_stocks(self: Any, keyword: str, limit: int) -> List[Any]:
+        remote_keywords.append(keyword)
+        return [investor8_sdk.models.StockInfoDto(ticker="TSLA", name="Tesla Inc")]
+
+    monkeypatch.setattr(company_search, "get_company_search", lambda: COMPANY_SEARCH)
+    monkeypatch.setattr(investor8_sdk.SearchApi, "search_stocks", search_stocks)
+    assert search_companies("apple").values.tolist() == [["AAPL", "Apple Inc."], ["APLE", "Apple Hospitality REIT"]]
+    assert search_companies("tesla").values.tolist() == [["TSLA", "Tesla Inc"]]
+    assert remote_keywords == ["tesla"]
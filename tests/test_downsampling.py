@@ -0,0 +1,67 @@
+from typing import Any, List
+
+import numpy as np
+import plotly.graph_objects as go
+from numpy.typing import NDArray
+
+from i8_terminal.app.downsampling import lttb_indices, use_webgl
+
+
+def reference_lttb_indices(x: NDArray[Any], y: NDArray[Any], n_out: int) -> List[int]:
+    every = (len(y) - 2) / (n_out - 2)
+    a, indices = 0, [0]
+    for i in range(n_out - 2):
+        avg_start, avg_end = int((i + 1) * every) + 1, min(int((i + 2) * every) + 1, len(y))
+        avg_x, avg_y = x[avg_start:avg_end].mean(), y[avg_start:avg_end].mean()
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        areas = [abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a])) for j in range(start, end)]
+        a = start + int(np.argmax(areas))
+        indices.append(a)
+    return indices + [len(y) - 1]
+
+
+def test_lttb_indices_matches_reference() -> None:
+    rng = np.random.default_rng(0)
+    for n, n_out in [(1000, 100), (1001, 37), (50, 3), (10, 9)]:
+        x = np.sort(rng.uniform(0, 100, n))
+        y = rng.normal(size=n).cumsum()
+        assert lttb_indices(x, y, n_out).tolist() == reference_lttb_indices(x, y, n_out)
+
+
+def test_lttb_indices_keeps_ends_and_order() -> None:
+    x = np.arange(500, dtype=float)
+    y = np.sin(x / 10)
+    indices = lttb_indices(x, y, 50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 499
+    assert (np.diff(indices) > 0).all()
+
+
+def test_lttb_indices_keeps_spike() -> None:
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[437] = 10
+    assert 437 in lttb_indices(x, y, 20)
+
+
+def test_lttb_indices_keeps_all_points_when_not_needed() -> None:
+    x = np.arange(10, dtype=float)
+    assert lttb_indices(x, x, 10).tolist() == list(range(10))
+    assert lttb_indices(x, x, 20).tolist() == list(range(10))
+    assert lttb_indices(x, x, 2).tolist() == list(range(10))
+
+
+def test_use_webgl_converts_only_large_supported_traces() -> None:
+    x = list(range(10))
+    fig = go.Figure(
+        [
+            go.Scatter(x=x, y=x, name="large", line=dict(color="red")),
+            go.Scatter(x=x, y=x, name="spline", line=dict(shape="spline")),
+            go.Scatter(x=x[:3], y=x[:3], name="small"),
+            go.Bar(x=x, y=x, name="bar"),
+        ]
+    )
+    traces = use_webgl(fig, threshold=5).data
+    assert [t.type for t in traces] == ["scattergl", "scatter", "scatter", "bar"]
+    assert traces[0].line.color == "red" and traces[0].name == "large"
+    assert traces[1].line.shape == "spline"
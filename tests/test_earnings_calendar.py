@@ -0,0 +1,105 @@
+from typing import Any, List, Optional, Tuple
+
+import arrow
+import pandas as pd
+import pytest
+
+from i8_terminal.common import earnings_calendar
+from i8_terminal.common.earnings_calendar import EarningsCalendar, get_earnings_calendar
+
+
+def get_earnings_df(rows: List[Tuple[str, str, str, Optional[float]]]) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=["ticker", "fyq", "actual_report_date", "eps_actual"])
+    df["revenue_actual"] = df["eps_actual"]
+    df["report_date"] = pd.to_datetime(df["actual_report_date"])
+    return df
+
+
+CALENDAR = EarningsCalendar(
+    get_earnings_df(
+        [
+            ("MSFT", "FY2024Q1", "2023-10-24", 2.99),
+            ("AAPL", "FY2023Q4", "2023-11-02", 1.46),
+            ("AMD", "FY2023Q3", "2023-10-31", 0.7),
+            ("AAPL", "FY2024Q1", "2024-02-01", None),
+            ("MSFT", "FY2024Q2", "2024-01-30", None),
+            ("NVDA", "FY2024Q3", "2023-11-21", 4.02),
+        ]
+    ),
+    "2023-11-25",
+    "2023-07-28",
+)
+
+
+def test_between() -> None:
+    assert CALENDAR.between("2023-10-31", "2023-11-21")["ticker"].to_list() == ["AMD", "AAPL", "NVDA"]
+    assert CALENDAR.between("2023-11-03", "2023-11-20").empty
+    assert CALENDAR.between(to_date="2023-10-31")["ticker"].to_list() == ["MSFT", "AMD"]
+    assert CALENDAR.between(from_date="2024-01-30")["ticker"].to_list() == ["MSFT", "AAPL"]
+    assert len(CALENDAR.between()) == 6
+
+
+def test_for_tickers() -> None:
+    df = CALENDAR.for_tickers(["MSFT", "XOM", "AAPL"])
+    assert df[["ticker", "fyq"]].values.tolist() == [
+        ["MSFT", "FY2024Q1"],
+        ["MSFT", "FY2024Q2"],
+        ["AAPL", "FY2023Q4"],
+        ["AAPL", "FY2024Q1"],
+    ]
+    assert CALENDAR.for_tickers([]).empty
+
+
+def test_next_reports() -> None:
+    df = CALENDAR.next_reports(["AAPL", "AMD", "MSFT", "XOM"], "2023-11-02")
+    assert df[["ticker", "fyq"]].values.tolist() == [["AAPL", "FY2023Q4"], ["MSFT", "FY2024Q2"]]
+    assert CALENDAR.next_reports(["AAPL"], "2024-02-02").empty
+
+
+def test_recent() -> None:
+    assert CALENDAR.recent(days=30, date="2023-11-21")["ticker"].to_list() == ["NVDA", "AAPL", "AMD", "MSFT"]
+    assert CALENDAR.recent(days=7, date="2024-02-01").empty
+
+
+@pytest.fixture
+def fetched_ranges(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> List[Tuple[str, str]]:
+    ranges: List[Tuple[str, str]] = []
+
+    def fetch_earnings_df(from_date: str, to_date: str) -> pd.DataFrame:
+        ranges.append((from_date, to_date))
+        return get_earnings_df(
+            [("AAPL", "FY2024Q1", "2024-02-01", None), ("MSFT", "FY2024Q2", "2024-01-25", None)]
+            if len(ranges) > 1
+            else [("AAPL", "FY2023Q4", "2023-11-02", 1.46), ("MSFT", "FY2024Q2", "2024-01-30", None)]
+        )
+
+    monkeypatch.setattr(earnings_calendar, "EARNINGS_CALENDAR_PATH", str(tmp_path / "earnings_calendar.pkl"))
+    monkeypatch.setattr(earnings_calendar, "_CALENDAR", None)
+    monkeypatch.setattr(earnings_calendar, "_fetch_earnings_df", fetch_earnings_df)
+    monkeypatch.setitem(
+        earnings_calendar.APP_SETTINGS,
+        "earnings",
+        {"calendar_lookback_days": 120, "calendar_lookahead_days": 90, "calendar_refresh_days": 14},
+    )
+    return ranges
+
+
+def test_calendar_is_refreshed_daily_from_the_previous_refresh(
+    fetched_ranges: List[Tuple[str, str]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(arrow, "now", lambda: arrow.get("2023-11-25"))
+    calendar = get_earnings_calendar()
+    assert get_earnings_calendar() is calendar
+    assert fetched_ranges == [("2023-07-28", "2024-02-23")]
+
+    monkeypatch.setattr(earnings_calendar, "_CALENDAR", None)
+    monkeypatch.setattr(arrow, "now", lambda: arrow.get("2023-11-27"))
+    calendar = get_earnings_calendar()
+    assert fetched_ranges[1] == ("2023-11-11", "2024-02-25")
+    assert (calendar.refreshed_at, calendar.start_date) == ("2023-11-27", "2023-07-30")
+    # Earnings before the refreshed days are kept, and rescheduled ones replace those of the same period
+    assert calendar.df[["ticker", "actual_report_date"]].values.tolist() == [
+        ["AAPL", "2023-11-02"],
+        ["MSFT", "2024-01-25"],
+        ["AAPL", "2024-02-01"],
+    ]
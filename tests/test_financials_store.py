@@ -0,0 +1,129 @@
+from typing import Any, Counter, List, Optional
+
+import investor8_sdk
+import pytest
+from investor8_sdk.models import FinancialReportDto
+from investor8_sdk.models.standardized_financial import StandardizedFinancial
+
+from i8_terminal.common import financials_store
+from i8_terminal.common.financials_store import (
+    _find_statements,
+    get_financials_single,
+    get_list_standardized_financials,
+)
+
+STATEMENT_CODE = "income_statement"
+HOUR = 3600
+
+
+def get_statement(
+    fiscal_year: int, fiscal_period: str = "FY", filing_date: str = "2024-01-31"
+) -> StandardizedFinancial:
+    return StandardizedFinancial(
+        ticker="MSFT",
+        statement_code=STATEMENT_CODE,
+        fiscal_year=fiscal_year,
+        fiscal_period=fiscal_period,
+        period_type="FY",
+        filing_date=filing_date,
+        financial_tags=[],
+    )
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> FakeTime:
+    fake_time = FakeTime()
+    monkeypatch.setattr(financials_store, "FINANCIALS_STORE_FOLDER", str(tmp_path))
+    monkeypatch.setattr(financials_store, "time", fake_time)
+    monkeypatch.setitem(financials_store.APP_SETTINGS, "cache", {"age": 48})
+    monkeypatch.setitem(financials_store.APP_SETTINGS, "financials", {"recent_fiscal_years": 2})
+    return fake_time
+
+
+@pytest.fixture
+def calls(monkeypatch: pytest.MonkeyPatch) -> Counter[str]:
+    api_calls: Counter[str] = Counter()
+
+    def fetch_available(self: Any, ticker: str) -> List[FinancialReportDto]:
+        api_calls["available"] += 1
+        return [
+            FinancialReportDto(statement_code=STATEMENT_CODE, fiscal_year=str(y), fiscal_period="FY", period_type="FY")
+            for y in range(2015, 2024)
+        ]
+
+    def fetch_list(self: Any, ticker: str, stat_code: str, period_type: str, end_year: Any) -> List[Any]:
+        api_calls["list"] += 1
+        return [get_statement(y) for y in range(2015, int(end_year or 2023) + 1)]
+
+    def fetch_single(
+        self: Any, ticker: str, stat_code: str, fiscal_year: Any, fiscal_period: Any, **kwargs: Any
+    ) -> Any:
+        api_calls["single"] += 1
+        return get_statement(int(fiscal_year or 2023), fiscal_period, filing_date="2024-02-29")
+
+    monkeypatch.setattr(investor8_sdk.FinancialsApi, "get_list_available_standardized_financials", fetch_available)
+    monkeypatch.setattr(investor8_sdk.FinancialsApi, "get_list_standardized_financials", fetch_list)
+    monkeypatch.setattr(investor8_sdk.FinancialsApi, "get_financials_single", fetch_single)
+    return api_calls
+
+
+def get_single(fiscal_year: Optional[str], fiscal_period: str) -> StandardizedFinancial:
+    statement = get_financials_single("MSFT", STATEMENT_CODE, fiscal_year, fiscal_period)
+    assert statement is not None
+    return statement
+
+
+def get_years(statements: Any) -> List[int]:
+    return [int(s.fiscal_year) for s in statements]
+
+
+def test_stored_statements_are_read_back(clock: FakeTime, calls: Counter[str]) -> None:
+    assert get_years(get_list_standardized_financials("MSFT", STATEMENT_CODE, "FY", "", 4)) == list(range(2015, 2024))
+    assert get_years(get_list_standardized_financials("MSFT", STATEMENT_CODE, "FY", "", 4)) == [2023, 2022, 2021, 2020]
+    assert get_years(get_list_standardized_financials("MSFT", STATEMENT_CODE, "FY", "2018", 2)) == [2018, 2017]
+    assert get_single("2016", "FY").fiscal_year == 2016
+    assert calls == {"available": 1, "list": 1}
+
+
+def test_recent_fiscal_years_expire(clock: FakeTime, calls: Counter[str]) -> None:
+    get_list_standardized_financials("MSFT", STATEMENT_CODE, "FY", "", 4)
+    clock.now += 47 * HOUR
+    assert get_years(_find_statements("MSFT", STATEMENT_CODE, [(2023, "FY"), (2016, "FY")])) == [2023, 2016]
+    clock.now += 2 * HOUR
+    # The available statements are revalidated, and statements of the 2 latest fiscal years are fetched again
+    assert _find_statements("MSFT", STATEMENT_CODE, [(2023, "FY")]) is None
+    assert _find_statements("MSFT", STATEMENT_CODE, [(2022, "FY"), (2016, "FY")]) is None
+    assert get_years(_find_statements("MSFT", STATEMENT_CODE, [(2021, "FY"), (2016, "FY")])) == [2021, 2016]
+    assert calls["available"] == 2
+
+
+def test_missing_periods_are_fetched(clock: FakeTime, calls: Counter[str]) -> None:
+    get_list_standardized_financials("MSFT", STATEMENT_CODE, "FY", "", 4)
+    assert _find_statements("MSFT", STATEMENT_CODE, [(2023, "Q1")]) is None
+    assert get_single("2023", "Q1").fiscal_period == "Q1"
+    assert get_single("2023", "Q1").fiscal_period == "Q1"
+    assert calls["single"] == 1
+
+
+def test_latest_filing_of_a_period_is_returned(clock: FakeTime, calls: Counter[str]) -> None:
+    get_list_standardized_financials("MSFT", STATEMENT_CODE, "FY", "", 4)
+    clock.now += 49 * HOUR
+    # The refetched statement is a new filing of the period, which supersedes the stored one
+    assert str(get_single("2023", "FY").filing_date) == "2024-02-29"
+    assert len(_find_statements("MSFT", STATEMENT_CODE, [(2023, "FY")]) or []) == 1
+    assert str(get_single("2023", "FY").filing_date) == "2024-02-29"
+    assert calls["single"] == 1
+
+
+def test_single_without_fiscal_year_is_not_read_from_store(clock: FakeTime, calls: Counter[str]) -> None:
+    get_list_standardized_financials("MSFT", STATEMENT_CODE, "FY", "", 4)
+    assert get_single(None, "FY").fiscal_year == 2023
+    assert calls["single"] == 1
@@ -0,0 +1,44 @@
+import itertools
+from typing import Any, List
+
+import numpy as np
+
+from i8_terminal.common.formatting import format_number, format_numbers
+
+VALUES: List[Any] = [
+    0,
+    1,
+    -1,
+    0.125,
+    -0.5,
+    999.995,
+    1000,
+    -1234.5,
+    999999,
+    1e6,
+    -2.5e7,
+    1e9,
+    3.2e11,
+    1e12,
+    -4.56e13,
+    None,
+    np.nan,
+]
+UNITS = [None, "usd", "shares", "usdpershare", "percentage", "ratio"]
+
+
+def test_format_numbers_matches_format_number() -> None:
+    for unit, decimal, humanize, exportize in itertools.product(UNITS, [0, 2, 3], [False, True], [False, True]):
+        expected = [format_number(v, unit, decimal, humanize, exportize=exportize) for v in VALUES]
+        units = [unit] * len(VALUES)
+        assert format_numbers(VALUES, units, decimal, humanize, exportize).tolist() == expected, (unit, decimal)
+
+
+def test_format_numbers_mixed_units() -> None:
+    units = [UNITS[i % len(UNITS)] for i in range(len(VALUES))]
+    expected = [format_number(v, u, humanize=True) for v, u in zip(VALUES, units)]
+    assert format_numbers(VALUES, units, humanize=True).tolist() == expected
+
+
+def test_format_numbers_broadcasts_unit_and_parses_strings() -> None:
+    assert format_numbers(["1.5", "abc", "2000"], None).tolist() == ["1.50", "-", "2,000.00"]
@@ -0,0 +1,74 @@
+from typing import Any, Dict
+
+import pandas as pd
+
+from i8_terminal.common.formatting import data_format_mapper
+from i8_terminal.common.metrics import (
+    add_ticker_rank_to_df,
+    compact_historical_metrics_df,
+    historical_metrics_to_df,
+)
+
+HISTORICAL_METRICS: Dict[str, Any] = {
+    "Data": {
+        "AAPL": {
+            "total_revenue": [
+                {"Period": "FY2022", "PeriodDateTime": "2022-09-24T00:00:00", "Value": "394328000000"},
+                {"Period": "FY2023", "PeriodDateTime": "2023-09-30T00:00:00", "Value": "383285000000"},
+            ],
+            "employees": [{"Period": "FY2023", "PeriodDateTime": "2023-09-30T00:00:00", "Value": "161000.0"}],
+            "sector": [{"Period": "FY2023", "PeriodDateTime": "2023-09-30T00:00:00", "Value": "Technology"}],
+            "unknown_metric": [{"Period": "FY2023", "PeriodDateTime": "2023-09-30T00:00:00", "Value": "1"}],
+        },
+        "MSFT": {
+            "total_revenue": [{"Period": "FY2023", "PeriodDateTime": "2023-06-30T00:00:00", "Value": "211915000000"}],
+            "employees": [{"Period": "FY2023", "PeriodDateTime": "2023-06-30T00:00:00", "Value": "221000.7"}],
+        },
+    },
+    "Metadata": [
+        {"MetricName": "total_revenue", "DisplayName": "Revenue", "DataFormat": "float", "DisplayFormat": "financial"},
+        {"MetricName": "employees", "DisplayName": "Employees", "DataFormat": "int", "DisplayFormat": "number"},
+        {"MetricName": "sector", "DisplayName": "Sector", "DataFormat": "string", "DisplayFormat": "string"},
+    ],
+}
+
+
+def get_merged_historical_metrics_df() -> pd.DataFrame:
+    df, metadata_df = historical_metrics_to_df(HISTORICAL_METRICS)
+    df = pd.merge(df, metadata_df, on="metric_name")
+    df[["data_format", "display_format"]] = df[["data_format", "display_format"]].replace("string", "str")
+    df.rename(columns={"display_name": "Metric", "Value": "value"}, inplace=True)
+    df["value"] = df.apply(lambda metric: data_format_mapper(metric), axis=1)
+    return df
+
+
+def test_compact_historical_metrics_df_matches_merge() -> None:
+    df = compact_historical_metrics_df(*historical_metrics_to_df(HISTORICAL_METRICS))
+    merged_df = get_merged_historical_metrics_df()
+    columns = ["Ticker", "metric_name", "Period", "Metric", "data_format", "display_format"]
+    df = df.astype({c: str for c in columns}).sort_values(columns).reset_index(drop=True)
+    merged_df = merged_df.sort_values(columns).reset_index(drop=True)
+    pd.testing.assert_frame_equal(df[columns], merged_df[columns])
+    # Int values are kept as whole floats
+    assert df["value"].to_list() == merged_df["value"].to_list()
+
+
+def test_compact_historical_metrics_df_types() -> None:
+    df, metadata_df = historical_metrics_to_df(HISTORICAL_METRICS)
+    compact_df = compact_historical_metrics_df(df, metadata_df)
+    assert "unknown_metric" not in set(compact_df["metric_name"])
+    for column in ["Ticker", "metric_name", "Period", "Metric", "data_format"]:
+        assert compact_df[column].dtype == "category"
+    values = dict(zip(zip(compact_df["Ticker"], compact_df["metric_name"]), compact_df["value"]))
+    assert values[("MSFT", "employees")] == 221000
+    assert values[("AAPL", "sector")] == "Technology"
+
+    numeric_df = compact_historical_metrics_df(df[df["metric_name"] != "sector"], metadata_df)
+    assert numeric_df["value"].dtype == "float64"
+    # Large amounts keep their precision
+    assert numeric_df["value"].max() == 394328000000
+
+
+def test_add_ticker_rank_to_df_ignores_category_order() -> None:
+    df = pd.DataFrame({"Ticker": pd.Categorical(["AAPL", "MSFT", "AAPL"])})
+    assert add_ticker_rank_to_df(df, ["MSFT", "AAPL"])["TickerRank"].to_list() == [1, 0, 1]
@@ -0,0 +1,102 @@
+from typing import Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from i8_terminal.common.metric_cube import MetricCube
+
+METRICS = {
+    "total_revenue": ("Revenue", "float", "financial", "Q"),
+    "employees": ("Employees", "int", "number", "FY"),
+    "price": ("Price", "float", "price", "D"),
+}
+
+
+def get_historical_df(rows: List[Tuple[str, str, str, str, Any]]) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=["Ticker", "metric_name", "Period", "PeriodDateTime", "value"])
+    df["PeriodDateTime"] = pd.to_datetime(df["PeriodDateTime"])
+    metadata = df["metric_name"].map(METRICS)
+    for i, column in enumerate(["Metric", "data_format", "display_format", "default_period_type"]):
+        df[column] = metadata.str[i]
+    return df
+
+
+FISCAL_DF = get_historical_df(
+    [
+        ("AAPL", "total_revenue", "Q1 2023", "2022-12-31", 117.2),
+        ("AAPL", "total_revenue", "Q4 2022", "2022-09-24", 90.1),
+        ("AAPL", "employees", "FY 2022", "2022-09-24", 164000.0),
+        ("MSFT", "total_revenue", "Q4 2022", "2022-06-30", 51.9),
+        # Restated value of the same period
+        ("MSFT", "total_revenue", "Q4 2022", "2022-08-01", 52.0),
+        ("GOOGL", "employees", "FY 2022", "2022-12-31", 190234.0),
+    ]
+)
+
+
+def test_from_df_orders_labels() -> None:
+    cube = MetricCube.from_df(FISCAL_DF, tickers=["MSFT", "XOM"], metrics=["employees"])
+    assert cube.tickers == ["MSFT", "AAPL", "GOOGL"]
+    assert cube.metric_names == ["employees", "total_revenue"]
+    assert cube.display_names == ["Employees", "Revenue"]
+    # The fiscal year comes after its fourth quarter
+    assert cube.periods == ["Q4 2022", "FY 2022", "Q1 2023"]
+    assert cube.shape == (3, 2, 3)
+    assert not cube.is_date_period
+
+
+def test_from_df_places_values() -> None:
+    cube = MetricCube.from_df(FISCAL_DF)
+    values = cube.sel(tickers=["MSFT", "AAPL"], metrics=["total_revenue"]).values[:, 0, :]
+    np.testing.assert_array_equal(values, [[52.0, np.nan, np.nan], [90.1, np.nan, 117.2]])
+    assert cube.values.dtype == "float64"
+    assert cube.notna().sum() == 5
+
+
+def test_from_df_sorts_date_periods_by_date() -> None:
+    df = get_historical_df(
+        [
+            ("AAPL", "price", "2023-01-03", "2023-01-03", 125.1),
+            ("AAPL", "price", "2022-12-30", "2022-12-30", 129.9),
+            ("AAPL", "price", "2023-01-04", "2023-01-04", 126.4),
+        ]
+    )
+    cube = MetricCube.from_df(df)
+    assert cube.is_date_period
+    assert cube.periods == ["2022-12-30", "2023-01-03", "2023-01-04"]
+    assert cube.values[0, 0].tolist() == [129.9, 125.1, 126.4]
+
+
+def test_sel_fills_missing_labels() -> None:
+    cube = MetricCube.from_df(FISCAL_DF).sel(tickers=["AAPL", "XOM"], periods=["Q1 2023", "Q1 2024"])
+    assert cube.shape == (2, 2, 2)
+    assert cube.values[0, cube.metric_names.index("total_revenue")].tolist()[0] == 117.2
+    assert np.isnan(cube.values[1]).all()
+    assert pd.isna(cube.period_dates[1])
+
+
+def test_to_table_df_latest_periods_first() -> None:
+    df = MetricCube.from_df(FISCAL_DF, tickers=["AAPL"]).to_table_df()
+    assert df.columns.to_list() == ["Ticker", "Period", "Employees", "Revenue"]
+    aapl_df = df[df["Ticker"] == "AAPL"]
+    assert aapl_df["Period"].to_list() == ["Q1 2023", "FY 2022", "Q4 2022"]
+    assert aapl_df["Employees"].to_list()[1] == 164000.0
+    # Tickers and periods without data are left out
+    assert df[df["Ticker"] == "GOOGL"]["Period"].to_list() == ["FY 2022"]
+
+
+def test_to_df_keeps_values_with_data() -> None:
+    cube = MetricCube.from_df(FISCAL_DF)
+    df = cube.to_df()
+    assert len(df) == 5
+    row = df[(df["Ticker"] == "MSFT") & (df["metric_name"] == "total_revenue")].iloc[0]
+    assert (row["Period"], row["Metric"], row["value"]) == ("Q4 2022", "Revenue", 52.0)
+    # Periods keep the latest date of all tickers
+    assert row["PeriodDateTime"] == pd.Timestamp("2022-09-24")
+
+
+def test_format_keeps_missing_values() -> None:
+    cube = MetricCube.from_df(FISCAL_DF).format("console")
+    assert cube.values.dtype == object
+    assert cube.notna().sum() == 5
+    assert all(isinstance(v, str) for v in cube.values[cube.notna()])
@@ -0,0 +1,70 @@
+import numpy as np
+
+from i8_terminal.common.financials import parse_identifier
+from i8_terminal.common.formatting import format_fyq
+from i8_terminal.common.periods import (
+    NO_PERIOD_KEY,
+    argsort_periods,
+    format_period_keys,
+    get_period_keys,
+    parse_period_key,
+    parse_period_keys,
+)
+
+
+def test_get_period_keys() -> None:
+    keys = get_period_keys(
+        [2021, "2021", 2021, 2021, 2021, None, 2021], ["Q1", "Q2YTD", "Q4TTM", "FY", "Q", "Q1", "H1"]
+    )
+    assert keys.tolist() == [202110, 202121, 202142, 202143, 202100, NO_PERIOD_KEY, NO_PERIOD_KEY]
+
+
+def test_parse_period_keys_formats() -> None:
+    labels = ["Q1 2021", "2021 Q1", "FY2021Q1", "FY 2021", "FY2021FY", "Q3YTD 2021", "2021 Q", "2021-03-31", "Q5 2021"]
+    assert parse_period_keys(labels).tolist() == [202110, 202110, 202110, 202143, 202143, 202131, 202100, -1, -1]
+
+
+def test_fiscal_year_follows_its_fourth_quarter() -> None:
+    periods = ["FY 2021", "Q1 2022", "Q4 2021", "Q4TTM 2021", "Q4YTD 2021", "Q3 2021", "2021 Q"]
+    assert [periods[i] for i in argsort_periods(periods)] == [
+        "2021 Q",
+        "Q3 2021",
+        "Q4 2021",
+        "Q4YTD 2021",
+        "Q4TTM 2021",
+        "FY 2021",
+        "Q1 2022",
+    ]
+
+
+def test_argsort_periods_puts_other_labels_first() -> None:
+    periods = ["Q1 2022", "2022-01-03", "FY 2021", "2021-12-31"]
+    assert [periods[i] for i in argsort_periods(periods)] == ["2021-12-31", "2022-01-03", "FY 2021", "Q1 2022"]
+    assert [periods[i] for i in argsort_periods(periods, ascending=False)] == [
+        "Q1 2022",
+        "FY 2021",
+        "2022-01-03",
+        "2021-12-31",
+    ]
+
+
+def test_format_period_keys() -> None:
+    keys = np.array([202110, 202143, 202142, NO_PERIOD_KEY])
+    assert format_period_keys(keys) == ["Q1 2021", "FY 2021", "Q4TTM 2021", ""]
+    assert parse_period_keys(format_period_keys(keys)[:3]).tolist() == keys[:3].tolist()
+    assert parse_period_key("FY2023Q2") == 202320
+
+
+def test_format_fyq() -> None:
+    assert format_fyq("FY2021Q1") == "Q1 2021"
+    assert format_fyq("FY2021FY") == "FY 2021"
+    assert format_fyq("unknown") == "unknown"
+
+
+def test_parse_identifier() -> None:
+    assert parse_identifier("aapl_2021_q1", None) == {"ticker": "aapl", "fiscal_year": "2021", "fiscal_period": "q1"}
+    assert parse_identifier("AAPL-2021-Q1", None) == {"ticker": "AAPL", "fiscal_year": "2021", "fiscal_period": "Q1"}
+    assert parse_identifier("AAPL_2021_Q4TTM", None)["fiscal_period"] == "FY"
+    assert parse_identifier("AAPL_2021", None) == {"ticker": "AAPL", "fiscal_year": "2021", "fiscal_period": "FY"}
+    assert parse_identifier("AAPL_2021", "Q") == {"ticker": "AAPL", "fiscal_year": "2021"}
+    assert parse_identifier("AAPL_Q2", None) == {"ticker": "AAPL", "fiscal_period": "Q2"}
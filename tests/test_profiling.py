@@ -0,0 +1,109 @@
+import json
+import threading
+from typing import Any, Optional
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from i8_terminal.common import profiling
+from i8_terminal.common.cli import pass_command
+from i8_terminal.common.instrumentation import ApiCall
+from i8_terminal.common.profiling import (
+    PHASE_API,
+    PHASE_BUILD,
+    PHASE_FORMATTING,
+    PHASE_OTHER,
+    CommandProfiler,
+    profile_phase,
+    run_profiled,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake_clock = FakeClock()
+    monkeypatch.setattr(profiling, "perf_counter", fake_clock)
+    return fake_clock
+
+
+def get_api_call(latency: float, thread_id: int) -> ApiCall:
+    return ApiCall("GET /api/Test", 0.0, latency, 1024, 200, None, thread_id)
+
+
+def test_nested_phases_record_self_time(clock: FakeClock) -> None:
+    profiler = CommandProfiler("i8 test")
+    with profiler.phase(PHASE_BUILD):
+        clock.now += 1
+        with profiler.phase(PHASE_FORMATTING):
+            clock.now += 2
+        clock.now += 3
+    clock.now += 4
+    profiler.stop()
+    assert profiler.phase_times[PHASE_BUILD] == 4
+    assert profiler.phase_times[PHASE_FORMATTING] == 2
+    assert profiler.phase_times[PHASE_OTHER] == 4
+    assert profiler.duration == 10
+    assert [e["name"] for e in profiler.trace_events] == [PHASE_FORMATTING, PHASE_BUILD]
+
+
+def test_api_calls_of_other_threads_are_not_added_to_phases(clock: FakeClock) -> None:
+    profiler = CommandProfiler("i8 test")
+    with profiler.phase(PHASE_BUILD):
+        clock.now += 5
+        profiler.on_api_call(get_api_call(2, threading.get_ident()))
+        thread = threading.Thread(target=lambda: profiler.on_api_call(get_api_call(3, threading.get_ident())))
+        thread.start()
+        thread.join()
+    profiler.stop()
+    assert len(profiler.api_calls) == 2
+    assert profiler.phase_times[PHASE_API] == 2
+    assert profiler.phase_times[PHASE_BUILD] == 3
+
+
+def test_profile_phase_only_records_when_profiled(tmp_path: Any) -> None:
+    @profile_phase(PHASE_FORMATTING)
+    def format_value(value: int) -> str:
+        return str(value)
+
+    assert format_value(1) == "1"
+    export_path = str(tmp_path / "profile.json")
+    assert run_profiled("i8 test", lambda: format_value(2), export_path) == "2"
+    with open(export_path) as f:
+        trace_events = json.load(f)["traceEvents"]
+    assert [(e["name"], e["cat"]) for e in trace_events] == [
+        ("test_profile_phase_only_records_when_profiled.<locals>.format_value", PHASE_FORMATTING)
+    ]
+    assert profiling.get_active_profiler() is None
+
+
+def test_pass_command_keeps_own_profile_option() -> None:
+    @click.command()
+    @click.option("--profile", "profile", help="Screening profile.")
+    @pass_command
+    def search(profile: Optional[str]) -> None:
+        click.echo(f"profile={profile}")
+
+    result = CliRunner().invoke(search, ["--profile", "top_gainers"], obj={})
+    assert result.exit_code == 0, result.output
+    assert result.output == "profile=top_gainers\n"
+
+
+def test_pass_command_adds_profile_flag() -> None:
+    @click.command()
+    @pass_command
+    def summary() -> None:
+        click.echo("done")
+
+    result = CliRunner().invoke(summary, ["--profile"], obj={})
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith("done\n")
+    assert "Profile:" in result.output
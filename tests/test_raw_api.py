@@ -0,0 +1,73 @@
+import json
+from typing import Any, Dict, List
+
+import pandas as pd
+from investor8_sdk import ApiClient
+from pandas import DataFrame
+
+from i8_terminal.common.raw_api import raw_records_to_df, to_model_dict
+
+CURRENT_METRICS: Dict[str, Any] = {
+    "Data": [
+        {
+            "Symbol": "AAPL",
+            "Metric": "pe_ratio",
+            "Value": 28.5,
+            "Period": "FY2023Q3",
+            "LastModified": "2023-08-04T12:30:00Z",
+            "OverallRank": 12,
+        },
+        {"Symbol": "MSFT", "Metric": "sector", "Value": "Technology", "LastModified": None, "OverallRank": None},
+        {"Symbol": "GOOGL", "Metric": "employees", "Value": 190234, "Period": "FY2022"},
+    ],
+    "Metadata": [{"MetricName": "pe_ratio", "DisplayName": "P/E Ratio", "DefaultPeriodType": "Q"}],
+}
+COMPANIES: List[Dict[str, Any]] = [
+    {"Ticker": "AAPL", "Name": "Apple Inc.", "Peers": ["MSFT", "GOOGL"]},
+    {"Ticker": "BRK.B", "Name": "Berkshire Hathaway", "Peers": None},
+]
+
+
+class Response:
+    def __init__(self, data: Any) -> None:
+        self.data = json.dumps(data)
+
+
+def deserialize(data: Any, swagger_type: str) -> Any:
+    return ApiClient().deserialize(Response(data), swagger_type)
+
+
+def sdk_records_to_df(records: List[Any], swagger_type: str) -> DataFrame:
+    return DataFrame([m.to_dict() for m in deserialize(records, f"list[{swagger_type}]")])
+
+
+def test_to_model_dict_matches_sdk() -> None:
+    swagger_type = "SymbolsCurrentMetricsDto"
+    assert to_model_dict(CURRENT_METRICS, swagger_type) == deserialize(CURRENT_METRICS, swagger_type).to_dict()
+    assert [to_model_dict(c, "ActiveCompanyDto") for c in COMPANIES] == [
+        m.to_dict() for m in deserialize(COMPANIES, "list[ActiveCompanyDto]")
+    ]
+
+
+def test_to_model_dict_parses_dates() -> None:
+    data = {"reported": "2023-08-04T12:30:00Z", "missing": None}
+    assert to_model_dict(data, "dict(str, datetime)") == deserialize(data, "dict(str, datetime)")
+    assert to_model_dict(["2023-08-04"], "list[date]") == deserialize(["2023-08-04"], "list[date]")
+
+
+def test_raw_records_to_df_matches_sdk() -> None:
+    pd.testing.assert_frame_equal(
+        raw_records_to_df(COMPANIES, "ActiveCompanyDto"), sdk_records_to_df(COMPANIES, "ActiveCompanyDto")
+    )
+    records = CURRENT_METRICS["Data"]
+    df = raw_records_to_df(records, "CurrentMetricsDto")
+    sdk_df = sdk_records_to_df(records, "CurrentMetricsDto")
+    # Both hold the same instants, parsed to UTC by pandas and to tzutc by dateutil
+    pd.testing.assert_series_equal(df.pop("last_modified"), sdk_df.pop("last_modified").dt.tz_convert("UTC"))
+    pd.testing.assert_frame_equal(df, sdk_df)
+    assert df["value"].to_list() == ["28.5", "Technology", "190234"]
+
+
+def test_raw_records_to_df_without_records() -> None:
+    df = raw_records_to_df([], "ActiveCompanyDto")
+    assert df.empty and df.columns.to_list() == ["ticker", "name", "peers"]
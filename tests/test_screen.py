@@ -0,0 +1,87 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from i8_terminal.commands.screen import screen_search
+from i8_terminal.common import screen
+from i8_terminal.common.screen import (
+    ScreeningCondition,
+    evaluate_screening_condition,
+    parse_screening_condition,
+    screen_metrics_snapshot,
+)
+
+SNAPSHOTS: Dict[str, pd.DataFrame] = {
+    "pe_ratio.q": pd.DataFrame(
+        {
+            "Ticker": ["AAPL", "MSFT", "AMD", "XOM"],
+            "metric_name": "pe_ratio",
+            "value": ["28.5", "35.1", None, "9.8"],
+            "spx_rank": [40, 20, None, 400],
+            "spx_count": [500, 500, None, 500],
+        }
+    ),
+    "sector.r": pd.DataFrame(
+        {
+            "Ticker": ["AAPL", "MSFT", "AMD", "GOOGL"],
+            "metric_name": "sector",
+            "value": ["Technology", "Technology", "Technology", "Communication Services"],
+        }
+    ),
+}
+
+
+@pytest.fixture
+def snapshots(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(screen, "get_metric_snapshot_df", lambda input_metric: SNAPSHOTS[input_metric].copy())
+    monkeypatch.setattr(screen_search, "get_metric_snapshot_df", lambda input_metric: SNAPSHOTS[input_metric].copy())
+
+
+def get_mask(condition: str) -> List[bool]:
+    parsed_condition = parse_screening_condition(condition)
+    mask: List[bool] = evaluate_screening_condition(SNAPSHOTS[parsed_condition.input_metric], parsed_condition).tolist()
+    return mask
+
+
+def test_parse_screening_condition() -> None:
+    assert parse_screening_condition("pe_ratio.q.sector_rank:lt:10") == ScreeningCondition(
+        "pe_ratio.q", "sector_rank", "lt", "10"
+    )
+    for condition in ["pe_ratio.q:gt", "pe_ratio.q.median:gt:1", "pe_ratio.q:ne:1"]:
+        with pytest.raises(ValueError):
+            parse_screening_condition(condition)
+
+
+def test_numeric_masks_skip_missing_values() -> None:
+    assert get_mask("pe_ratio.q:gt:20") == [True, True, False, False]
+    assert get_mask("pe_ratio.q:lt:30") == [True, False, False, True]
+    assert get_mask("pe_ratio.q:bw:35.1~9.8") == [True, True, False, True]
+    assert get_mask("pe_ratio.q:eq:28.5") == [True, False, False, False]
+
+
+def test_rank_and_percentile_masks() -> None:
+    assert get_mask("pe_ratio.q.rank:lt:50") == [True, True, False, False]
+    assert get_mask("pe_ratio.q.percentile:gt:50") == [False, False, False, True]
+
+
+def test_string_mask_ignores_case() -> None:
+    assert get_mask("sector.r:eq:technology") == [True, True, True, False]
+
+
+def test_screen_metrics_snapshot(snapshots: None) -> None:
+    conditions = ["pe_ratio.q:gt:5", "sector.r:eq:Technology"]
+    assert screen_metrics_snapshot(conditions, "pe_ratio.q", "desc") == ["MSFT", "AAPL"]
+    assert screen_metrics_snapshot(conditions, "pe_ratio.q", "asc") == ["AAPL", "MSFT"]
+    # Tickers without a value to sort by are listed last
+    assert screen_metrics_snapshot(["sector.r:eq:Technology"], "pe_ratio.q", "desc") == ["MSFT", "AAPL", "AMD"]
+
+
+def test_prepare_offline_screen_df(snapshots: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(screen_search, "MAX_SCREEN_TICKERS", 1)
+    tickers, df = screen_search.prepare_offline_screen_df(["pe_ratio.q:gt:5"], "pe_ratio.q,sector.r", None, "desc")
+    assert tickers == ["MSFT", "AAPL", "XOM"]
+    assert df is not None
+    assert df[["Ticker", "input_metric"]].values.tolist() == [["MSFT", "pe_ratio.q"], ["MSFT", "sector.r"]]
+    assert np.array_equal(df["value"].to_numpy(), np.array(["35.1", "Technology"], dtype=object))
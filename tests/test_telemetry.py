@@ -0,0 +1,81 @@
+import json
+from typing import Any, List
+
+import investor8_sdk
+import pytest
+
+from i8_terminal.common import telemetry
+from i8_terminal.common.instrumentation import (
+    ApiCall,
+    add_api_call_listener,
+    remove_api_call_listener,
+)
+from i8_terminal.common.telemetry import ApiStats, load_api_stats_history
+
+
+def test_api_stats_aggregates_endpoints() -> None:
+    stats = ApiStats()
+    for latency in [0.1, 0.2, 0.3, 0.4]:
+        stats.add_api_call("GET /api/Price", latency, 1024, None)
+    stats.add_api_call("GET /api/Metrics", 2.0, 2048, "ApiException")
+    df = stats.get_endpoints_df().set_index("Endpoint")
+    assert df.index.to_list() == ["GET /api/Metrics", "GET /api/Price"]
+    assert df.loc["GET /api/Price", "Calls"] == 4
+    assert df.loc["GET /api/Price", "Errors"] == 0
+    assert df.loc["GET /api/Price", "p50 (ms)"] == pytest.approx(250)
+    assert df.loc["GET /api/Price", "Total (s)"] == pytest.approx(1.0)
+    assert df.loc["GET /api/Price", "Size (KB)"] == 4
+    assert df.loc["GET /api/Metrics", "Errors"] == 1
+
+
+def test_api_stats_cache_hit_rates() -> None:
+    stats = ApiStats()
+    for hit in [True, True, True, False]:
+        stats.add_cache_access("companies", hit)
+    stats.add_cache_access("metrics_metadata", False)
+    df = stats.get_cache_df()
+    assert df["Cache"].to_list() == ["companies", "metrics_metadata"]
+    assert df["Hit Rate"].to_list() == [0.75, 0.0]
+
+
+def test_load_api_stats_history_reads_rotated_files(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    stats_path = str(tmp_path / "api_stats.log")
+    monkeypatch.setattr(telemetry, "API_STATS_PATH", stats_path)
+    with open(stats_path, "w") as f:
+        f.write(json.dumps({"endpoint": "GET /api/Price", "latency": 0.5, "size": 10, "error": None}) + "\n")
+        f.write("not json\n")
+        f.write(json.dumps({"cache": "companies", "hit": True}) + "\n")
+    with open(f"{stats_path}.1", "w") as f:
+        f.write(json.dumps({"endpoint": "GET /api/Price", "latency": 1.5, "size": 20, "error": "Timeout"}) + "\n")
+    stats = load_api_stats_history()
+    assert stats.latencies["GET /api/Price"] == [0.5, 1.5]
+    assert stats.sizes["GET /api/Price"] == 30
+    assert stats.errors["GET /api/Price"] == 1
+    assert stats.cache_hits["companies"] == 1
+
+
+def test_instrumented_api_client_reports_endpoint_templates(monkeypatch: pytest.MonkeyPatch) -> None:
+    class Response:
+        status = 200
+        data = b"[1, 2, 3]"
+
+    def call_api(self: Any, resource_path: str, method: str, *args: Any, **kwargs: Any) -> str:
+        if resource_path == "/api/Fail":
+            raise ValueError()
+        self.last_response = Response()
+        return "result"
+
+    monkeypatch.setattr(investor8_sdk.ApiClient, "call_api", call_api)
+    calls: List[ApiCall] = []
+    add_api_call_listener(calls.append)
+    try:
+        client = investor8_sdk.ApiClient()
+        assert client.call_api("/api/Price/{ticker}", "GET") == "result"
+        with pytest.raises(ValueError):
+            client.call_api("/api/Fail", "POST")
+    finally:
+        remove_api_call_listener(calls.append)
+    assert [(c.endpoint, c.status, c.size, c.error) for c in calls] == [
+        ("GET /api/Price/{ticker}", 200, 9, None),
+        ("POST /api/Fail", None, 0, "ValueError"),
+    ]
@@ -0,0 +1,71 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import investor8_sdk
+import pytest
+
+from i8_terminal.common import usage_logging
+from i8_terminal.common.usage_logging import UsageLogger
+
+
+@pytest.fixture
+def spool_path(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> str:
+    path = str(tmp_path / "usage_spool.jsonl")
+    monkeypatch.setattr(usage_logging, "USAGE_SPOOL_PATH", path)
+    return path
+
+
+def read_spool(spool_path: str) -> List[Any]:
+    if not os.path.exists(spool_path):
+        return []
+    with open(spool_path) as f:
+        return [json.loads(line)["n"] for line in f]
+
+
+def get_logger(monkeypatch: pytest.MonkeyPatch, delay: float, is_online: bool = True) -> Tuple[UsageLogger, List[Any]]:
+    def log_terminal_usage(self: Any, body: Dict[str, Any]) -> None:
+        time.sleep(delay)
+        if not is_online:
+            raise ConnectionError()
+        sent.append(body["n"])
+
+    sent: List[Any] = []
+    monkeypatch.setattr(investor8_sdk.UserApi, "log_terminal_usage", log_terminal_usage)
+    logger = UsageLogger()
+    logger.flush_interval, logger.flush_timeout, logger.batch_size = 0.05, 0.3, 3
+    return logger, sent
+
+
+def test_events_and_spool_are_sent(spool_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    with open(spool_path, "w") as f:
+        f.writelines(f"{json.dumps({'n': f's{i}'})}\n" for i in range(2))
+    logger, sent = get_logger(monkeypatch, 0)
+    for i in range(5):
+        logger.log({"n": i})
+    logger.close()
+    assert sorted(sent, key=str) == [0, 1, 2, 3, 4, "s0", "s1"]
+    assert read_spool(spool_path) == []
+
+
+def test_events_are_spooled_when_offline(spool_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    logger, _ = get_logger(monkeypatch, 0, is_online=False)
+    for i in range(5):
+        logger.log({"n": i})
+    logger.close()
+    assert sorted(read_spool(spool_path)) == [0, 1, 2, 3, 4]
+
+
+def test_close_does_not_spool_events_being_sent(spool_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    logger, sent = get_logger(monkeypatch, 0.2)
+    for i in range(7):
+        logger.log({"n": i})
+    logger.close()
+    spooled = read_spool(spool_path)
+    # The sender stops once the pending events are spooled, finishing only the event it is sending
+    time.sleep(0.5)
+    assert read_spool(spool_path) == spooled
+    assert not set(sent) & set(spooled)
+    assert sorted(sent + spooled) == list(range(7))
+    assert 0 < len(spooled) < 7